@@ -0,0 +1,22 @@
+import hmac
+
+import streamlit as st
+
+from config import ADMIN_TOKEN
+
+
+def require_admin():
+    # Admin pages are disabled unless FOODIE_ADMIN_TOKEN is set; the token is asked for once per
+    # session (or passed as ?token=...). Stops the page script for everyone else.
+    if not ADMIN_TOKEN:
+        st.info("Admin pages are disabled. Set FOODIE_ADMIN_TOKEN to enable them.")
+        st.stop()
+    if st.session_state.get("is_admin"):
+        return
+    token = st.query_params.get("token") or st.text_input("Admin token", type="password")
+    if token and hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        st.session_state.is_admin = True
+        return
+    if token:
+        st.error("Wrong admin token.")
+    st.stop()
@@ -0,0 +1,60 @@
+import streamlit as st
+
+from catalog import flat_menu
+from services import get_sales_store
+
+
+# --- MCP with Mock Implementation ---
+class MCP:
+    def __init__(self):
+        self.agents = {}
+
+class Agent:
+    def __init__(self, name, mcp):
+        self.name = name
+        self.mcp = mcp
+        self.mcp.agents[name] = self
+        self.tasks = {}
+
+    def task(self, func):
+        self.tasks[func.__name__] = func
+        return func
+
+    def run_task(self, task_name, *args):
+        try:
+            return self.tasks[task_name](*args)
+        except KeyError as e:
+            st.error(f"Task not found: {e}")
+            return None
+
+mcp = MCP()
+inventory_agent = Agent(name="InventoryAgent", mcp=mcp)
+
+@inventory_agent.task
+def check_availability(item_id):
+    available_items = {"beef_burger": 10, "margherita_pizza": 5}
+    return available_items.get(item_id, 0) > 0
+
+# --- Fetch.ai Mock Setup ---
+class LedgerApi:
+    def __init__(self, node):
+        pass
+
+class Entity:
+    pass
+
+ledger_api = LedgerApi('mock-node')
+entity = Entity()
+recommendation_agent = Agent(name="RecommendationAgent", mcp=mcp)
+
+@recommendation_agent.task
+def suggest_item(order, available=flat_menu):
+    # available: the session location's flat menu; never suggest what the store can't sell
+    in_cart = [item["id"] for item in order]
+    if "beef_burger" in in_cart and "golden_fries" in available:
+        return "golden_fries"
+    # Otherwise the week's best seller that isn't in the cart yet
+    for item_id in get_sales_store().popular_items(3, exclude=in_cart):
+        if item_id in available:
+            return item_id
+    return None
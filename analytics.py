@@ -0,0 +1,261 @@
+import glob
+import os
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ANALYTICS_DIR = os.path.join(ROOT, "analytics")
+LINE_COLUMNS = {"item": np.int32, "quantity": np.int32, "price_cents": np.int32, "ts": np.int64, "suggested": np.bool_}
+ORDER_COLUMNS = {"ts": np.int64, "items": np.int32, "lines": np.int32, "total_cents": np.int64, "suggestions": np.int32, "accepted": np.int32}
+# Segments whose row counts are within a factor of COMPACT_FANOUT form a tier; a full tier is merged
+# into one segment of the next tier.
+COMPACT_FANOUT = 8
+
+
+# --- Columnar Sales Store ---
+# Completed orders become rows of two column sets: one row per order line and one per order. Rows
+# are buffered and written as a batch of NumPy arrays (one .npz segment) once BATCH_ROWS lines or
+# FLUSH_SECONDS have accumulated. Queries read rows not yet written from memory and never force a
+# write. Compaction is size-tiered: COMPACT_FANOUT segments of similar size are merged into one, so a
+# row is rewritten about log(rows / BATCH_ROWS) times over its life, not every few batches.
+# Item ids are stored as indexes into the segment's own item list, so menu changes never invalidate
+# old segments. Queries run on the concatenated, time-sorted columns with vectorized group-bys
+# (np.bincount over combined keys), never on order JSON.
+class SalesStore:
+    BATCH_ROWS = 512
+    FLUSH_SECONDS = 60.0
+    POPULAR_TTL_SECONDS = 60.0
+
+    def __init__(self, directory=ANALYTICS_DIR):
+        self.directory = directory
+        self.item_ids = []
+        self.item_index = {}
+        self.lines = []  # list of column dicts, one per batch
+        self.orders = []
+        self.segments = []
+        self._pending_lines = {name: [] for name in LINE_COLUMNS}
+        self._pending_orders = {name: [] for name in ORDER_COLUMNS}
+        self._pending_since = None
+        self._columns = None  # written batches, concatenated
+        self._live = None  # _columns plus the pending rows
+        self._popular = {}
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            for path in sorted(glob.glob(os.path.join(directory, "sales-*.npz"))):
+                self._load_segment(path)
+                self.segments.append(path)
+
+    def record(self, order, suggested=()):
+        # order: a stored order from OrderService.submit; suggested: item ids the assistant suggested
+        # during that checkout (an ordered suggested item counts as an accepted upsell).
+        ts = int(order.get("created_at") or time.time())
+        suggested = set(suggested)
+        accepted = 0
+        with self._lock:
+            for line in order["lines"]:
+                is_suggested = line["id"] in suggested
+                accepted += is_suggested
+                self._pending_lines["item"].append(self._item(line["id"]))
+                self._pending_lines["quantity"].append(line["quantity"])
+                self._pending_lines["price_cents"].append(round(line["price"] * 100))
+                self._pending_lines["ts"].append(ts)
+                self._pending_lines["suggested"].append(is_suggested)
+            for name, value in (("ts", ts), ("items", sum(line["quantity"] for line in order["lines"])), ("lines", len(order["lines"])),
+                                ("total_cents", round(order["total"] * 100)), ("suggestions", len(suggested)), ("accepted", accepted)):
+                self._pending_orders[name].append(value)
+            self._live = None
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            if len(self._pending_lines["item"]) >= self.BATCH_ROWS or time.monotonic() - self._pending_since >= self.FLUSH_SECONDS:
+                self._flush()
+
+    def append_batch(self, lines, orders):
+        # Bulk import of already-columnar rows (e.g. a backfill): column name -> array, item as id strings or indexes into item_ids.
+        with self._lock:
+            self._flush()
+            lines = dict(lines)
+            if lines["item"].dtype.kind in "UO":
+                vocabulary, inverse = np.unique(lines["item"], return_inverse=True)
+                lines["item"] = np.array([self._item(item_id) for item_id in vocabulary], dtype=np.int32)[inverse]
+            self._add_batch({name: np.asarray(lines[name], dtype) for name, dtype in LINE_COLUMNS.items()},
+                            {name: np.asarray(orders[name], dtype) for name, dtype in ORDER_COLUMNS.items()})
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def columns(self):
+        # (line columns, order columns) as single arrays, including rows not yet written to disk.
+        with self._lock:
+            if self._columns is None:
+                self._columns = (self._by_time(self._concat(self.lines, LINE_COLUMNS)), self._by_time(self._concat(self.orders, ORDER_COLUMNS)))
+            if not self._pending_orders["ts"]:
+                return self._columns
+            if self._live is None:
+                pending = ({name: np.array(values, dtype=LINE_COLUMNS[name]) for name, values in self._pending_lines.items()},
+                           {name: np.array(values, dtype=ORDER_COLUMNS[name]) for name, values in self._pending_orders.items()})
+                self._live = tuple(self._by_time(self._concat([stored, rows], columns))
+                                   for stored, rows, columns in zip(self._columns, pending, (LINE_COLUMNS, ORDER_COLUMNS)))
+            return self._live
+
+    # --- Queries ---
+    def hourly_item_sales(self, start=None, end=None):
+        # -> (hour start timestamps, item ids, quantity[hour, item], revenue[hour, item]) for hours with sales.
+        lines, _ = self.columns()
+        window = self._window(lines["ts"], start, end)
+        hours, items, quantity = lines["ts"][window] // 3600, lines["item"][window], lines["quantity"][window]
+        item_count = len(self.item_ids)
+        if not len(hours):
+            return np.zeros(0, np.int64), list(self.item_ids), np.zeros((0, item_count), np.int64), np.zeros((0, item_count))
+        # Dense (hour, item) grid over the hours spanned, then only the hours that had sales are kept
+        first_hour = hours.min()
+        span = int(hours.max() - first_hour) + 1
+        key = (hours - first_hour) * item_count + items
+        units = np.bincount(key, weights=quantity, minlength=span * item_count).reshape(span, item_count)
+        revenue = np.bincount(key, weights=quantity * lines["price_cents"][window].astype(np.int64), minlength=span * item_count).reshape(span, item_count)
+        sold = units.any(axis=1)
+        return (np.flatnonzero(sold) + first_hour) * 3600, list(self.item_ids), units[sold].astype(np.int64), revenue[sold] / 100
+
+    def item_totals(self, start=None, end=None):
+        # -> [(item_id, quantity, revenue)] best sellers first.
+        lines, _ = self.columns()
+        window = self._window(lines["ts"], start, end)
+        items, quantity = lines["item"][window], lines["quantity"][window]
+        units = np.bincount(items, weights=quantity, minlength=len(self.item_ids))
+        revenue = np.bincount(items, weights=quantity * lines["price_cents"][window].astype(np.int64), minlength=len(self.item_ids)) / 100
+        ranking = np.argsort(-units, kind="stable")
+        return [(self.item_ids[i], int(units[i]), round(float(revenue[i]), 2)) for i in ranking if units[i]]
+
+    def basket_stats(self, start=None, end=None):
+        _, orders = self.columns()
+        window = self._window(orders["ts"], start, end)
+        count = len(orders["ts"][window])
+        if not count:
+            return {"orders": 0, "avg_items": 0.0, "avg_lines": 0.0, "avg_order_value": 0.0, "revenue": 0.0}
+        return {
+            "orders": count,
+            "avg_items": round(float(orders["items"][window].mean()), 2),
+            "avg_lines": round(float(orders["lines"][window].mean()), 2),
+            "avg_order_value": round(float(orders["total_cents"][window].mean()) / 100, 2),
+            "revenue": round(float(orders["total_cents"][window].sum()) / 100, 2),
+        }
+
+    def upsell_conversion(self, start=None, end=None):
+        # Share of assistant suggestions that ended up in the placed order, and which items converted.
+        lines, orders = self.columns()
+        order_window = self._window(orders["ts"], start, end)
+        suggestions = int(orders["suggestions"][order_window].sum())
+        accepted = int(orders["accepted"][order_window].sum())
+        window = self._window(lines["ts"], start, end)
+        suggested = lines["suggested"][window]
+        units = np.bincount(lines["item"][window][suggested], weights=lines["quantity"][window][suggested], minlength=len(self.item_ids))
+        by_item = [(self.item_ids[i], int(units[i])) for i in np.argsort(-units, kind="stable") if units[i]]
+        return {"suggestions": suggestions, "accepted": accepted, "rate": round(accepted / suggestions, 3) if suggestions else 0.0, "by_item": by_item}
+
+    def popular_items(self, k=3, since_seconds=7 * 24 * 3600, exclude=()):
+        # Best sellers of the recent window, for recommendations. Asked on every order turn, so the
+        # ranking is reused for POPULAR_TTL_SECONDS; a minute-old ranking of a week's sales is as good.
+        now = time.monotonic()
+        cached = self._popular.get(since_seconds)
+        if cached is None or now >= cached[0]:
+            start = time.time() - since_seconds if since_seconds else None
+            cached = self._popular[since_seconds] = (now + self.POPULAR_TTL_SECONDS, [item_id for item_id, _, _ in self.item_totals(start)])
+        exclude = set(exclude)
+        return [item_id for item_id in cached[1] if item_id not in exclude][:k]
+
+    def line_count(self):
+        lines, _ = self.columns()
+        return len(lines["item"])
+
+    # --- Storage ---
+    def _item(self, item_id):
+        index = self.item_index.get(item_id)
+        if index is None:
+            index = self.item_index[item_id] = len(self.item_ids)
+            self.item_ids.append(item_id)
+        return index
+
+    def _flush(self):
+        if not self._pending_orders["ts"]:
+            return
+        lines = {name: np.array(values, dtype=LINE_COLUMNS[name]) for name, values in self._pending_lines.items()}
+        orders = {name: np.array(values, dtype=ORDER_COLUMNS[name]) for name, values in self._pending_orders.items()}
+        for values in (*self._pending_lines.values(), *self._pending_orders.values()):
+            values.clear()
+        self._pending_since = None
+        self._add_batch(lines, orders)
+
+    def _add_batch(self, lines, orders):
+        lines, orders = self._by_time(lines), self._by_time(orders)
+        self.lines.append(lines)
+        self.orders.append(orders)
+        self._columns = self._live = None
+        if self.directory:
+            self.segments.append(self._write_segment(lines, orders))
+            self._compact()
+
+    def _write_segment(self, lines, orders):
+        # Each segment carries the item list its indexes refer to; written to a temp file and renamed into place.
+        path = os.path.join(self.directory, f"sales-{time.time_ns()}-{os.getpid()}.npz")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, item_ids=np.array(self.item_ids, dtype=str), **{f"line_{k}": v for k, v in lines.items()}, **{f"order_{k}": v for k, v in orders.items()})
+        os.replace(tmp_path, path)
+        return path
+
+    def _load_segment(self, path):
+        with np.load(path) as segment:
+            remap = np.array([self._item(str(item_id)) for item_id in segment["item_ids"]], dtype=np.int32)
+            lines = {name: segment[f"line_{name}"] for name in LINE_COLUMNS}
+            if len(remap):
+                lines["item"] = remap[lines["item"]]
+            self.lines.append(lines)
+            self.orders.append({name: segment[f"order_{name}"] for name in ORDER_COLUMNS})
+
+    def _compact(self):
+        # self.lines, self.orders and self.segments are parallel lists, one entry per segment file.
+        while True:
+            tiers = {}
+            for i, lines in enumerate(self.lines):
+                tiers.setdefault(self._tier(len(lines["item"])), []).append(i)
+            full = next((members for members in tiers.values() if len(members) >= COMPACT_FANOUT), None)
+            if full is None:
+                return
+            lines = self._by_time(self._concat([self.lines[i] for i in full], LINE_COLUMNS))
+            orders = self._by_time(self._concat([self.orders[i] for i in full], ORDER_COLUMNS))
+            merged = self._write_segment(lines, orders)
+            for i in full:
+                os.remove(self.segments[i])
+            keep = [i for i in range(len(self.segments)) if i not in full]
+            self.lines = [self.lines[i] for i in keep] + [lines]
+            self.orders = [self.orders[i] for i in keep] + [orders]
+            self.segments = [self.segments[i] for i in keep] + [merged]
+
+    @classmethod
+    def _tier(cls, rows):
+        # 0 for up to one batch (BATCH_ROWS rows), then one tier per further factor of COMPACT_FANOUT
+        tier, limit = 0, cls.BATCH_ROWS
+        while rows > limit:
+            tier, limit = tier + 1, limit * COMPACT_FANOUT
+        return tier
+
+    @staticmethod
+    def _concat(batches, columns):
+        return {name: np.concatenate([batch[name] for batch in batches]) if batches else np.zeros(0, dtype) for name, dtype in columns.items()}
+
+    @staticmethod
+    def _by_time(columns):
+        # Rows sorted by timestamp, so a time window is a slice (a view) found by binary search
+        ts = columns["ts"]
+        if len(ts) and np.any(ts[1:] < ts[:-1]):
+            ranking = np.argsort(ts, kind="stable")
+            columns = {name: values[ranking] for name, values in columns.items()}
+        return columns
+
+    @staticmethod
+    def _window(ts, start, end):
+        return slice(np.searchsorted(ts, start, "left") if start is not None else 0,
+                     np.searchsorted(ts, end, "left") if end is not None else len(ts))
@@ -0,0 +1,350 @@
+import json
+import time
+
+import streamlit as st
+
+from agents import check_availability, recommendation_agent
+from config import ASR_CHUNK_SECONDS, GROQ_API_KEY, HEARD_CLIPS_LIMIT, LLM_BACKEND, LLM_MIN_INTERVAL, LLM_TURN_DEADLINE, LONG_AUDIO_SECONDS, MENU_TOP_K, SPOKEN_REPLIES, VOICE_MODE
+from llm_client import LLMUnavailable, TurnCancelled
+from llm_output import build_reask_messages
+from profiler import attach as attach_profiler
+from services import (
+    get_asr_executor, get_cassette, get_catalog, get_llm_client, get_local_parser, get_menu_index, get_output_validator, get_system_prompt, get_tracer, get_transcriber,
+    get_tts_service,
+)
+from tts import SynthesisError
+
+
+# --- LLM Prompt ---
+# Static; with the location's promotions appended (location_system_prompt) it is a stable prefix that
+# prompt caches reuse across turns and across all sessions of a location.
+SYSTEM_PROMPT = """
+        You are a helpful and friendly restaurant ordering assistant named Agentic Foodie.
+        Your goal is to take food orders, answer questions about the menu, and intelligently
+        recommend additional items, upgrades, or promotions to maximize the order value and customer satisfaction.
+        The store's current promotions follow these instructions; the menu and current order are given in a system message just before the user's latest message.
+        
+        Based on the user's input and the current conversation context, you MUST respond with a JSON object.
+        This JSON object should contain:
+        1. "intent": A string indicating the user's primary intent.
+           Possible values: "order", "query_menu", "confirm", "cancel", "greeting", "farewell", "other", "thank_you".
+        2. "item_id": The 'id' of the menu item if the intent is "order" or "query_menu", otherwise null.
+        3. "quantity": An integer representing the quantity if the intent is "order", otherwise null.
+        4. "response_text": A natural language, conversational response for the user, including relevant emojis.
+           Ensure this text is engaging and directly addresses the user's input.
+
+        **STRICT JSON OUTPUT REQUIREMENT:**
+        Your entire response MUST be a valid JSON object and contain ONLY the JSON. Do NOT include any other text, markdown, or explanations outside the JSON.
+        Example: {"intent": "order", "item_id": "beef_burger", "quantity": 1, "response_text": "Great choice! Adding a Classic Beef Burger 🍔 to your order. Would you like some golden fries with that? 🍟"}
+
+        **Recommendation Logic for "response_text":**
+        - After an item is ordered, suggest relevant upsells from its 'upsell' array (e.g., "coke", "fries_upgrade").
+        - If a main course is ordered and no drink/dessert, suggest the "Combo Deal".
+        - If multiple items are in the cart, suggest a dessert.
+        - Be friendly, conversational, and use emojis.
+        - If the user asks about something not on the menu, politely state it's not available.
+        - If the user says "hello" or a greeting, respond with a friendly greeting.
+        - If the user says "thank you", respond appropriately.
+        """
+
+def location_system_prompt(catalog):
+    return f"""{SYSTEM_PROMPT}
+        Store: {catalog.name}
+        Current Promotions (JSON): {json.dumps(catalog.promotions)}
+        """
+
+# Replies for intents that need no model wording; also pre-synthesized by the warm-up
+FIXED_REPLIES = {
+    "thank_you": "You're most welcome! Is there anything else I can assist you with? 😊",
+    "greeting": "Hello there! How can I help you with your order today? 🌟",
+    "farewell": "Goodbye! Hope to serve you again soon! 👋",
+}
+
+
+# --- Helper Functions ---
+def begin_trace_turn(kind):
+    # The turn stays open across the st.rerun() and is closed after the rerender at the end of the script.
+    # Widget callbacks and voice turns run before (or outside) the page script, so the thread is marked
+    # for the session's profile here too.
+    attach_profiler(st.session_state.session_id)
+    if st.session_state.trace_turn is None:
+        st.session_state.trace_turn = get_tracer().start_turn(st.session_state.session_id, kind)
+    return st.session_state.trace_turn
+
+def trace_span(name, **attrs):
+    return get_tracer().span(st.session_state.trace_turn, name, **attrs)
+
+def add_message_to_chat(text, sender):
+    st.session_state.conversation_history.append({"role": sender, "text": text})
+
+def remember_clip(digest, transcript=None, reply=None):
+    # Recorded before the clip is processed, so a rerun mid-turn (or an error) can't process it twice,
+    # then again with its transcript and reply, which are shown whenever the same clip comes back.
+    heard_clips = st.session_state.heard_clips
+    heard_clips[digest] = {"transcript": transcript, "reply": reply}
+    while len(heard_clips) > HEARD_CLIPS_LIMIT:
+        heard_clips.pop(next(iter(heard_clips)))
+
+def transcribe_audio(audio_data):
+    # Short clips go to the recognizer in one request. Long ones (a recorded catering order) are split
+    # at pauses and the parts transcribed in parallel, with progress and the text so far shown as they return.
+    transcriber = get_transcriber()
+    duration = len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width)
+    if duration <= LONG_AUDIO_SECONDS:
+        with trace_span("asr.recognize"):
+            return transcriber(audio_data)
+
+    import speech_recognition as sr
+    from speech import chunk_pcm, transcribe_chunks
+
+    chunks = chunk_pcm(audio_data.get_raw_data(convert_width=2), audio_data.sample_rate, ASR_CHUNK_SECONDS)
+    progress = st.progress(0.0, text=f"Transcribing {duration:.0f}s of audio in {len(chunks)} parts...")
+    partial = st.empty()
+
+    def show_progress(done, total, text):
+        progress.progress(done / total, text=f"Transcribed {done} of {total} parts...")
+        if text:
+            partial.markdown(f"<p style='text-align: center;'><em>{text}…</em></p>", unsafe_allow_html=True)
+
+    with trace_span("asr.recognize", chunks=len(chunks), audio_s=round(duration, 1)):
+        text = transcribe_chunks(transcriber, chunks, audio_data.sample_rate, get_asr_executor(), show_progress)
+    progress.empty()
+    partial.empty()
+    if not text:
+        raise sr.UnknownValueError()
+    return text
+
+def get_order_total():
+    return sum(item["price"] * item["quantity"] for item in st.session_state.current_order)
+
+def current_catalog():
+    # The session's location, chosen on its first run (app.py)
+    return get_catalog(st.session_state.location)
+
+def get_applied_promotions():
+    # Only the cart lines that changed since the last call are re-evaluated.
+    return st.session_state.promotion_cart.sync(st.session_state.current_order)
+
+def update_order(item_id, quantity):
+    flat_menu = current_catalog().flat_menu
+    if flat_menu.get(item_id):
+        existing_order_item = next((item for item in st.session_state.current_order if item["id"] == item_id), None)
+        if existing_order_item:
+            existing_order_item["quantity"] += quantity
+            if existing_order_item["quantity"] <= 0:
+                st.session_state.current_order = [item for item in st.session_state.current_order if item["id"] != item_id]
+        else:
+            if quantity > 0:
+                st.session_state.current_order.append({"id": flat_menu[item_id]["id"], "name": flat_menu[item_id]["name"], "price": flat_menu[item_id]["price"], "quantity": quantity})
+        return True
+    return False
+
+def add_item_to_order_from_button(item_id):
+    if update_order(item_id, 1):
+        item_name = current_catalog().flat_menu[item_id]['name']
+        st.toast(f"Added {item_name} to your order! ✅", icon="✅")
+    else:
+        st.toast(f"Could not add {item_id} to your order.", icon="❌")
+    st.rerun()
+
+def remove_order_item(item_id_to_remove):
+    st.session_state.current_order = [item for item in st.session_state.current_order if item["id"] != item_id_to_remove]
+    st.toast(f"Item removed from order. 🗑️", icon="🗑️")
+    st.rerun()
+
+def set_order_item_quantity(item_id_to_update, new_quantity):
+    if new_quantity <= 0:
+        remove_order_item(item_id_to_update)
+    else:
+        for item in st.session_state.current_order:
+            if item["id"] == item_id_to_update:
+                item["quantity"] = new_quantity
+                st.toast(f"Quantity for {item['name']} updated to {new_quantity}. 👍", icon="👍")
+                break
+    st.rerun()
+
+def process_user_input(user_input_text, clip=None):
+    # clip: the content hash of the audio clip this text was transcribed from
+    if user_input_text:
+        begin_trace_turn("text")
+        agent_response = respond_to_utterance(user_input_text)
+        if clip is not None:
+            remember_clip(clip, user_input_text, agent_response)
+        if SPOKEN_REPLIES:
+            speak_text(agent_response)
+        st.rerun()
+
+def respond_to_utterance(user_input_text, cancel=None):
+    # Returns the reply text, or None when `cancel` was set (barge-in) before the turn finished;
+    # a cancelled turn leaves the order untouched and adds no reply.
+    cassette = get_cassette()
+    if cassette is not None:
+        cassette.record_input(st.session_state.session_id, st.session_state.trace_turn["kind"], user_input_text)
+    add_message_to_chat(user_input_text, "user")
+    st.session_state.is_llm_thinking = True
+    try:
+        llm_result = get_llm_response(user_input_text, st.session_state.current_order, st.session_state.conversation_history, cancel)
+    except TurnCancelled:
+        st.session_state.trace_turn["attrs"]["tier"] = "cancelled"
+        return None
+    finally:
+        st.session_state.is_llm_thinking = False
+    # Which tier (primary model, fallback model or "local") answered each turn
+    st.session_state.turn_tiers = st.session_state.turn_tiers[-49:] + [llm_result["tier"]]
+    st.session_state.trace_turn["attrs"]["tier"] = llm_result["tier"]
+    agent_response = llm_result["response_text"]
+    add_message_to_chat(agent_response, "agent")
+    return agent_response
+
+def speak_text(text):
+    # Streamed sentence by sentence into the LiveKit room when one is connected; otherwise the
+    # reply is synthesized (mostly from the phrase cache) and played in the page after the rerun.
+    tts = get_tts_service()
+    if tts is None:
+        add_message_to_chat("Audio output is currently unavailable. Here's my response: " + text, "agent")
+        return
+    if VOICE_MODE == "livekit" and st.session_state.voice_session_started:
+        from voice import speak_in_room
+
+        if speak_in_room(text):
+            return
+    try:
+        with trace_span("tts.synthesize"):
+            st.session_state.spoken_reply = tts.synthesize_wav(text)
+    except SynthesisError:
+        # Already logged by the TTS service; the turn (or the placed order) goes on without audio
+        add_message_to_chat("Audio output is currently unavailable. Here's my response: " + text, "agent")
+
+def reask_for_valid_output(payload, bad_output, model, deadline, cancel=None):
+    # Last resort when the reply cannot be repaired locally: one deterministic, schema-pinned re-ask.
+    reask_payload = dict(payload, messages=build_reask_messages(payload["messages"], bad_output), temperature=0)
+    try:
+        reply = get_llm_client().complete(reask_payload, deadline, models=[model], cancel=cancel, session_id=st.session_state.session_id)
+    except LLMUnavailable:
+        return None
+    return get_output_validator(st.session_state.location).validate(reply["content"])
+
+def apply_intent(parsed_response, current_order_state, tier, user_message=""):
+    intent = parsed_response["intent"]
+    item_id = parsed_response["item_id"]
+    quantity = parsed_response["quantity"]
+    agent_response_text = parsed_response["response_text"] or "I'm not sure how to respond to that. 🤔"
+    flat_menu = current_catalog().flat_menu
+
+    if intent == 'order' and item_id:
+        if not check_availability(item_id):
+            agent_response_text = f"Sorry, {flat_menu.get(item_id, {}).get('name', item_id)} is out of stock. 🛑"
+        else:
+            with trace_span("order.update", item_id=item_id):
+                order_updated = update_order(item_id, quantity)
+            if order_updated:
+                suggested_item = recommendation_agent.run_task("suggest_item", current_order_state, flat_menu)
+                if suggested_item:
+                    agent_response_text += f" How about some {flat_menu[suggested_item]['name']} with that? 🍟"
+                    # Counted as an upsell conversion if it is in the cart when the order is placed
+                    if suggested_item not in st.session_state.suggested_items:
+                        st.session_state.suggested_items.append(suggested_item)
+    elif intent == 'query_menu':
+        # Menu facts come from the index, not from whatever the model remembered of the prompt
+        index_answer = get_menu_index(st.session_state.location).answer(user_message, item_id)
+        if index_answer:
+            agent_response_text = index_answer
+    elif intent in FIXED_REPLIES:
+        agent_response_text = FIXED_REPLIES[intent]
+
+    return {"intent": intent, "item_id": item_id, "quantity": quantity, "response_text": agent_response_text, "tier": tier}
+
+def build_menu_prompt(user_message, current_order_state, conv_history):
+    # Only the menu items relevant to this turn go into the prompt, so its size doesn't grow with the catalog
+    last_reply = next((turn["text"] for turn in reversed(conv_history) if turn["role"] != "user"), "")
+    return get_menu_index(st.session_state.location).menu_prompt(user_message, last_reply, [item["id"] for item in current_order_state], MENU_TOP_K)
+
+def get_llm_response(user_message: str, current_order_state: list, conv_history: list, cancel=None):
+    turn_deadline = time.monotonic() + LLM_TURN_DEADLINE
+    if LLM_BACKEND == "groq" and not GROQ_API_KEY:
+        with trace_span("llm.local_parse"):
+            parsed_response = get_local_parser(st.session_state.location).parse(user_message)
+        return apply_intent(parsed_response, current_order_state, "local", user_message)
+
+    # Filtered menu questions ("anything vegan under $5?") are answered from the menu index without an LLM call
+    with trace_span("menu.query"):
+        local_parser = get_local_parser(st.session_state.location)
+        parsed_response = local_parser.parse(user_message)
+        is_question = parsed_response["intent"] == "query_menu" and local_parser.is_menu_question(user_message)
+        index_answer = get_menu_index(st.session_state.location).answer(user_message) if is_question else None
+    if index_answer:
+        return apply_intent(dict(parsed_response, response_text=index_answer), current_order_state, "index", user_message)
+
+    # Rate limiting (Groq's; a local model server has none)
+    current_time = time.time()
+    time_since_last = current_time - st.session_state.last_request_time
+    min_interval = LLM_MIN_INTERVAL if LLM_BACKEND == "groq" else 0
+    if time_since_last < min_interval:
+        with trace_span("llm.rate_limit_wait"):
+            if cancel is not None:
+                # Wakes early on barge-in; complete() then raises TurnCancelled before sending anything
+                cancel.wait(min_interval - time_since_last)
+            else:
+                time.sleep(min_interval - time_since_last)
+
+    with trace_span("menu.retrieve"):
+        menu_prompt = build_menu_prompt(user_message, current_order_state, conv_history)
+
+    # The instructions and the conversation so far come first and are identical from turn to turn, so
+    # a server-side prompt cache (the local backend's slot) only has to evaluate this turn's additions;
+    # the per-turn menu and order follow right before the new message.
+    messages = [{"role": "system", "content": get_system_prompt(st.session_state.location)}]
+
+    for chat_turn in conv_history:
+        role = "user" if chat_turn["role"] == "user" else "assistant"
+        messages.append({"role": role, "content": chat_turn["text"]})
+
+    messages.append({
+        "role": "system",
+        "content": f"""
+        {menu_prompt}
+        Current Order (JSON): {json.dumps(current_order_state)}
+        Applied Promotions (JSON): {json.dumps(get_applied_promotions()["applied"])}
+        """
+    })
+    messages.append({"role": "user", "content": user_message})
+
+    payload = {"messages": messages, "temperature": 0.7, "max_tokens": 250, "response_format": {"type": "json_object"}}
+
+    # Hedged, deadline-bounded call across the model tiers; no retry sleeps while the customer waits
+    with trace_span("llm.request") as request_attrs:
+        try:
+            llm_reply = get_llm_client().complete(payload, turn_deadline, cancel=cancel, session_id=st.session_state.session_id)
+            request_attrs.update(model=llm_reply["model"], hedged=llm_reply["hedged"])
+        except LLMUnavailable as e:
+            llm_reply = None
+            request_attrs.update(error=str(e))
+    st.session_state.last_request_time = time.time()
+
+    llm_parsed_response = None
+    tier = "local"
+    if llm_reply:
+        tier = llm_reply["model"]
+        remaining_requests = llm_reply["headers"].get("x-ratelimit-remaining-requests")
+        if remaining_requests and int(remaining_requests) < 10:
+            st.session_state.rate_limit_warning = True
+            st.warning("Approaching rate limit. Please slow down your requests.")
+
+        output_validator = get_output_validator(st.session_state.location)
+        with trace_span("llm.parse"):
+            llm_parsed_response = output_validator.validate(llm_reply["content"])
+        if llm_parsed_response is None:
+            with trace_span("llm.reask"):
+                llm_parsed_response = reask_for_valid_output(payload, llm_reply["content"], llm_reply["model"], turn_deadline, cancel)
+            output_validator.record("reasked" if llm_parsed_response else "failed")
+        else:
+            output_validator.record("repaired" if llm_parsed_response["repaired"] else "clean")
+    if llm_parsed_response is None:
+        with trace_span("llm.local_parse"):
+            llm_parsed_response = get_local_parser(st.session_state.location).parse(user_message)
+        tier = "local"
+
+    if cancel is not None and cancel.is_set():
+        # The customer already said something new: don't apply a stale intent to the order
+        raise TurnCancelled()
+    return apply_intent(llm_parsed_response, current_order_state, tier, user_message)
@@ -0,0 +1,197 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import tarfile
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from orders import OrderValidationError, make_idempotency_key
+from speech import chunk_pcm, transcribe_chunks
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a")
+CHUNK_SECONDS = 30
+
+
+# --- Inputs ---
+def is_safe_member(name):
+    # False for archive entries that would land outside the extraction directory
+    return not os.path.isabs(name) and ".." not in name.replace("\\", "/").split("/")
+
+
+def collect_audio_files(source, extract_dir):
+    # A directory (searched recursively) or a .zip/.tar[.gz] archive of recordings, in a stable order.
+    if os.path.isfile(source):
+        if zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                for name in archive.namelist():
+                    if is_safe_member(name):
+                        archive.extract(name, extract_dir)
+        elif tarfile.is_tarfile(source):
+            with tarfile.open(source) as archive:
+                if hasattr(tarfile, "data_filter"):
+                    archive.extractall(extract_dir, filter="data")
+                else:
+                    # No extraction filters before Python 3.11.4: plain files and directories only, checked by name
+                    archive.extractall(extract_dir, members=[member for member in archive.getmembers() if (member.isfile() or member.isdir()) and is_safe_member(member.name)])
+        else:
+            raise ValueError(f"Not a directory or a zip/tar archive: {source}")
+        source = extract_dir
+    paths = glob.glob(os.path.join(source, "**", "*"), recursive=True)
+    return sorted(path for path in paths if path.lower().endswith(AUDIO_EXTENSIONS) and os.path.isfile(path))
+
+
+def file_digest(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def decode_file(path, chunk_seconds=CHUNK_SECONDS):
+    # Runs in a worker process: any pydub-readable file -> 16-bit mono PCM chunks.
+    from pydub import AudioSegment
+
+    segment = AudioSegment.from_file(path).set_channels(1).set_sample_width(2)
+    return chunk_pcm(segment.raw_data, segment.frame_rate, chunk_seconds), segment.frame_rate, segment.duration_seconds
+
+
+# --- Checkpoint ---
+# One JSON line per finished file, keyed by content hash: a restarted run skips every file that
+# already succeeded (even if it was renamed or re-archived) and retries the ones that failed.
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    if entry.get("status") == "done":
+                        self.done[entry["digest"]] = entry
+
+    def record(self, entry):
+        if entry["status"] == "done":
+            self.done[entry["digest"]] = entry
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+# --- Batch Pipeline ---
+# Files are decoded and chunked on a process pool (CPU-bound), every chunk of every file is sent to
+# the speech recognizer from a thread pool (network-bound), so a long recording is transcribed in
+# parallel too, and each finished transcript is turned into order lines and submitted to the order
+# log as soon as it is ready. The idempotency key is derived from
+# the file's content hash, so a file replayed after a crash can never create a second order.
+class BatchTranscriber:
+    def __init__(self, transcriber, parser, order_service=None, decode_workers=None, asr_workers=8, chunk_seconds=CHUNK_SECONDS):
+        self.transcriber = transcriber
+        self.parser = parser
+        self.order_service = order_service
+        self.decode_workers = decode_workers or os.cpu_count()
+        self.asr_workers = asr_workers
+        self.chunk_seconds = chunk_seconds
+        self.stats = {"files": 0, "skipped": 0, "failed": 0, "orders": 0, "audio_seconds": 0.0, "wall_seconds": 0.0}
+
+    def run(self, source, checkpoint_path=None):
+        # Yields one result dict per file as it finishes (completion order, not input order).
+        checkpoint = Checkpoint(checkpoint_path)
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory() as extract_dir, \
+                ProcessPoolExecutor(max_workers=self.decode_workers) as decoders, \
+                ThreadPoolExecutor(max_workers=self.asr_workers, thread_name_prefix="batch-file") as files, \
+                ThreadPoolExecutor(max_workers=self.asr_workers, thread_name_prefix="batch-asr") as recognizers:
+            # A file's task waits on its chunks, so files and chunks need separate pools
+            futures = {}
+            for path in collect_audio_files(source, extract_dir):
+                digest = file_digest(path)
+                if digest in checkpoint.done:
+                    self.stats["skipped"] += 1
+                    continue
+                futures[files.submit(self._transcribe_file, decoders, recognizers, path)] = (os.path.relpath(path, extract_dir if path.startswith(extract_dir) else source), digest)
+            for future in as_completed(futures):
+                name, digest = futures[future]
+                result = {"file": name, "digest": digest}
+                try:
+                    result.update(future.result())
+                    result.update(self._submit_order(digest, result["transcript"]))
+                    result["status"] = "done"
+                except Exception as e:
+                    result.update(status="failed", error=f"{type(e).__name__}: {e}")
+                    self.stats["failed"] += 1
+                self.stats["files"] += 1
+                self.stats["audio_seconds"] += result.get("duration_s", 0.0)
+                self.stats["wall_seconds"] = time.perf_counter() - started
+                checkpoint.record(result)
+                yield result
+
+    def summary(self):
+        stats = dict(self.stats)
+        minutes = stats["wall_seconds"] / 60
+        stats["files_per_minute"] = round(stats["files"] / minutes, 1) if minutes else 0.0
+        stats["audio_minutes_per_minute"] = round(stats["audio_seconds"] / 60 / minutes, 1) if minutes else 0.0
+        return stats
+
+    def _transcribe_file(self, decoders, recognizers, path):
+        chunks, sample_rate, duration = decoders.submit(decode_file, path, self.chunk_seconds).result()
+        transcript = transcribe_chunks(self.transcriber, chunks, sample_rate, recognizers)
+        return {"transcript": transcript, "duration_s": round(duration, 2), "chunks": len(chunks)}
+
+    def _submit_order(self, digest, transcript):
+        lines = self.parser.parse_order(transcript)
+        if not lines or self.order_service is None:
+            return {"lines": lines, "order_id": None}
+        try:
+            order, created = self.order_service.submit(lines, make_idempotency_key(f"batch:{digest}", lines))
+        except OrderValidationError as e:
+            return {"lines": lines, "order_id": None, "order_error": str(e)}
+        if created:
+            self.stats["orders"] += 1
+        return {"lines": lines, "order_id": order["order_id"], "total": order["total"]}
+
+
+if __name__ == "__main__":
+    from catalog import category_groups, flat_menu, menu, promotions
+    from llm_output import OutputValidator
+    from local_parser import LocalParser
+    from orders import OrderService
+    from promotions import PromotionEngine
+    from speech import make_transcriber
+
+    parser = argparse.ArgumentParser(description="Transcribe a directory or archive of recorded phone orders and submit the orders they contain")
+    parser.add_argument("source", help="Directory of WAV/MP3/M4A files, or a .zip/.tar[.gz] archive")
+    parser.add_argument("--checkpoint", default="batch.checkpoint.jsonl", help="Progress file; rerun with the same file to resume")
+    parser.add_argument("--asr", default=os.getenv("FOODIE_ASR_BACKEND", "google"), help='"google" or "stub:<corpus manifest.json>"')
+    parser.add_argument("--order-log", default=os.getenv("FOODIE_ORDER_LOG", "orders.db"))
+    parser.add_argument("--dry-run", action="store_true", help="Transcribe and extract orders without submitting them")
+    parser.add_argument("--decode-workers", type=int, default=None, help="Decoder processes (default: CPU count)")
+    parser.add_argument("--asr-workers", type=int, default=8, help="Concurrent speech recognition requests")
+    parser.add_argument("--chunk-seconds", type=float, default=CHUNK_SECONDS)
+    args = parser.parse_args()
+
+    order_service = None if args.dry_run else OrderService(args.order_log, flat_menu, promotion_engine=PromotionEngine(menu, promotions, category_groups))
+    batch = BatchTranscriber(make_transcriber(args.asr), LocalParser(OutputValidator(flat_menu), menu, promotions), order_service,
+                             args.decode_workers, args.asr_workers, args.chunk_seconds)
+    try:
+        for result in batch.run(args.source, args.checkpoint):
+            if result["status"] == "done":
+                items = ", ".join(f"{line['quantity']} x {line['id']}" for line in result["lines"]) or "no items"
+                print(f"{result['file']}: {items}" + (f" -> order {result['order_id']}" if result["order_id"] else ""))
+            else:
+                print(f"{result['file']}: FAILED {result['error']}")
+    finally:
+        if order_service is not None:
+            order_service.close()
+    summary = batch.summary()
+    print(f"{summary['files']} files ({summary['skipped']} already done, {summary['failed']} failed), {summary['orders']} orders, "
+          f"{summary['files_per_minute']} files/min, {summary['audio_minutes_per_minute']} audio min/min")
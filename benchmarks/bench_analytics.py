@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import SalesStore  # noqa: E402
+from catalog import flat_menu  # noqa: E402
+
+
+def synthetic_orders(order_count, days, seed):
+    # Columnar order lines for order_count orders over the last `days`, 1-4 lines each, priced from the catalog.
+    rng = np.random.default_rng(seed)
+    item_ids = np.array(list(flat_menu))
+    prices = np.array([round(flat_menu[item_id]["price"] * 100) for item_id in item_ids])
+    order_ts = np.sort(time.time() - rng.integers(0, days * 24 * 3600, order_count)).astype(np.int64)
+    lines_per_order = rng.integers(1, 5, order_count)
+    line_order = np.repeat(np.arange(order_count), lines_per_order)
+    items = rng.integers(0, len(item_ids), len(line_order))
+    quantity = rng.integers(1, 4, len(line_order))
+    suggested = rng.random(len(line_order)) < 0.15
+    line_totals = np.bincount(line_order, weights=quantity * prices[items], minlength=order_count)
+    lines = {"item": item_ids[items], "quantity": quantity, "price_cents": prices[items], "ts": order_ts[line_order], "suggested": suggested}
+    accepted = np.bincount(line_order, weights=suggested, minlength=order_count).astype(np.int32)
+    orders = {"ts": order_ts, "items": np.bincount(line_order, weights=quantity).astype(np.int32), "lines": lines_per_order,
+              "total_cents": np.round(line_totals * 1.08).astype(np.int64), "suggestions": accepted + rng.integers(0, 2, order_count), "accepted": accepted}
+    return lines, orders
+
+
+def as_json_rows(lines, orders):
+    # The same orders as order-log payloads, for the row-by-row baseline.
+    rows = [{"created_at": int(ts), "total": int(total) / 100, "lines": []} for ts, total in zip(orders["ts"], orders["total_cents"])]
+    order_of_line = np.repeat(np.arange(len(rows)), orders["lines"])
+    for i, item_id, quantity, price in zip(order_of_line, lines["item"], lines["quantity"], lines["price_cents"]):
+        rows[i]["lines"].append({"id": str(item_id), "quantity": int(quantity), "price": int(price) / 100})
+    return [json.dumps(row) for row in rows]
+
+
+def scan_json(payloads, start):
+    # Baseline: hourly per-item units, basket size and revenue by decoding every stored order.
+    hourly, orders, items, revenue = {}, 0, 0, 0.0
+    for payload in payloads:
+        order = json.loads(payload)
+        if order["created_at"] < start:
+            continue
+        orders += 1
+        revenue += order["total"]
+        for line in order["lines"]:
+            key = (order["created_at"] // 3600, line["id"])
+            hourly[key] = hourly.get(key, 0) + line["quantity"]
+            items += line["quantity"]
+    return hourly, orders, items / max(orders, 1), revenue
+
+
+def timed(func, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def run(order_count, days, seed, baseline_orders):
+    lines, orders = synthetic_orders(order_count, days, seed)
+    store = SalesStore(None)
+    start = time.perf_counter()
+    store.append_batch(lines, orders)
+    store.columns()
+    load_ms = (time.perf_counter() - start) * 1000
+    week = time.time() - 7 * 24 * 3600
+    print(f"{order_count:,} orders, {store.line_count():,} lines over {days} days (loaded in {load_ms:.0f} ms)")
+    for label, query in (("hourly per-item sales, 7 days", lambda: store.hourly_item_sales(week)),
+                         ("hourly per-item sales, all", lambda: store.hourly_item_sales()),
+                         ("item totals, all", lambda: store.item_totals()),
+                         ("basket stats, all", lambda: store.basket_stats()),
+                         ("upsell conversion, all", lambda: store.upsell_conversion())):
+        print(f"  {label:<32} {timed(query):8.1f} ms")
+    sample = min(order_count, baseline_orders)
+    payloads = as_json_rows({name: values[:int(orders['lines'][:sample].sum())] for name, values in lines.items()}, {name: values[:sample] for name, values in orders.items()})
+    json_ms = timed(lambda: scan_json(payloads, 0), 1) * order_count / sample
+    print(f"  {'JSON row scan (hourly + basket)':<32} {json_ms:8.1f} ms (extrapolated from {sample:,} orders)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query latency of the columnar sales store against scanning order JSON")
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--baseline-orders", type=int, default=100_000, help="Orders decoded for the JSON baseline")
+    args = parser.parse_args()
+    run(args.orders, args.days, args.seed, args.baseline_orders)
@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assistant import location_system_prompt  # noqa: E402
+from benchmarks.corpus import text_utterances  # noqa: E402
+from catalog import BASE_CATALOG, menu  # noqa: E402
+from menu_index import MenuIndex  # noqa: E402
+
+# Time-to-first-token of a local llama.cpp server over multi-turn conversations shaped like the app's
+# prompts, once recomputing every prompt from scratch and once with each conversation pinned to a slot
+# whose KV cache is reused. Start the server first, e.g. on CPU:
+#   llama-server -m qwen2.5-1.5b-instruct-q4_k_m.gguf -c 16384 --parallel 4 --port 8080
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def build_messages(index, history, order, user_text):
+    # Same layout as get_llm_response: the location's static prefix, the conversation, then this turn's context.
+    last_reply = next((text for role, text in reversed(history) if role == "assistant"), "")
+    context = (f"{index.menu_prompt(user_text, last_reply, [line['id'] for line in order], 6)}\n"
+               f"Current Order (JSON): {json.dumps(order)}\nApplied Promotions (JSON): []")
+    return ([{"role": "system", "content": location_system_prompt(BASE_CATALOG)}] + [{"role": role, "content": text} for role, text in history]
+            + [{"role": "system", "content": context}, {"role": "user", "content": user_text}])
+
+
+def stream_turn(session, url, payload):
+    # Returns (seconds to the first content token, full reply, server timings when reported).
+    start = time.perf_counter()
+    first_token, parts, timings = None, [], {}
+    with session.post(url, json=dict(payload, stream=True), stream=True, timeout=300) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line.startswith(b"data: ") or line == b"data: [DONE]":
+                continue
+            chunk = json.loads(line[len(b"data: "):])
+            timings = chunk.get("timings", timings)
+            content = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content")
+            if content:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(content)
+    return first_token if first_token is not None else time.perf_counter() - start, "".join(parts), timings
+
+
+def run(url, model, conversations, turns, slots, max_tokens, seed):
+    index = MenuIndex(menu)
+    utterances = text_utterances(conversations * turns, seed)
+    session = requests.Session()
+    results = {}
+    for label, reuse in (("no reuse", False), ("slot reuse", True)):
+        ttft, by_turn, evaluated = [], [[] for _ in range(turns)], []
+        for c in range(conversations):
+            history, order = [], []
+            for t in range(turns):
+                text = utterances[c * turns + t]["text"]
+                history.append(("user", text))
+                payload = {"model": model, "messages": build_messages(index, history, order, text), "temperature": 0,
+                           "max_tokens": max_tokens, "cache_prompt": reuse}
+                if reuse:
+                    payload["id_slot"] = c % slots
+                seconds, reply, timings = stream_turn(session, url, payload)
+                ttft.append(seconds)
+                by_turn[t].append(seconds)
+                if "prompt_n" in timings:
+                    evaluated.append(timings["prompt_n"])
+                try:
+                    reply = json.loads(reply).get("response_text", reply)
+                except (ValueError, AttributeError):
+                    pass
+                history.append(("assistant", str(reply)))
+        results[label] = ttft
+        per_turn = "  ".join(f"t{t + 1} {sum(v) / len(v) * 1000:6.0f}" for t, v in enumerate(by_turn))
+        tokens = f"  | prompt tokens evaluated/turn {sum(evaluated) / len(evaluated):6.0f}" if evaluated else ""
+        print(f"{label:<11} TTFT p50 {percentile(ttft, 0.5) * 1000:7.0f} ms  p95 {percentile(ttft, 0.95) * 1000:7.0f} ms{tokens}")
+        print(f"{'':<11} mean by turn (ms): {per_turn}")
+    print(f"p50 speedup with slot reuse: {percentile(results['no reuse'], 0.5) / percentile(results['slot reuse'], 0.5):.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time-to-first-token of a local llama.cpp server with and without per-session slot (KV cache) reuse")
+    parser.add_argument("--url", default=os.getenv("FOODIE_LOCAL_LLM_URL", "http://127.0.0.1:8080/v1/chat/completions"))
+    parser.add_argument("--model", default=os.getenv("FOODIE_LOCAL_LLM_MODEL", "qwen2.5-1.5b-instruct-q4_k_m"))
+    parser.add_argument("--conversations", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--slots", type=int, default=int(os.getenv("FOODIE_LOCAL_LLM_SLOTS", "4")), help="Must match llama-server --parallel")
+    parser.add_argument("--max-tokens", type=int, default=96)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    run(args.url, args.model, args.conversations, args.turns, args.slots, args.max_tokens, args.seed)
@@ -0,0 +1,68 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from orders import OrderService, make_idempotency_key  # noqa: E402
+
+FLAT_MENU = {
+    "beef_burger": {"id": "beef_burger", "name": "Classic Cheeseburger", "price": 12.99},
+    "margherita_pizza": {"id": "margherita_pizza", "name": "Margherita Pizza", "price": 16.99},
+    "golden_fries": {"id": "golden_fries", "name": "Golden Fries", "price": 4.00},
+    "garden_salad": {"id": "garden_salad", "name": "Garden Salad", "price": 5.50},
+}
+
+
+def random_cart(rng):
+    item_ids = rng.sample(list(FLAT_MENU), rng.randint(1, len(FLAT_MENU)))
+    return [{"id": item_id, "quantity": rng.randint(1, 3)} for item_id in item_ids]
+
+
+def run(orders, threads, duplicate_rate):
+    with tempfile.TemporaryDirectory() as tmp:
+        service = OrderService(os.path.join(tmp, "orders.db"), FLAT_MENU)
+        per_thread = orders // threads
+        duplicates = [0] * threads
+
+        def customer(index):
+            rng = random.Random(index)
+            for n in range(per_thread):
+                cart = random_cart(rng)
+                key = make_idempotency_key(f"bench-{index}-{n}", cart)
+                service.submit(cart, key)
+                if rng.random() < duplicate_rate:
+                    _, created = service.submit(cart, key)
+                    duplicates[index] += not created
+
+        start = time.perf_counter()
+        workers = [threading.Thread(target=customer, args=(i,)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        submitted = time.perf_counter() - start
+        service.kitchen.join()
+        drained = time.perf_counter() - start
+
+        stored = service.order_log.count()
+        service.close()
+
+    print(f"orders submitted:        {per_thread * threads} ({threads} threads)")
+    print(f"duplicates collapsed:    {sum(duplicates)}")
+    print(f"orders stored:           {stored}")
+    print(f"submit throughput:       {stored / submitted:,.0f} orders/s")
+    print(f"end-to-end (kitchen):    {stored / drained:,.0f} orders/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Order submission throughput benchmark")
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    args = parser.parse_args()
+    run(args.orders, args.threads, args.duplicate_rate)
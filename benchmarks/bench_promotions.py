@@ -0,0 +1,68 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from promotions import PromotionEngine  # noqa: E402
+
+
+def synthetic_catalog(categories, items_per_category, promotion_count, rng):
+    menu = {
+        f"category_{c}": [
+            {"id": f"item_{c}_{i}", "name": f"Item {c}-{i}", "price": round(rng.uniform(2, 20), 2)}
+            for i in range(items_per_category)
+        ]
+        for c in range(categories)
+    }
+    item_ids = [item["id"] for items in menu.values() for item in items]
+    promotions = []
+    for p in range(promotion_count):
+        slots = [rng.choice(list(menu)) if rng.random() < 0.7 else rng.choice(item_ids) for _ in range(rng.randint(1, 3))]
+        promotions.append({"id": f"promo_{p}", "name": f"Promo {p}", "items": slots, "discount": round(rng.uniform(0.5, 6), 2)})
+    return menu, promotions, item_ids
+
+
+def run(categories, items_per_category, promotion_count, cart_size, operations, seed):
+    rng = random.Random(seed)
+    menu, promotions, item_ids = synthetic_catalog(categories, items_per_category, promotion_count, rng)
+
+    start = time.perf_counter()
+    engine = PromotionEngine(menu, promotions)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    cart = engine.new_cart()
+    lines = {item_id: rng.randint(1, 3) for item_id in rng.sample(item_ids, cart_size)}
+    cart.sync([{"id": item_id, "quantity": q} for item_id, q in lines.items()])
+    cart.result()
+
+    timings = []
+    for _ in range(operations):
+        item_id = rng.choice(item_ids)
+        lines[item_id] = max(0, lines.get(item_id, 0) + rng.choice((-1, 1)))
+        start = time.perf_counter()
+        cart.set_quantity(item_id, lines[item_id])
+        result = cart.result()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    print(f"catalog:          {len(item_ids)} items, {promotion_count} promotions (compiled in {compile_ms:.1f} ms)")
+    print(f"cart:             {sum(1 for q in lines.values() if q)} lines, {len(cart.candidates)} applicable promotions")
+    print(f"best discount:    ${result['discount_total']:.2f} from {len(result['applied'])} promotions")
+    print(f"line change p50:  {timings[len(timings) // 2] * 1000:.3f} ms")
+    print(f"line change p95:  {timings[int(len(timings) * 0.95)] * 1000:.3f} ms")
+    print(f"line change max:  {timings[-1] * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Promotion engine benchmark")
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--items-per-category", type=int, default=25)
+    parser.add_argument("--promotions", type=int, default=500)
+    parser.add_argument("--cart-size", type=int, default=60)
+    parser.add_argument("--operations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.categories, args.items_per_category, args.promotions, args.cart_size, args.operations, args.seed)
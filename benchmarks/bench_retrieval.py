@@ -0,0 +1,104 @@
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import text_utterances  # noqa: E402
+from catalog import menu  # noqa: E402
+from menu_index import MenuIndex  # noqa: E402
+
+# Utterances that name an item indirectly; any of the listed ids counts as a hit.
+DESCRIPTIVE = [
+    ("something with mozzarella", "", ["margherita_pizza", "pepperoni_pizza"]),
+    ("do you have anything with bacon", "", ["bbq_bacon_burger"]),
+    ("I'd like buffalo wings", "", ["chicken_wings"]),
+    ("a cold drink with mint", "", ["lemonade"]),
+    ("something chocolate for dessert", "", ["chocolate_brownie"]),
+    ("a salad with cucumber", "", ["garden_salad"]),
+    ("crispy french fries please", "", ["golden_fries"]),
+    ("the burger with bbq sauce", "", ["bbq_bacon_burger"]),
+    ("a vegan side", "", ["golden_fries", "garden_salad"]),
+    ("yes please add that", "How about some Fresh Lemonade with that? 🍟", ["lemonade"]),
+    ("sure, one of those", "How about some Coca-Cola with that? 🍟", ["coke"]),
+    ("make it two", "Great choice! Adding a Chocolate Brownie to your order.", ["chocolate_brownie"]),
+]
+WORDS = ("smoked", "grilled", "crispy", "spicy", "sweet", "garlic", "truffle", "lemon", "honey", "herb", "cheesy", "roasted",
+         "chicken", "beef", "tofu", "salmon", "mushroom", "pepper", "onion", "tomato", "basil", "ginger", "chili", "sesame")
+DISHES = ("burger", "pizza", "wrap", "bowl", "salad", "taco", "noodles", "soup", "sandwich", "curry", "pasta", "skewer")
+
+
+def count_tokens(text):
+    # Word and punctuation pieces: close to a BPE count for JSON menus, and identical for both prompt variants.
+    return len(re.findall(r"\w+|[^\w\s]", text))
+
+
+def synthetic_menu(size, rng):
+    # Real-looking, mostly distinct dish names over a small vocabulary, spread over size/25 categories.
+    names, catalog = set(), {}
+    while len(names) < size:
+        names.add(f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {rng.choice(DISHES).title()}")
+    for i, name in enumerate(sorted(names)):
+        words = name.lower().split()
+        catalog.setdefault(f"category_{i % max(1, size // 25)}", []).append({
+            "id": "_".join(words) + f"_{i}", "name": name, "price": round(rng.uniform(3, 25), 2),
+            "description": f"{words[-1].title()} with {rng.choice(WORDS)}, {rng.choice(WORDS)} and {rng.choice(WORDS)}.",
+            "dietary": rng.sample(["vegetarian", "vegan", "spicy"], rng.randint(0, 1)),
+        })
+    return catalog
+
+
+def evaluate(index, labeled, k):
+    hits, full_tokens, retrieved_tokens, timings = 0, 0, 0, []
+    for text, context, expected in labeled:
+        start = time.perf_counter()
+        prompt = index.menu_prompt(text, context, (), k)
+        timings.append(time.perf_counter() - start)
+        retrieved = {item["id"] for item in index.retrieve(text, context, (), k)}
+        hits += bool(retrieved & set(expected))
+        full_tokens += count_tokens(index.menu_prompt(text, context, (), 0))
+        retrieved_tokens += count_tokens(prompt)
+    timings.sort()
+    return {
+        "utterances": len(labeled),
+        "recall": hits / len(labeled),
+        "full_tokens": full_tokens / len(labeled),
+        "retrieved_tokens": retrieved_tokens / len(labeled),
+        "p50_ms": timings[len(timings) // 2] * 1000,
+    }
+
+
+def report(name, items, result):
+    print(f"{name:<16} {items:>6} {result['utterances']:>6} {result['full_tokens']:>10.0f} {result['retrieved_tokens']:>10.0f} "
+          f"{result['full_tokens'] / result['retrieved_tokens']:>7.1f}x {result['recall']:>8.1%} {result['p50_ms']:>8.3f}")
+
+
+def run(k, utterances, sizes, seed):
+    print(f"{'catalog':<16} {'items':>6} {'turns':>6} {'full tok':>10} {'top-k tok':>10} {'saving':>8} {'recall':>8} {'p50 ms':>8}")
+    index = MenuIndex(menu)
+    orders = [(u["text"], "", [u["item_id"]]) for u in text_utterances(utterances) if u["item_id"]]
+    report("menu: orders", len(index.items), evaluate(index, orders, k))
+    report("menu: described", len(index.items), evaluate(index, DESCRIPTIVE, k))
+
+    rng = random.Random(seed)
+    templates = ("I'd like the {name}", "can I get a {name} please", "one {name}", "{name}")
+    for size in sizes:
+        catalog = synthetic_menu(size, rng)
+        start = time.perf_counter()
+        index = MenuIndex(catalog)
+        build_ms = (time.perf_counter() - start) * 1000
+        labeled = [(rng.choice(templates).format(name=item["name"].lower()), "", [item["id"]]) for item in rng.sample(index.items, min(utterances, len(index.items)))]
+        report(f"synthetic ({build_ms:.0f} ms)", size, evaluate(index, labeled, k))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Menu prompt size and retrieval recall on labeled utterances (full menu vs top-k retrieval)")
+    parser.add_argument("--k", type=int, default=6, help="Items retrieved per turn (FOODIE_MENU_TOP_K)")
+    parser.add_argument("--utterances", type=int, default=200)
+    parser.add_argument("--sizes", default="100,500,2000", help="Synthetic catalog sizes")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.k, args.utterances, [int(size) for size in args.sizes.split(",") if size], args.seed)
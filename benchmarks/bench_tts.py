@@ -0,0 +1,59 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import flat_menu  # noqa: E402
+from tts import PhraseCache, TTSService, make_tts_engine  # noqa: E402
+
+# Replies the assistant sends verbatim, plus order confirmations in the shape apply_intent builds them.
+FIXED_REPLIES = [
+    "Hello there! How can I help you with your order today? 🌟",
+    "You're most welcome! Is there anything else I can assist you with? 😊",
+    "Goodbye! Hope to serve you again soon! 👋",
+]
+
+
+def order_reply(rng):
+    item, suggestion = rng.sample(list(flat_menu.values()), 2)
+    return f"Great choice! Adding {rng.randint(1, 3)} x {item['name']} to your order. ✅ How about some {suggestion['name']} with that? 🍟"
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run(backend, replies, fixed_share, seed):
+    engine = make_tts_engine(backend)
+    if engine is None:
+        sys.exit(f"No TTS engine available for backend {backend!r}: install espeak-ng or set FOODIE_PIPER_MODEL.")
+    rng = random.Random(seed)
+    texts = [rng.choice(FIXED_REPLIES) if rng.random() < fixed_share else order_reply(rng) for _ in range(replies)]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label, service in (("no cache", TTSService(engine, PhraseCache(None, max_entries=0))), ("phrase cache", TTSService(engine, PhraseCache(cache_dir)))):
+            first_audio, full_reply = [], []
+            for text in texts:
+                start = time.perf_counter()
+                for i, _ in enumerate(service.stream(text)):
+                    if i == 0:
+                        first_audio.append((time.perf_counter() - start) * 1000)
+                full_reply.append((time.perf_counter() - start) * 1000)
+            summary = service.summary()
+            print(f"{label:<13} first audio p50 {percentile(first_audio, 0.5):7.1f} ms  p95 {percentile(first_audio, 0.95):7.1f} ms  "
+                  f"| whole reply p50 {percentile(full_reply, 0.5):7.1f} ms  | cache hit rate {summary['hit_rate']:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time-to-first-audio of spoken replies, with and without the phrase cache")
+    parser.add_argument("--backend", default=os.getenv("FOODIE_TTS", "auto"), help='"auto", "espeak[:<voice>]" or "piper:<model.onnx>"')
+    parser.add_argument("--replies", type=int, default=100)
+    parser.add_argument("--fixed-share", type=float, default=0.4, help="Share of replies that are fixed greetings/thanks/farewells")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.backend, args.replies, args.fixed_share, args.seed)
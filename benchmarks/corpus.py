@@ -0,0 +1,126 @@
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_RATE = 16000
+
+# Spoken names for the menu items, with the item id the utterance should resolve to.
+ITEMS = [
+    ("beef_burger", "classic cheeseburger"),
+    ("bbq_bacon_burger", "bbq bacon burger"),
+    ("margherita_pizza", "margherita pizza"),
+    ("pepperoni_pizza", "pepperoni pizza"),
+    ("golden_fries", "golden fries"),
+    ("chicken_wings", "spicy chicken wings"),
+    ("garden_salad", "garden salad"),
+    ("coke", "coke"),
+    ("lemonade", "lemonade"),
+    ("chocolate_brownie", "chocolate brownie"),
+]
+
+ORDER_TEMPLATES = [
+    "I'd like {qty} {name}",
+    "Can I get {qty} {name} please",
+    "{qty} {name}",
+    "Add {qty} {name} to my order",
+    "Give me {qty} {name}",
+]
+
+QUANTITIES = [("one", 1), ("two", 2), ("three", 3), ("a", 1)]
+
+OTHER_UTTERANCES = [
+    ("Hello there", "greeting"),
+    ("What's on the menu?", "query_menu"),
+    ("Are there any promotions?", "other"),
+    ("Thank you so much", "thank_you"),
+    ("Goodbye", "farewell"),
+]
+
+
+def text_utterances(count, seed=0):
+    rng = random.Random(seed)
+    utterances = []
+    for i in range(count):
+        if i % 5 == 4:
+            text, intent = OTHER_UTTERANCES[(i // 5) % len(OTHER_UTTERANCES)]
+            utterances.append({"text": text, "intent": intent, "item_id": None, "quantity": None})
+            continue
+        item_id, name = rng.choice(ITEMS)
+        word, quantity = rng.choice(QUANTITIES)
+        text = rng.choice(ORDER_TEMPLATES).format(qty=word, name=name)
+        utterances.append({"text": text, "intent": "order", "item_id": item_id, "quantity": quantity})
+    return utterances
+
+
+# --- Audio Synthesis ---
+def synthesize_wav(text, path):
+    # Real speech through espeak-ng when it is installed, otherwise one deterministic tone
+    # burst per word: the stub ASR maps clips by fingerprint, so only the decode cost matters.
+    espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+    if espeak:
+        subprocess.run([espeak, "-s", "160", "-w", path, text], check=True, capture_output=True)
+        return
+    frames = bytearray()
+    for word in text.split():
+        frequency = 200 + (sum(map(ord, word)) % 600)
+        for n in range(int(SAMPLE_RATE * (0.12 + 0.04 * len(word)))):
+            envelope = min(1.0, n / 400)
+            frames += struct.pack("<h", int(9000 * envelope * math.sin(2 * math.pi * frequency * n / SAMPLE_RATE)))
+        frames += b"\x00\x00" * int(SAMPLE_RATE * 0.08)
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(bytes(frames))
+
+
+def build_corpus(out_dir, clips, utterances, seed=0):
+    from pydub import AudioSegment
+    from speech import audio_fingerprint, decode_audio
+
+    os.makedirs(out_dir, exist_ok=True)
+    has_ffmpeg = shutil.which("ffmpeg") is not None
+    manifest = {"utterances": text_utterances(utterances, seed), "clips": []}
+    for i, utterance in enumerate(text_utterances(clips, seed + 1)):
+        wav_path = os.path.join(out_dir, f"clip_{i:03d}.wav")
+        synthesize_wav(utterance["text"], wav_path)
+        formats = [("wav", wav_path)]
+        if has_ffmpeg and i % 2:
+            mp3_path = wav_path[:-4] + ".mp3"
+            AudioSegment.from_file(wav_path, format="wav").export(mp3_path, format="mp3")
+            formats.append(("mp3", mp3_path))
+        for audio_format, path in formats:
+            with open(path, "rb") as f:
+                audio_data = decode_audio(f.read(), format=audio_format)
+            manifest["clips"].append(dict(
+                utterance,
+                file=os.path.basename(path),
+                format=audio_format,
+                duration_s=round(len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width), 3),
+                fingerprint=audio_fingerprint(audio_data),
+            ))
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    if not has_ffmpeg:
+        print("ffmpeg not found: generated WAV clips only")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the benchmark corpus of spoken-order clips and text utterances")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus"))
+    parser.add_argument("--clips", type=int, default=20)
+    parser.add_argument("--utterances", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    manifest = build_corpus(args.out, args.clips, args.utterances, args.seed)
+    print(f"Wrote {len(manifest['clips'])} clips and {len(manifest['utterances'])} utterances to {args.out}")
@@ -0,0 +1,225 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import audio_recorder_streamlit  # noqa: E402
+import streamlit as st  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.pages_manager import PagesManager  # noqa: E402
+from streamlit.runtime.scriptrunner import ScriptRunnerEvent  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.secrets import Secrets  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+from streamlit.testing.v1.util import patch_config_options  # noqa: E402
+
+from benchmarks.mock_groq import MockGroqServer  # noqa: E402
+from benchmarks.run import DEFAULT_CORPUS, configure_app, load_manifest, new_app_test, summarize  # noqa: E402
+
+ACTIONS = {"add_button": 0.4, "chat": 0.4, "audio": 0.2}
+# Session-state key the stub recorder reads: the browser-side recorder component can't be driven from AppTest.
+RECORDER_KEY = "loadtest_recorded_audio"
+STOPPED_EVENTS = {
+    ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+    ScriptRunnerEvent.SCRIPT_STOPPED_FOR_RERUN,
+    ScriptRunnerEvent.SCRIPT_STOPPED_WITH_COMPILE_ERROR,
+}
+
+
+# --- Shared Server Runtime ---
+# AppTest installs and tears down a global mock Runtime, secrets and config on every run, so two
+# instances can't run at once. For a load test they are installed once, as on a real server,
+# and each virtual customer only owns its script runner and session state.
+class SharedRuntime:
+    def __init__(self, secrets):
+        self.secrets = secrets
+        self._config = patch_config_options({"global.appTest": True})
+
+    def __enter__(self):
+        runtime = MagicMock(spec=Runtime)
+        runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+        runtime.cache_storage_manager = MemoryCacheStorageManager()
+        Runtime._instance = runtime
+        self._saved_secrets = st.secrets
+        st.secrets = Secrets()
+        st.secrets._secrets = dict(self.secrets)
+        self._saved_recorder = audio_recorder_streamlit.audio_recorder
+        audio_recorder_streamlit.audio_recorder = lambda **kwargs: st.session_state.pop(RECORDER_KEY, None)
+        self._config.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._config.__exit__(*exc_info)
+        audio_recorder_streamlit.audio_recorder = self._saved_recorder
+        st.secrets = self._saved_secrets
+        Runtime._instance = None
+
+
+class VirtualCustomer(AppTest):
+    # One kiosk session. server_seconds is the script time of the last interaction, summed over
+    # the st.rerun()s it triggered, excluding the harness's own polling and tree parsing.
+    script_cache = ScriptCache()
+
+    def _run(self, widget_state=None, timeout=None):
+        runner = LocalScriptRunner(self._script_path, self.session_state, PagesManager(self._script_path, self.script_cache, setup_watcher=False), args=self.args, kwargs=self.kwargs)
+        # LocalScriptRunner recompiles the script on every run; a server compiles it once for all sessions.
+        runner._script_cache = self.script_cache
+        self.server_seconds = 0.0
+        started = []
+
+        def on_event(sender, event, **kwargs):
+            if event == ScriptRunnerEvent.SCRIPT_STARTED:
+                started.append(time.perf_counter())
+            elif event in STOPPED_EVENTS and started:
+                self.server_seconds += time.perf_counter() - started.pop()
+
+        runner.on_event.connect(on_event, weak=False)
+        self._tree = runner.run(widget_state, self.query_params, timeout or self.default_timeout, self._page_hash)
+        self._tree._runner = self
+        return self
+
+
+# --- Customer Script ---
+def interact(at, action, rng, manifest, clips):
+    if action == "add_button":
+        rng.choice([button for button in at.button if button.key.startswith("add_to_order_")]).click().run()
+    elif action == "chat":
+        at.chat_input[0].set_value(rng.choice(manifest["utterances"])["text"]).run()
+    else:
+        # Cycles through the customer's own shuffled clip list: the app skips a clip it has already heard
+        clip = clips.pop(0)
+        clips.append(clip)
+        at.session_state[RECORDER_KEY] = clip
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def customer_session(index, args, manifest, clips, samples, errors, start_barrier):
+    rng = random.Random(args.seed * 1000 + index)
+    clips = rng.sample(clips, len(clips))
+    start_barrier.wait()
+    at = None
+    try:
+        at = new_app_test(VirtualCustomer)
+        samples.append(("open", at.server_seconds))
+        for _ in range(args.interactions):
+            action = rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+            interact(at, action, rng, manifest, clips)
+            samples.append((action, at.server_seconds))
+            if args.think_ms:
+                time.sleep(rng.expovariate(1000 / args.think_ms))
+    except Exception as e:
+        errors.append(f"customer {index}: {e}")
+    return at
+
+
+def run_level(sessions, args, manifest, clips):
+    samples, errors = [], []
+    start_barrier = threading.Barrier(sessions + 1)
+    threads = [threading.Thread(target=customer_session, args=(i, args, manifest, clips, samples, errors, start_barrier), daemon=True) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    result = summarize([seconds for _, seconds in samples], wall)
+    result["sessions"] = sessions
+    result["errors"] = len(errors)
+    result["first_errors"] = errors[:3]
+    result["by_action"] = {
+        action: summarize([seconds for name, seconds in samples if name == action], wall)
+        for action in ["open"] + list(ACTIONS)
+    }
+    return result
+
+
+def memory_per_session(args, manifest, clips, sessions=5):
+    # Python heap retained per live session after a scripted visit (session state, history, cart).
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [customer_session(i, args, manifest, clips, [], [], threading.Barrier(1)) for i in range(sessions)]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return round(retained / sessions / 1024, 1)
+
+
+def find_saturation(levels, min_gain, slo_ms):
+    # The knee: the last level whose throughput still grew by min_gain over the best so far
+    # without breaking the p95 SLO or erroring.
+    best, saturation = None, None
+    for level in levels:
+        healthy = not level["errors"] and (level["p95_ms"] or 0) <= slo_ms
+        if not healthy or (best is not None and level["throughput_per_s"] < best["throughput_per_s"] * (1 + min_gain)):
+            return saturation, level["sessions"]
+        best = saturation = level
+    return saturation, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent kiosk sessions against app.py")
+    parser.add_argument("--sessions", default="1,2,4,8,16,32", help="Comma-separated concurrency levels to step through")
+    parser.add_argument("--interactions", type=int, default=12, help="Interactions per virtual customer")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean think time between interactions")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Mock LLM mean latency")
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--deadline", type=float, default=8.0)
+    parser.add_argument("--slo-ms", type=float, default=2000.0, help="p95 server time above which a level counts as saturated")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="Throughput growth a level needs over the previous best")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.corpus)
+    clips = []
+    for clip in manifest["clips"]:
+        if clip["format"] == "wav":
+            with open(os.path.join(args.corpus, clip["file"]), "rb") as f:
+                clips.append(f.read())
+
+    mock = MockGroqServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, labels=manifest["utterances"] + manifest["clips"]).start()
+    configure_app(mock, args)
+    results = {"levels": []}
+    try:
+        with SharedRuntime({"GROQ_API_KEY": "bench-key"}):
+            # Warm-up: imports, cached resources and compiled script are shared by every later session.
+            customer_session(0, args, manifest, clips, [], [], threading.Barrier(1))
+            results["memory_per_session_kb"] = memory_per_session(args, manifest, clips)
+            for sessions in (int(n) for n in args.sessions.split(",")):
+                level = run_level(sessions, args, manifest, clips)
+                results["levels"].append(level)
+                print(f"{sessions:>4} sessions: {level['throughput_per_s']:>7} interactions/s  p50 {level['p50_ms']} ms  p95 {level['p95_ms']} ms  errors {level['errors']}")
+    finally:
+        mock.stop()
+
+    saturation, saturated_at = find_saturation(results["levels"], args.min_gain, args.slo_ms)
+    results["saturation"] = {
+        "max_sessions": saturation["sessions"] if saturation else 0,
+        "throughput_per_s": saturation["throughput_per_s"] if saturation else 0,
+        "saturated_at": saturated_at,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# --- Mock OpenAI-compatible Chat Completions Server ---
+# Answers POST /v1/chat/completions (and /openai/v1/chat/completions) like Groq does, with
+# configurable latency, injected 429s and SSE streaming. Replies are the labelled intent for
+# utterances from the benchmark corpus, so the app's ordering logic runs end to end.
+class MockGroqServer:
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=300.0, jitter_ms=50.0, rate_limit_rate=0.0,
+                 retry_after=1.0, stream_chunk_ms=20.0, labels=None, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stream_chunk_ms = stream_chunk_ms
+        self.labels = {normalize(label["text"]): label for label in (labels or [])}
+        self.stats = {"requests": 0, "rate_limited": 0, "streamed": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/openai/v1/chat/completions"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-groq", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reply_for(self, messages):
+        user_text = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        label = self.labels.get(normalize(user_text))
+        if label is None:
+            return {"intent": "greeting", "item_id": None, "quantity": None, "response_text": "Hello! What can I get you? 🌟"}
+        return {
+            "intent": label["intent"],
+            "item_id": label["item_id"],
+            "quantity": label["quantity"],
+            "response_text": "Great choice! 🍔" if label["intent"] == "order" else "Happy to help! 😊",
+        }
+
+    def _next_delay(self):
+        with self._lock:
+            return max(0.0, self._rng.gauss(self.latency_ms, self.jitter_ms)) / 1000, self._rng.random() < self.rate_limit_rate
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                mock._count("requests")
+                delay, rate_limited = mock._next_delay()
+                if rate_limited:
+                    mock._count("rate_limited")
+                    self._send_json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}}, {"retry-after": str(mock.retry_after)})
+                    return
+                time.sleep(delay)
+                content = json.dumps(mock.reply_for(payload.get("messages", [])))
+                completion_id = f"chatcmpl-mock-{next(mock._ids)}"
+                if payload.get("stream"):
+                    mock._count("streamed")
+                    self._stream(completion_id, payload.get("model", "mock"), content)
+                    return
+                self._send_json(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": payload.get("model", "mock"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": len(json.dumps(payload.get("messages", []))) // 4, "completion_tokens": len(content) // 4},
+                }, {"x-ratelimit-remaining-requests": "1000"})
+
+            def _send_json(self, status, body, headers=None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, completion_id, model, content):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for start in range(0, len(content), 16):
+                    chunk = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                             "choices": [{"index": 0, "delta": {"content": content[start:start + 16]}, "finish_reason": None}]}
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                    time.sleep(mock.stream_chunk_ms / 1000)
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, text):
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def normalize(text):
+    return " ".join(str(text).lower().split())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible Groq server")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--manifest", help="Corpus manifest.json whose labels drive the replies")
+    args = parser.parse_args()
+    labels = []
+    if args.manifest:
+        with open(args.manifest, encoding="utf-8") as f:
+            manifest = json.load(f)
+        labels = manifest["utterances"] + manifest["clips"]
+    mock = MockGroqServer(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_limit_rate=args.rate_limit_rate, labels=labels)
+    print(f"Mock Groq listening on {mock.url} (set GROQ_API_URL to this)")
+    mock.server.serve_forever()
@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.run import compare, summarize  # noqa: E402
+
+
+# Replays the sessions of a cassette (recorded with FOODIE_CASSETTE=record:<dir>) through the full
+# app: each recorded customer input goes through chat input -> process_user_input -> rerender, with
+# the LLM and ASR answered from the cassette. "instant" leaves only our own code on the clock, so
+# its latencies are a deterministic regression check; "recorded" reproduces production pacing.
+def replay(cassette_path, speed, sessions=None):
+    os.environ.update({
+        "FOODIE_CASSETTE": f"replay:{cassette_path}",
+        "FOODIE_REPLAY_SPEED": speed,
+        "FOODIE_LLM_MIN_INTERVAL": "0" if speed == "instant" else os.getenv("FOODIE_LLM_MIN_INTERVAL", "2"),
+        "FOODIE_ORDER_LOG": os.path.join(tempfile.mkdtemp(prefix="foodie-replay-"), "orders.db"),
+    })
+    from streamlit.testing.v1 import AppTest
+
+    from cassettes import Cassette
+
+    recorded = Cassette.load(cassette_path).sessions()
+    session_ids = list(recorded)[:sessions] if sessions else list(recorded)
+    latencies, tiers = [], {}
+    start = time.perf_counter()
+    for session_id in session_ids:
+        # The recorded session id, so requests the cassette can't match by content still replay in order
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        at.secrets["GROQ_API_KEY"] = "replay"
+        at.session_state["session_id"] = session_id
+        at.run()
+        for text in recorded[session_id]:
+            turn_start = time.perf_counter()
+            at.chat_input[0].set_value(text).run()
+            latencies.append(time.perf_counter() - turn_start)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+        for tier in at.session_state.turn_tiers:
+            tiers[tier] = tiers.get(tier, 0) + 1
+    result = summarize(latencies, time.perf_counter() - start)
+    result["sessions"] = len(session_ids)
+    result["tiers"] = tiers
+
+    from services import get_llm_client, get_tracer
+
+    result["client"] = dict(get_llm_client().stats)
+    # Mean time per traced stage, to see where a regression went
+    result["stages_ms"] = {stage: round(stats["sum"] / stats["count"] * 1000, 2) for stage, stats in sorted(get_tracer().stages.items()) if stats["count"]}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded sessions through the app")
+    parser.add_argument("cassette", help="Cassette file (.jsonl.gz) written with FOODIE_CASSETTE=record:<dir>")
+    parser.add_argument("--speed", choices=["instant", "recorded"], default="instant")
+    parser.add_argument("--sessions", type=int, help="Replay only the first N sessions")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--save-baseline", help="Store the results as the new baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    results = {f"replay_{args.speed}": replay(args.cassette, args.speed, args.sessions)}
+    print(json.dumps(results, indent=2))
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"comparison against {args.compare} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("REGRESSIONS:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
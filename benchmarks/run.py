@@ -0,0 +1,201 @@
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import build_corpus  # noqa: E402
+from benchmarks.mock_groq import MockGroqServer  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus")
+
+# Metric name -> True when higher is better. Only these are compared against a baseline.
+COMPARED_METRICS = {"p50_ms": False, "p95_ms": False, "p99_ms": False, "throughput_per_s": True, "peak_rss_mb": False}
+
+
+def summarize(latencies, wall_seconds):
+    latencies = sorted(latencies)
+
+    def percentile(q):
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 2) if latencies else None
+
+    return {
+        "count": len(latencies),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+        "throughput_per_s": round(len(latencies) / wall_seconds, 2) if wall_seconds else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+# --- Scenarios ---
+def scenario_llm(mock, manifest, args):
+    # LLMClient against the mock: hedging, 429 fallback and raw request throughput.
+    from llm_client import LLMClient, LLMUnavailable
+
+    client = LLMClient(mock.url, "bench-key", ["llama3-8b-8192", "llama-3.1-8b-instant"])
+    utterances = manifest["utterances"][:args.turns]
+
+    def turn(utterance):
+        start = time.perf_counter()
+        try:
+            client.complete({"messages": [{"role": "user", "content": utterance["text"]}]}, time.monotonic() + args.deadline)
+        except LLMUnavailable:
+            pass
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(turn, utterances))
+    result = summarize(latencies, time.perf_counter() - start)
+    result["client"] = dict(client.stats)
+    return result
+
+
+def scenario_text(mock, manifest, args):
+    # Full script runs through Streamlit's AppTest: chat input -> process_user_input -> rerender.
+    at = new_app_test()
+    latencies = []
+    start = time.perf_counter()
+    for utterance in manifest["utterances"][:args.turns]:
+        turn_start = time.perf_counter()
+        at.chat_input[0].set_value(utterance["text"]).run()
+        latencies.append(time.perf_counter() - turn_start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    result = summarize(latencies, time.perf_counter() - start)
+    result["tiers"] = tally(at.session_state.turn_tiers)
+    return result
+
+
+def scenario_audio(mock, manifest, args):
+    # Decode + (stub) ASR for every clip, then the transcript goes through the app like a voice turn.
+    from speech import decode_audio, make_transcriber
+
+    transcriber = make_transcriber(f"stub:{os.path.join(args.corpus, 'manifest.json')}")
+    at = new_app_test()
+    decode_latencies, turn_latencies = [], []
+    start = time.perf_counter()
+    for clip in manifest["clips"][:args.turns]:
+        with open(os.path.join(args.corpus, clip["file"]), "rb") as f:
+            audio_bytes = f.read()
+        turn_start = time.perf_counter()
+        transcript = transcriber(decode_audio(audio_bytes, format=clip["format"]))
+        decode_latencies.append(time.perf_counter() - turn_start)
+        at.chat_input[0].set_value(transcript).run()
+        turn_latencies.append(time.perf_counter() - turn_start)
+    result = summarize(turn_latencies, time.perf_counter() - start)
+    result["decode_asr"] = summarize(decode_latencies, sum(decode_latencies))
+    return result
+
+
+SCENARIOS = {"llm": scenario_llm, "text": scenario_text, "audio": scenario_audio}
+
+
+def load_manifest(corpus, utterances=100):
+    manifest_path = os.path.join(corpus, "manifest.json")
+    if not os.path.exists(manifest_path):
+        build_corpus(corpus, clips=20, utterances=utterances)
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def configure_app(mock, args):
+    # Read by app.py on every script run inside AppTest: LLM -> mock server, ASR -> corpus stub.
+    os.environ.update({
+        "GROQ_API_URL": mock.url,
+        "FOODIE_LLM_MIN_INTERVAL": "0",
+        "FOODIE_LLM_DEADLINE": str(args.deadline),
+        "FOODIE_ASR_BACKEND": f"stub:{os.path.join(args.corpus, 'manifest.json')}",
+        "FOODIE_ORDER_LOG": os.path.join(args.corpus, "bench_orders.db"),
+    })
+
+
+def new_app_test(app_test_class=None):
+    if app_test_class is None:
+        from streamlit.testing.v1 import AppTest as app_test_class
+
+    at = app_test_class(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.secrets["GROQ_API_KEY"] = "bench-key"
+    at.run()
+    return at
+
+
+def tally(values):
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+# --- Baseline Comparison ---
+def compare(results, baseline, tolerance):
+    regressions = []
+    for scenario, metrics in results.items():
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = baseline.get(scenario, {}).get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                regressions.append(f"{scenario}.{metric}: {old} -> {new} ({change:+.0%})")
+            print(f"  {scenario}.{metric:<18} {old:>10} -> {new:>10}  {change:+.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite for Agentic Foodie")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS) + ["all"], default="all")
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--deadline", type=float, default=8.0)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Mock LLM mean latency")
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of mock LLM requests answered with 429")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--save-baseline", help="Store the results as the new baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    manifest = load_manifest(args.corpus, utterances=max(100, args.turns))
+
+    mock = MockGroqServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_limit_rate=args.rate_limit_rate,
+                          labels=manifest["utterances"] + manifest["clips"]).start()
+    configure_app(mock, args)
+
+    results = {}
+    try:
+        for name in (sorted(SCENARIOS) if args.scenario == "all" else [args.scenario]):
+            print(f"running {name} ...")
+            results[name] = SCENARIOS[name](mock, manifest, args)
+    finally:
+        mock.stop()
+    results["_meta"] = {"mock": dict(mock.stats), "args": {k: v for k, v in vars(args).items() if k not in ("output", "save_baseline", "compare")}}
+
+    print(json.dumps(results, indent=2))
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"comparison against {args.compare} (tolerance {args.tolerance:.0%}):")
+        regressions = compare({k: v for k, v in results.items() if not k.startswith("_")}, baseline, args.tolerance)
+        if regressions:
+            print("REGRESSIONS:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+
+from PIL import Image
+
+from theme import GOOGLE_FONTS_IMPORT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(ROOT, "assets")
+STATIC_DIR = os.path.join(ROOT, "static")
+# Streamlit serves ./static at app/static when server.enableStaticServing is on (.streamlit/config.toml).
+STATIC_URL = "app/static"
+
+# Source image -> responsive widths to emit (never upscaled past the original).
+IMAGES = {
+    "cover": ("cover.png", [640, 1024, 1536]),
+    "app_screenshot": ("appImage.jpg", [640, 1280]),
+}
+# Ordered best-first: <picture> offers them in this order, and the last one is the <img> fallback.
+# Only extensions in Streamlit's SAFE_APP_STATIC_FILE_EXTENSIONS get their image type; anything else
+# (.avif included) is sent as text/plain with nosniff, which the browser then can't decode.
+FORMATS = {"webp": {"quality": 75, "method": 6}, "jpeg": {"quality": 80, "optimize": True, "progressive": True}}
+FONT_WEIGHTS = {"regular": 400, "semibold": 600, "bold": 700, "extrabold": 800}
+
+
+def fingerprint(data):
+    return hashlib.blake2b(data, digest_size=5).hexdigest()
+
+
+def write_asset(name, ext, data):
+    # cover-1024.3fa9c01b2e.webp; the ?v= query makes Streamlit's Tornado handler send a 10-year max-age.
+    digest = fingerprint(data)
+    file_name = f"{name}.{digest}.{ext}"
+    with open(os.path.join(STATIC_DIR, file_name), "wb") as f:
+        f.write(data)
+    return {"file": file_name, "url": f"{STATIC_URL}/{file_name}?v={digest}", "bytes": len(data)}
+
+
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+# --- Build Stages ---
+def build_images():
+    images = {}
+    for name, (source, widths) in IMAGES.items():
+        with Image.open(os.path.join(ROOT, source)) as original:
+            original = original.convert("RGB")
+            entry = {"source": source, "source_bytes": os.path.getsize(os.path.join(ROOT, source)), "width": original.width, "height": original.height, "formats": {}}
+            for width in sorted({min(width, original.width) for width in widths}):
+                resized = original if width == original.width else original.resize((width, round(original.height * width / original.width)), Image.LANCZOS)
+                for image_format, options in FORMATS.items():
+                    buffer = io.BytesIO()
+                    resized.save(buffer, format=image_format.upper(), **options)
+                    variant = write_asset(f"{name}-{width}", image_format, buffer.getvalue())
+                    entry["formats"].setdefault(image_format, []).append(dict(variant, width=width))
+        images[name] = entry
+    return images
+
+
+def build_fonts(fonts_dir):
+    # Self-hosted WOFF2 files named <Family>-<weight>.woff2 (e.g. Inter-semibold.woff2, Pacifico-regular.woff2).
+    fonts = []
+    for path in sorted(glob.glob(os.path.join(fonts_dir, "*.woff2"))):
+        family, _, weight = os.path.basename(path)[:-len(".woff2")].partition("-")
+        with open(path, "rb") as f:
+            variant = write_asset(os.path.basename(path)[:-len(".woff2")], "woff2", f.read())
+        fonts.append(dict(variant, family=family, weight=FONT_WEIGHTS.get(weight.lower(), 400)))
+    return fonts
+
+
+def build_css(fonts):
+    with open(os.path.join(ASSETS_DIR, "app.css"), encoding="utf-8") as f:
+        css = f.read()
+    if fonts:
+        font_faces = "".join(f"@font-face{{font-family:'{font['family']}';font-weight:{font['weight']};font-display:swap;src:url('{font['url']}') format('woff2')}}" for font in fonts)
+    else:
+        # No self-hosted fonts were provided: fall back to the Google Fonts stylesheet.
+        font_faces = GOOGLE_FONTS_IMPORT
+    return write_asset("app", "css", (font_faces + minify_css(css)).encode("utf-8"))
+
+
+def build(fonts_dir):
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    # Files only: static/thumbs/ is the runtime thumbnail cache (images.py).
+    previous = {name for name in os.listdir(STATIC_DIR) if os.path.isfile(os.path.join(STATIC_DIR, name))}
+    fonts = build_fonts(fonts_dir)
+    manifest = {"css": build_css(fonts), "fonts": fonts, "images": build_images()}
+    with open(os.path.join(STATIC_DIR, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    # Drop outputs of earlier builds that the new manifest no longer references.
+    current = {manifest["css"]["file"], "manifest.json"} | {font["file"] for font in fonts} | {
+        variant["file"] for image in manifest["images"].values() for variants in image["formats"].values() for variant in variants
+    }
+    for stale in previous - current:
+        os.remove(os.path.join(STATIC_DIR, stale))
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build fingerprinted static assets (CSS, fonts, responsive images) into ./static")
+    parser.add_argument("--fonts", default=os.path.join(ASSETS_DIR, "fonts"), help="Directory of self-hosted .woff2 fonts")
+    args = parser.parse_args()
+    manifest = build(args.fonts)
+    print(f"css: {manifest['css']['file']} ({manifest['css']['bytes']} bytes), fonts: {len(manifest['fonts'])}")
+    for name, image in manifest["images"].items():
+        variants = ", ".join(f"{v['width']}w {fmt} {v['bytes'] // 1024} KB" for fmt, vs in image["formats"].items() for v in vs)
+        print(f"{name}: {image['source']} {image['source_bytes'] // 1024} KB -> {variants}")
@@ -0,0 +1,230 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+
+from llm_client import LLMUnavailable, TurnCancelled
+from speech import audio_fingerprint
+
+# Applied to everything written to a cassette: customer text, transcripts, model replies, errors.
+# Placeholders never match a pattern again, so redacting twice gives the same text (and request key).
+REDACTIONS = [
+    (re.compile(r"\b(?:gsk|sk|lk)_[A-Za-z0-9]{16,}\b"), "[api-key]"),
+    (re.compile(r"Bearer\s+[^\s\"']+"), "Bearer [api-key]"),
+    (re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"), "[email]"),
+    (re.compile(r"\b(?:\d[ -]?){12,18}\d\b"), "[card]"),
+    (re.compile(r"(?<![\w.])(?:\+?\d{1,3}[ .-]?)?(?:\(\d{3}\)|\d{3})[ .-]?\d{3}[ .-]?\d{4}\b"), "[phone]"),
+]
+RECORDED_HEADERS = ("x-ratelimit-remaining-requests",)
+
+
+def redact(text):
+    for pattern, placeholder in REDACTIONS:
+        text = pattern.sub(placeholder, text)
+    return text
+
+
+def request_key(payload):
+    # Identifies an LLM request by its redacted content, not by the model tier it was sent to.
+    request = {key: value for key, value in payload.items() if key != "model"}
+    request["messages"] = [{"role": message["role"], "content": redact(str(message["content"]))} for message in payload.get("messages", [])]
+    return hashlib.blake2b(json.dumps(request, sort_keys=True).encode("utf-8"), digest_size=12).hexdigest()
+
+
+# --- Cassette Files ---
+# Gzipped JSON lines, one per recorded call or customer input. Only request keys are stored, not
+# the prompts, which keeps cassettes compact. The file is flushed after every entry, so a
+# recording cut short by a crash is readable up to its last entry.
+class Cassette:
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.replaying = entries is not None
+        self.entries = entries or []
+        self.started = time.monotonic()
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def record(cls, directory):
+        os.makedirs(directory, exist_ok=True)
+        return cls(os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl.gz"))
+
+    @classmethod
+    def load(cls, path):
+        entries = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    entries.append(json.loads(line))
+            except (EOFError, ValueError):
+                pass  # recording still open or cut short: keep what was flushed
+        return cls(path, entries)
+
+    def append(self, entry):
+        entry = dict(entry, t=round(time.monotonic() - self.started, 3))
+        with self._lock:
+            if self._file is None:
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            self.entries.append(entry)
+
+    def record_input(self, session_id, source, text):
+        # A customer turn ("text" or "voice"), so the session can be replayed turn by turn.
+        if not self.replaying:
+            self.append({"kind": "input", "session": session_id, "source": source, "text": redact(text)})
+
+    def sessions(self):
+        # session id -> its customer inputs, in order
+        inputs = {}
+        for entry in self.entries:
+            if entry["kind"] == "input":
+                inputs.setdefault(entry["session"], []).append(entry["text"])
+        return inputs
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def open_cassette(spec):
+    # spec: "record:<directory>" or "replay:<cassette file>"
+    mode, _, path = spec.partition(":")
+    if mode == "record":
+        return Cassette.record(path)
+    if mode == "replay":
+        return Cassette.load(path)
+    raise ValueError(f"Unknown cassette mode: {spec}")
+
+
+# --- Recording ---
+class RecordingLLMClient:
+    # Wraps LLMClient/LocalLLMClient; everything except complete() passes through.
+    def __init__(self, client, cassette):
+        self.client = client
+        self.cassette = cassette
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def complete(self, payload, deadline, models=None, cancel=None, session_id=None):
+        entry = {"kind": "llm", "session": session_id, "key": request_key(payload)}
+        started = time.monotonic()
+        try:
+            reply = self.client.complete(payload, deadline, models=models, cancel=cancel, session_id=session_id)
+        except LLMUnavailable as e:
+            self.cassette.append(dict(entry, elapsed=round(time.monotonic() - started, 4), error=redact(str(e))))
+            raise
+        except TurnCancelled:
+            self.cassette.append(dict(entry, elapsed=round(time.monotonic() - started, 4), cancelled=True))
+            raise
+        self.cassette.append(dict(entry, elapsed=round(time.monotonic() - started, 4), reply={
+            "content": redact(reply["content"]),
+            "model": reply["model"],
+            "hedged": reply["hedged"],
+            "latency": round(reply["latency"], 4),
+            "headers": {name: reply["headers"][name] for name in RECORDED_HEADERS if name in reply["headers"]},
+        }))
+        return reply
+
+
+class RecordingTranscriber:
+    def __init__(self, transcriber, cassette):
+        self.transcriber = transcriber
+        self.cassette = cassette
+
+    def __call__(self, audio_data):
+        import speech_recognition as sr
+
+        entry = {"kind": "asr", "fingerprint": audio_fingerprint(audio_data)}
+        started = time.monotonic()
+        try:
+            text = self.transcriber(audio_data)
+        except sr.UnknownValueError:
+            self.cassette.append(dict(entry, elapsed=round(time.monotonic() - started, 4), text=None))
+            raise
+        self.cassette.append(dict(entry, elapsed=round(time.monotonic() - started, 4), text=redact(text)))
+        return text
+
+
+# --- Replay ---
+# speed "recorded" waits as long as the original call took (bounded by the turn deadline, and
+# interrupted by cancel like a real request); "instant" returns at once, leaving only our own code
+# on the clock.
+class ReplayLLMClient:
+    def __init__(self, cassette, speed="instant"):
+        self.speed = speed
+        self.by_key = {}
+        self.by_session = {}
+        self._used = set()
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "replayed": 0, "unmatched": 0, "cancelled": 0}
+        for i, entry in enumerate(cassette.entries):
+            if entry["kind"] == "llm" and not entry.get("cancelled"):
+                self.by_key.setdefault(entry["key"], deque()).append(i)
+                self.by_session.setdefault(entry["session"], deque()).append(i)
+        self.entries = cassette.entries
+
+    def complete(self, payload, deadline, models=None, cancel=None, session_id=None):
+        self._count("requests")
+        entry = self._take(request_key(payload), session_id)
+        if entry is None:
+            self._count("unmatched")
+            raise LLMUnavailable("no recorded response for this request")
+        if self.speed == "recorded":
+            wait_seconds = min(entry["elapsed"], max(0.0, deadline - time.monotonic()))
+            if cancel is not None and cancel.wait(wait_seconds):
+                self._count("cancelled")
+                raise TurnCancelled()
+            if cancel is None:
+                time.sleep(wait_seconds)
+            if wait_seconds < entry["elapsed"]:
+                raise LLMUnavailable("deadline exceeded")
+        if "error" in entry:
+            raise LLMUnavailable(entry["error"])
+        self._count("replayed")
+        return dict(entry["reply"])
+
+    def warm(self, system_prompt=None, connections=None):
+        return []
+
+    def _take(self, key, session_id):
+        # The recorded call with the same request; failing that (the prompt changed since the
+        # recording), the session's next unused call, so a session still replays in order.
+        with self._lock:
+            for queue in (self.by_key.get(key), self.by_session.get(session_id)):
+                while queue and queue[0] in self._used and len(queue) > 1:
+                    queue.popleft()
+                if queue:
+                    index = queue.popleft() if len(queue) > 1 else queue[0]
+                    self._used.add(index)
+                    return self.entries[index]
+        return None
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+class ReplayTranscriber:
+    def __init__(self, cassette, speed="instant"):
+        self.speed = speed
+        self.transcripts = {entry["fingerprint"]: entry for entry in cassette.entries if entry["kind"] == "asr"}
+
+    def __call__(self, audio_data):
+        import speech_recognition as sr
+
+        entry = self.transcripts.get(audio_fingerprint(audio_data))
+        if entry is None:
+            raise sr.RequestError("no recorded transcript for this audio")
+        if self.speed == "recorded":
+            time.sleep(entry["elapsed"])
+        if entry["text"] is None:
+            raise sr.UnknownValueError()
+        return entry["text"]
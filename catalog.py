@@ -0,0 +1,137 @@
+import json
+
+# --- Menu Data ---
+menu = {
+    "burgers": [
+        {"id": "beef_burger", "name": "Classic Cheeseburger", "price": 12.99, "description": "Juicy beef patty with melted cheese, lettuce, tomato, and our special sauce", "upsell": ["coke", "fries_upgrade"], "dietary": []},
+        {"id": "bbq_bacon_burger", "name": "BBQ Bacon Burger", "price": 14.99, "description": "Beef patty with crispy bacon, BBQ sauce, onion rings, and cheddar", "upsell": ["lemonade"], "dietary": []},
+    ],
+    "pizza": [
+        {"id": "margherita_pizza", "name": "Margherita Pizza", "price": 16.99, "description": "Fresh mozzarella, basil, and tomato sauce on crispy thin crust", "dietary": ["vegetarian"]},
+        {"id": "pepperoni_pizza", "name": "Pepperoni Pizza", "price": 17.99, "description": "Classic pepperoni with rich tomato sauce and mozzarella", "dietary": []},
+    ],
+    "appetizers": [
+        {"id": "golden_fries", "name": "Golden Fries", "price": 4.00, "description": "Crispy golden french fries.", "dietary": ["vegetarian", "vegan"]},
+        {"id": "chicken_wings", "name": "Spicy Chicken Wings", "price": 8.50, "description": "Crispy chicken wings tossed in spicy buffalo sauce.", "dietary": ["spicy"]},
+    ],
+    "salads": [
+        {"id": "garden_salad", "name": "Garden Salad", "price": 5.50, "description": "Mixed greens, cherry tomatoes, cucumber, and vinaigrette.", "dietary": ["vegetarian", "vegan"]},
+    ],
+    "drinks": [
+        {"id": "coke", "name": "Coca-Cola", "price": 2.50, "description": "Ice-cold classic Coke.", "dietary": ["vegetarian", "vegan"]},
+        {"id": "lemonade", "name": "Fresh Lemonade", "price": 3.00, "description": "Freshly squeezed lemonade with a hint of mint.", "dietary": ["vegetarian", "vegan"]},
+    ],
+    "desserts": [
+        {"id": "chocolate_brownie", "name": "Chocolate Brownie", "price": 4.50, "description": "Warm fudgy brownie with a scoop of vanilla ice cream.", "dietary": ["vegetarian"]},
+    ]
+}
+
+# Promotion slots may name a category, a group of categories or a single item id
+category_groups = {"main_courses": ["burgers", "pizza"]}
+
+promotions = [
+    {"id": "combo_deal", "name": "Combo Deal", "description": "Get $5 off when you add any drink and a dessert to your main course! 🎉", "items": ["main_courses", "drinks", "desserts"], "discount": 5.00}
+]
+
+
+# --- Immutable Catalogs ---
+# One process serves many locations. The base catalog above is frozen on import and shared by all
+# of them. A location's catalog is built from a small overlay (prices, unavailable items,
+# promotions): items and categories it doesn't change are the base objects themselves, so memory
+# grows with the overlays, not with the number of locations. Freezing makes an accidental in-place
+# edit (which would leak into every location) fail loudly.
+DEFAULT_LOCATION = "default"
+
+
+class FrozenDict(dict):
+    # A dict (JSON-serializable, dict(...)/{**...} copyable) that refuses in-place changes.
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("catalog data is read-only; build a location overlay instead")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle rebuild through the constructor, not item by item
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class Catalog:
+    # One location's read-only view of the menu, shared by all of its sessions.
+    def __init__(self, location, name, menu, promotions, category_groups):
+        self.location = location
+        self.name = name
+        self.menu = menu
+        self.promotions = promotions
+        self.category_groups = category_groups
+        self.flat_menu = FrozenDict((item["id"], item) for items in menu.values() for item in items)
+
+
+def build_catalog(location=DEFAULT_LOCATION, overlay=None, base=None):
+    # overlay: {"name", "prices": {item_id: price}, "unavailable": [item_id], "promotions": [promotion]
+    # (added, or replacing the base promotion with the same id), "remove_promotions": [promotion id]}
+    base = base or BASE_CATALOG
+    overlay = overlay or {}
+    prices = overlay.get("prices", {})
+    unavailable = set(overlay.get("unavailable", ()))
+    unknown = (set(prices) | unavailable) - set(base.flat_menu)
+    if unknown:
+        raise ValueError(f"Location {location!r} overlays unknown menu items: {sorted(unknown)}")
+    if not prices and not unavailable:
+        location_menu = base.menu
+    else:
+        categories = {}
+        for category, items in base.menu.items():
+            if not any(item["id"] in prices or item["id"] in unavailable for item in items):
+                categories[category] = items
+                continue
+            items = tuple(FrozenDict(item, price=prices[item["id"]]) if item["id"] in prices else item for item in items if item["id"] not in unavailable)
+            if items:
+                categories[category] = items
+        location_menu = FrozenDict(categories)
+    location_promotions = base.promotions
+    replaced = {promotion["id"] for promotion in overlay.get("promotions", ())} | set(overlay.get("remove_promotions", ()))
+    if replaced:
+        location_promotions = tuple(promotion for promotion in base.promotions if promotion["id"] not in replaced) + freeze(overlay.get("promotions", []))
+    if unavailable:
+        # A promotion needing something the location doesn't sell is neither offered nor applied there
+        location_promotions = tuple(promotion for promotion in location_promotions if _can_fill(promotion, location_menu, base.category_groups))
+    return Catalog(location, overlay.get("name", location), location_menu, location_promotions, base.category_groups)
+
+
+def _can_fill(promotion, menu, category_groups):
+    # Every slot (a category, a group of categories or an item id) has something on this menu
+    item_ids = {item["id"] for items in menu.values() for item in items}
+    return all(any(menu.get(category) for category in category_groups.get(slot, (slot,))) or slot in item_ids for slot in promotion["items"])
+
+
+def load_locations(path):
+    # {location id: overlay} from a JSON file; no file means a single location serving the base catalog.
+    try:
+        with open(path, encoding="utf-8") as f:
+            locations = json.load(f)
+    except FileNotFoundError:
+        return {}
+    for location, overlay in locations.items():
+        build_catalog(location, overlay)  # fail at startup, not on a customer's first turn
+    return locations
+
+
+def resolve_location(locations, location=None, kiosk=None):
+    # ?location=<id> or ?kiosk=<kiosk id> -> location id; None when the value names no location.
+    if location:
+        return location if location == DEFAULT_LOCATION or location in locations else None
+    if kiosk:
+        return next((location_id for location_id, overlay in locations.items() if kiosk in overlay.get("kiosks", ())), None)
+    return DEFAULT_LOCATION
+
+
+BASE_CATALOG = Catalog(DEFAULT_LOCATION, "Agentic Foodie", freeze(menu), freeze(promotions), freeze(category_groups))
+menu, promotions, category_groups, flat_menu = BASE_CATALOG.menu, BASE_CATALOG.promotions, BASE_CATALOG.category_groups, BASE_CATALOG.flat_menu
@@ -0,0 +1,64 @@
+import os
+
+import streamlit as st
+
+
+def get_secret(name, default=""):
+    # Environment first (.env when launched through run-local.py), then Streamlit secrets (Streamlit Cloud dashboard)
+    value = os.getenv(name)
+    if value:
+        return value
+    try:
+        return st.secrets.get(name, default)
+    except FileNotFoundError:
+        return default
+
+
+# --- Configuration ---
+GROQ_API_KEY = get_secret("GROQ_API_KEY")
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+LLAMA_MODEL = "llama3-8b-8192"
+# "groq", or "local": a llama.cpp server on this machine (llama-server --parallel FOODIE_LOCAL_LLM_SLOTS)
+LLM_BACKEND = os.getenv("FOODIE_LLM_BACKEND", "groq")
+LOCAL_LLM_URL = os.getenv("FOODIE_LOCAL_LLM_URL", "http://127.0.0.1:8080/v1/chat/completions")
+LOCAL_LLM_MODEL = os.getenv("FOODIE_LOCAL_LLM_MODEL", "qwen2.5-1.5b-instruct-q4_k_m")
+LOCAL_LLM_SLOTS = int(os.getenv("FOODIE_LOCAL_LLM_SLOTS", "4"))  # Sessions whose KV cache is kept; must match --parallel
+# Models tried in order within one per-turn deadline; the local parser answers if all of them fail
+LLM_FALLBACK_MODELS = [model for model in os.getenv("FOODIE_LLM_FALLBACK_MODELS", "llama-3.1-8b-instant").split(",") if model]
+LLM_TURN_DEADLINE = float(os.getenv("FOODIE_LLM_DEADLINE", "8"))
+LLM_MIN_INTERVAL = float(os.getenv("FOODIE_LLM_MIN_INTERVAL", "2"))  # Minimum seconds between a session's LLM requests
+MENU_TOP_K = int(os.getenv("FOODIE_MENU_TOP_K", "6"))  # Menu items retrieved into each LLM prompt; 0 sends the whole menu
+ASR_BACKEND = os.getenv("FOODIE_ASR_BACKEND", "google")  # "google" or "stub:<corpus manifest.json>"
+# Clips longer than LONG_AUDIO_SECONDS are split at pauses into parts of at most ASR_CHUNK_SECONDS,
+# which are transcribed concurrently on ASR_WORKERS threads shared by all sessions
+LONG_AUDIO_SECONDS = float(os.getenv("FOODIE_LONG_AUDIO_SECONDS", "20"))
+ASR_CHUNK_SECONDS = float(os.getenv("FOODIE_ASR_CHUNK_SECONDS", "15"))
+ASR_WORKERS = int(os.getenv("FOODIE_ASR_WORKERS", str(min(16, (os.cpu_count() or 1) * 2))))
+# "record:<directory>" writes every session's LLM and ASR calls to a new cassette file there;
+# "replay:<cassette file>" answers them from the recording ("instant" or at "recorded" speed)
+CASSETTE = os.getenv("FOODIE_CASSETTE", "")
+REPLAY_SPEED = os.getenv("FOODIE_REPLAY_SPEED", "instant")
+# Longest voice-room utterance; sizes each voice session's fixed audio buffer (64 KB per second, plus 140 KB)
+VOICE_MAX_UTTERANCE_SECONDS = float(os.getenv("FOODIE_VOICE_MAX_UTTERANCE_SECONDS", "30"))
+# Per-location overlays on the base catalog (prices, unavailable items, promotions, kiosk ids); see README
+LOCATIONS_PATH = os.getenv("FOODIE_LOCATIONS", "locations.json")
+ORDER_LOG_PATH = os.getenv("FOODIE_ORDER_LOG", "orders.db")
+METRICS_PORT = int(os.getenv("FOODIE_METRICS_PORT", "0"))  # 0 disables the /metrics and /traces endpoint
+ADMIN_TOKEN = get_secret("FOODIE_ADMIN_TOKEN")  # Unlocks the pages/ admin views; unset disables them
+# Sampling profiler started from the admin Profiler page: sample interval and the longest window allowed
+PROFILER_INTERVAL_MS = float(os.getenv("FOODIE_PROFILER_INTERVAL_MS", "10"))
+PROFILER_MAX_SECONDS = float(os.getenv("FOODIE_PROFILER_MAX_SECONDS", "300"))
+DEBUG_PANEL_TURNS = 5  # Turns shown in the ?debug=1 latency panel
+HEARD_CLIPS_LIMIT = 50  # Audio clip hashes remembered per session so recorder/uploader values aren't reprocessed on rerun
+
+# --- Feature Toggles ---
+# "off": text only, no audio stack at all; "recorder": in-browser recording and audio upload;
+# "livekit": recorder plus a LiveKit voice room. pydub, speech_recognition and LiveKit are only
+# imported on first use, so a text-only or recorder deployment never pays for the LiveKit import.
+VOICE_MODE = os.getenv("FOODIE_VOICE", "recorder")
+SPOKEN_REPLIES = os.getenv("FOODIE_SPOKEN_REPLIES", "0") == "1"
+TTS_BACKEND = os.getenv("FOODIE_TTS", "auto")  # "auto", "espeak[:<voice>]", "piper:<model.onnx>" or "off"
+
+LIVEKIT_API_KEY = get_secret("LIVEKIT_API_KEY")
+LIVEKIT_API_SECRET = get_secret("LIVEKIT_API_SECRET")
+LIVEKIT_WS_URL = get_secret("LIVEKIT_WS_URL")  # e.g., wss://your-project.livekit.cloud
@@ -0,0 +1,143 @@
+import glob
+import hashlib
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageDraw, ImageOps
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(ROOT, "assets", "menu")
+CACHE_DIR = os.path.join(ROOT, "static", "thumbs")
+STATIC_URL = "app/static/thumbs"
+SOURCE_EXTENSIONS = (".webp", ".jpg", ".jpeg", ".png")
+# Pixel sizes per card image: 1x and 2x for high-density screens (.menu-item-image is 80px).
+THUMBNAIL_SIZES = (80, 160)
+THUMBNAIL_QUALITY = 80
+
+logger = logging.getLogger(__name__)
+
+
+# --- Menu Item Thumbnails ---
+# Each source image is read and hashed once per process; thumbnails are written to a
+# content-addressed cache (<hash of source + size>.webp), so an unchanged image is never
+# resized again and its URL never changes, which lets browsers cache it for good. Missing
+# thumbnails are generated on a background thread; until then the card shows the placeholder,
+# so a cold cache never delays the first paint.
+class ImageService:
+    def __init__(self, source_dir=SOURCE_DIR, cache_dir=CACHE_DIR, url_prefix=STATIC_URL, sizes=THUMBNAIL_SIZES, workers=2):
+        self.source_dir = source_dir
+        self.cache_dir = cache_dir
+        self.url_prefix = url_prefix
+        self.sizes = sizes
+        self.workers = workers
+        self.thumbnails = {}
+        self.version = 0  # bumped whenever a thumbnail is published
+        self.stats = {"ingested": 0, "generated": 0, "cache_hits": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+        os.makedirs(cache_dir, exist_ok=True)
+        placeholder = placeholder_image(max(sizes))
+        self.placeholder = self._urls(hashlib.blake2b(placeholder.tobytes(), digest_size=10).hexdigest())
+        self._generate(placeholder, self.placeholder)
+
+    def find_source(self, item):
+        # An explicit "image" path (relative to assets/menu) or assets/menu/<item id>.<ext>
+        if item.get("image"):
+            path = os.path.join(self.source_dir, item["image"])
+            return path if os.path.exists(path) else None
+        matches = [path for path in glob.glob(os.path.join(self.source_dir, f"{item['id']}.*")) if path.lower().endswith(SOURCE_EXTENSIONS)]
+        return matches[0] if matches else None
+
+    def ingest(self, items):
+        for item in items:
+            source = self.find_source(item)
+            if source is None:
+                continue
+            with open(source, "rb") as f:
+                data = f.read()
+            urls = self._urls(hashlib.blake2b(data, digest_size=10).hexdigest())
+            self._count("ingested")
+            if all(os.path.exists(path) for path, _ in urls.values()):
+                self._count("cache_hits")
+                self._publish(item["id"], urls)
+            else:
+                future = self._executor.submit(self._generate_and_publish, item["id"], data, urls)
+                future.add_done_callback(lambda future, item_id=item["id"]: self._check(item_id, future))
+        return self
+
+    def wait(self):
+        # Blocks until every queued thumbnail is written (build scripts, benchmarks).
+        self._executor.shutdown(wait=True)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnails")
+        return self
+
+    def thumbnail(self, item):
+        # {size: url} for the item; the placeholder while it has no image or it is still being generated.
+        with self._lock:
+            urls = self.thumbnails.get(item["id"], self.placeholder)
+        return {size: url for size, (_, url) in urls.items()}
+
+    def img_html(self, item, css_class="menu-item-image"):
+        urls = self.thumbnail(item)
+        small, large = urls[self.sizes[0]], urls[self.sizes[-1]]
+        return f'<img src="{small}" srcset="{small} 1x, {large} 2x" width="{self.sizes[0]}" height="{self.sizes[0]}" class="{css_class}" alt="{item["name"]}" loading="lazy" decoding="async">'
+
+    def _urls(self, source_hash):
+        urls = {}
+        for size in self.sizes:
+            key = hashlib.blake2b(f"{source_hash}:{size}:{THUMBNAIL_QUALITY}".encode(), digest_size=10).hexdigest()
+            urls[size] = (os.path.join(self.cache_dir, f"{key}.webp"), f"{self.url_prefix}/{key}.webp?v={key}")
+        return urls
+
+    def _generate(self, image, urls):
+        for size, (path, _) in urls.items():
+            if not os.path.exists(path):
+                write_atomic(path, encode_thumbnail(image, size))
+                self._count("generated")
+
+    def _generate_and_publish(self, item_id, data, urls):
+        self._generate(Image.open(io.BytesIO(data)).convert("RGB"), urls)
+        self._publish(item_id, urls)
+
+    def _check(self, item_id, future):
+        # A failed thumbnail leaves the card on the placeholder; make that visible rather than silent.
+        error = future.exception()
+        if error is not None:
+            self._count("failed")
+            logger.error("Thumbnail generation failed for %s", item_id, exc_info=error)
+
+    def _publish(self, item_id, urls):
+        with self._lock:
+            self.thumbnails[item_id] = urls
+            self.version += 1
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+def encode_thumbnail(image, size):
+    # Square center crop, like the circular card frame shows it.
+    buffer = io.BytesIO()
+    ImageOps.fit(image, (size, size), Image.LANCZOS).save(buffer, format="WEBP", quality=THUMBNAIL_QUALITY, method=6)
+    return buffer.getvalue()
+
+
+def write_atomic(path, data):
+    # Concurrent sessions may generate the same thumbnail; the rename makes the last writer win cleanly.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def placeholder_image(size):
+    # Neutral plate drawn locally, replacing the hot-linked placehold.co image.
+    image = Image.new("RGB", (size, size), (236, 230, 224))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((size * 0.18, size * 0.18, size * 0.82, size * 0.82), fill=(250, 247, 244), outline=(214, 204, 194), width=max(1, size // 40))
+    draw.ellipse((size * 0.32, size * 0.32, size * 0.68, size * 0.68), outline=(226, 218, 210), width=max(1, size // 60))
+    return image
@@ -0,0 +1,273 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class LLMUnavailable(Exception):
+    pass
+
+
+class TurnCancelled(Exception):
+    # The customer started a new utterance (barge-in) while this turn's request was in flight.
+    pass
+
+
+CANCEL_POLL_SECONDS = 0.05
+
+
+# --- Latency Tracking ---
+class LatencyTracker:
+    def __init__(self, window=200, min_samples=20, default=1.5):
+        self.window = window
+        self.min_samples = min_samples
+        self.default = default
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, seconds):
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key, q):
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return self.default
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+# --- Hedged, Deadline-bounded Client ---
+class LLMClient:
+    # Tries each model tier in order within one per-turn deadline. Inside a tier, a hedged
+    # duplicate request goes out once the first has been outstanding longer than that
+    # model's observed p95; whichever answers first wins. A 429 puts the model on cooldown
+    # so the following turns go straight to the next tier instead of sleeping.
+    def __init__(self, api_url, api_key, models, tier_budget_share=0.6, min_hedge_delay=0.3, max_cooldown=30.0, max_workers=16):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.models = list(models)
+        self.tier_budget_share = tier_budget_share
+        self.min_hedge_delay = min_hedge_delay
+        self.max_cooldown = max_cooldown
+        self.session = requests.Session()
+        # One pooled keep-alive connection per worker, so concurrent turns never wait for a TLS handshake
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=max_workers))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=max_workers))
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self.latency = LatencyTracker()
+        self._cooldown_until = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "rate_limited": 0, "deadline_misses": 0, "cancelled": 0}
+
+    def complete(self, payload, deadline, models=None, cancel=None, session_id=None):
+        # Returns {"content", "model", "headers", "hedged", "latency"}; raises LLMUnavailable
+        # once every tier has failed or the deadline (a time.monotonic() value) has passed, and
+        # TurnCancelled as soon as `cancel` (a threading.Event) is set: the outstanding request is
+        # abandoned and no hedge, fallback tier or re-ask is sent for the stale turn.
+        # session_id is only used by LocalLLMClient.
+        models = models or self.models
+        errors = []
+        for i, model in enumerate(models):
+            self._check_cancel(cancel)
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0:
+                errors.append("deadline reached")
+                break
+            if self._cooldown_until.get(model, 0) > now:
+                errors.append(f"{model}: cooling down after rate limit")
+                continue
+            budget = remaining if i == len(models) - 1 else remaining * self.tier_budget_share
+            reply, error = self._try_model(model, payload, budget, cancel)
+            if reply:
+                return reply
+            errors.append(f"{model}: {error}")
+        raise LLMUnavailable("; ".join(errors) or "no model tiers configured")
+
+    def warm(self, system_prompt=None, connections=4):
+        # Opens `connections` pooled connections (DNS, TCP and TLS) with concurrent GETs of the model list,
+        # before the first customer needs them. The status doesn't matter, only the open connection.
+        models_url = self.api_url.rsplit("/chat/completions", 1)[0] + "/models"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        futures = [self.executor.submit(self.session.get, models_url, headers=headers, timeout=10) for _ in range(connections)]
+        return [future.result().status_code for future in futures]
+
+    def _try_model(self, model, payload, budget, cancel=None):
+        model_payload = dict(payload, model=model)
+        start = time.monotonic()
+        end = start + budget
+        hedge_at = start + max(self.min_hedge_delay, self.latency.percentile(model, 0.95))
+        futures = {self.executor.submit(self._post, model_payload, budget): False}
+        error = "no response"
+        while futures:
+            now = time.monotonic()
+            hedged = len(futures) > 1 or any(futures.values())
+            wait_until = end if hedged else min(end, hedge_at)
+            if cancel is not None:
+                wait_until = min(wait_until, now + CANCEL_POLL_SECONDS)
+            done, _ = wait(list(futures), timeout=max(0.0, wait_until - now), return_when=FIRST_COMPLETED)
+            if not done:
+                self._check_cancel(cancel)
+            for future in done:
+                is_hedge = futures.pop(future)
+                try:
+                    response, elapsed = future.result()
+                    if response.status_code == 429:
+                        self._start_cooldown(model, response)
+                        return None, "rate limited"
+                    response.raise_for_status()
+                    content = response.json()["choices"][0]["message"]["content"]
+                except (requests.exceptions.RequestException, KeyError, IndexError, ValueError) as e:
+                    error = str(e)
+                    continue
+                self.latency.record(model, elapsed)
+                if is_hedge:
+                    self._count("hedge_wins")
+                return {
+                    "content": content,
+                    "model": model,
+                    "headers": response.headers,
+                    "hedged": hedged,
+                    "latency": elapsed,
+                }, None
+            now = time.monotonic()
+            if now >= end:
+                self._count("deadline_misses")
+                return None, "deadline exceeded"
+            if not done and not hedged and now >= hedge_at:
+                self._count("hedges")
+                futures[self.executor.submit(self._post, model_payload, end - now)] = True
+        return None, error
+
+    def _check_cancel(self, cancel):
+        if cancel is not None and cancel.is_set():
+            self._count("cancelled")
+            raise TurnCancelled()
+
+    def _post(self, payload, timeout):
+        self._count("requests")
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        start = time.monotonic()
+        response = self.session.post(self.api_url, headers=headers, json=payload, timeout=timeout)
+        return response, time.monotonic() - start
+
+    def _start_cooldown(self, model, response):
+        try:
+            retry_after = float(response.headers.get("retry-after", 1))
+        except ValueError:
+            retry_after = 1.0
+        with self._lock:
+            self.stats["rate_limited"] += 1
+            self._cooldown_until[model] = time.monotonic() + min(retry_after, self.max_cooldown)
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+
+# --- Local Model Server ---
+class SlotTable:
+    # Session -> server slot. A session keeps its slot, and with it the KV cache of its conversation
+    # so far, for as long as it is among the `slots` most recently active sessions.
+    def __init__(self, slots):
+        self.slots = slots
+        self.owners = OrderedDict()
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def slot_for(self, session_id):
+        with self._lock:
+            if session_id in self.owners:
+                self.owners.move_to_end(session_id)
+                return self.owners[session_id]
+            free = set(range(self.slots)) - set(self.owners.values())
+            if free:
+                slot = min(free)
+            else:
+                _, slot = self.owners.popitem(last=False)
+                self.evictions += 1
+            self.owners[session_id] = slot
+            return slot
+
+
+class LocalLLMClient:
+    # A llama.cpp server (llama-server --parallel <slots>) running a small quantized model on this
+    # machine, behind the same complete() interface as LLMClient. Each session is pinned to one
+    # server slot (id_slot) and asks the server to keep its prompt cached (cache_prompt), so a turn
+    # only evaluates the tokens added since the session's previous turn instead of the whole prompt.
+    # No hedging or cooldowns: a local server has no rate limits and a duplicate would only
+    # compete for the same CPU.
+    def __init__(self, api_url, model, slots=1, max_workers=8):
+        self.api_url = api_url
+        self.model = model
+        self.slot_table = SlotTable(slots)
+        self.session = requests.Session()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="local-llm")
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "deadline_misses": 0, "cancelled": 0, "prompt_tokens": 0, "cached_tokens": 0, "slot_evictions": 0}
+
+    def complete(self, payload, deadline, models=None, cancel=None, session_id=None):
+        # Same contract as LLMClient.complete; `models` is ignored (there is one local model).
+        self._check_cancel(cancel)
+        body = dict(payload, model=self.model, cache_prompt=True)
+        if session_id is not None:
+            body["id_slot"] = self.slot_table.slot_for(session_id)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMUnavailable("deadline reached")
+        future = self.executor.submit(self._post, body, remaining)
+        while True:
+            now = time.monotonic()
+            timeout = deadline - now if cancel is None else min(deadline - now, CANCEL_POLL_SECONDS)
+            done, _ = wait([future], timeout=max(0.0, timeout))
+            if done:
+                break
+            self._check_cancel(cancel)
+            if time.monotonic() >= deadline:
+                self._count("deadline_misses")
+                raise LLMUnavailable(f"{self.model}: deadline exceeded")
+        try:
+            response, elapsed = future.result()
+            response.raise_for_status()
+            data = response.json()
+            content = data["choices"][0]["message"]["content"]
+        except (requests.exceptions.RequestException, KeyError, IndexError, ValueError) as e:
+            raise LLMUnavailable(f"{self.model}: {e}") from e
+        self._record_cache_use(data)
+        return {"content": content, "model": self.model, "headers": response.headers, "hedged": False, "latency": elapsed}
+
+    def warm(self, system_prompt=None, connections=None):
+        # Primes every slot's KV cache with the system prompt all sessions share (one token generated
+        # per slot), which also opens the pooled connections.
+        payload = {"model": self.model, "messages": [{"role": "system", "content": system_prompt or ""}, {"role": "user", "content": "hello"}],
+                   "max_tokens": 1, "cache_prompt": True}
+        futures = [self.executor.submit(self.session.post, self.api_url, json=dict(payload, id_slot=slot), timeout=120) for slot in range(self.slot_table.slots)]
+        return [future.result().status_code for future in futures]
+
+    def _record_cache_use(self, data):
+        # llama.cpp reports the whole prompt in usage and only the tokens it had to evaluate in timings.
+        prompt_tokens = data.get("usage", {}).get("prompt_tokens", 0)
+        evaluated = data.get("timings", {}).get("prompt_n", prompt_tokens)
+        with self._lock:
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["cached_tokens"] += max(0, prompt_tokens - evaluated)
+            self.stats["slot_evictions"] = self.slot_table.evictions
+
+    def _check_cancel(self, cancel):
+        if cancel is not None and cancel.is_set():
+            self._count("cancelled")
+            raise TurnCancelled()
+
+    def _post(self, payload, timeout):
+        self._count("requests")
+        start = time.monotonic()
+        response = self.session.post(self.api_url, json=payload, timeout=timeout)
+        return response, time.monotonic() - start
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
@@ -0,0 +1,191 @@
+import json
+import re
+import threading
+
+INTENTS = ("order", "query_menu", "confirm", "cancel", "greeting", "farewell", "other", "thank_you")
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "dozen": 12,
+    "a couple": 2, "couple": 2, "a few": 3,
+}
+
+MAX_QUANTITY = 50
+
+CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.S | re.I)
+TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+PYTHON_LITERALS_RE = re.compile(r"(?<![\"\w])(None|True|False)(?![\"\w])")
+
+
+class OutputRepairError(ValueError):
+    pass
+
+
+# --- Tolerant JSON Repair ---
+def extract_json_object(text):
+    # First balanced {...} in the text, ignoring braces inside string literals.
+    start = text.find("{")
+    while start != -1:
+        depth, in_string, escaped = 0, False, False
+        for i in range(start, len(text)):
+            char = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+        start = text.find("{", start + 1)
+    return None
+
+
+def repair_json(text):
+    # Returns (parsed_dict, repaired). Raises OutputRepairError when nothing usable is found.
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, dict):
+            return parsed, False
+    except (json.JSONDecodeError, TypeError):
+        pass
+    if not isinstance(text, str):
+        raise OutputRepairError("LLM output is not text")
+
+    candidate = text.strip()
+    fenced = CODE_FENCE_RE.search(candidate)
+    if fenced:
+        candidate = fenced.group(1)
+    candidate = extract_json_object(candidate) or candidate
+    for fix in (
+        lambda s: s,
+        lambda s: TRAILING_COMMA_RE.sub(r"\1", s),
+        lambda s: PYTHON_LITERALS_RE.sub(lambda m: {"None": "null", "True": "true", "False": "false"}[m.group(1)], TRAILING_COMMA_RE.sub(r"\1", s)),
+    ):
+        try:
+            parsed = json.loads(fix(candidate))
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed, True
+    raise OutputRepairError("No JSON object found in LLM output")
+
+
+# --- Schema Validation ---
+def normalize_name(text):
+    return re.sub(r"[^a-z0-9]+", " ", str(text).lower()).strip()
+
+
+def parse_quantity(value):
+    # The number the model meant, in or out of range; None when there is none.
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().lower()
+    if normalize_name(text) in NUMBER_WORDS:
+        return NUMBER_WORDS[normalize_name(text)]
+    match = re.search(r"-?\d+", text)
+    return int(match.group(0)) if match else None
+
+
+def coerce_quantity(value):
+    quantity = parse_quantity(value)
+    return quantity if quantity is not None and 0 < quantity <= MAX_QUANTITY else None
+
+
+class OutputValidator:
+    def __init__(self, flat_menu):
+        self.flat_menu = flat_menu
+        self.aliases = {}
+        for item_id, item in flat_menu.items():
+            for alias in (item_id, item_id.replace("_", " "), item["name"]):
+                key = normalize_name(alias)
+                self.aliases.setdefault(key, item_id)
+                self.aliases.setdefault(key.rstrip("s"), item_id)
+        self._lock = threading.Lock()
+        self.stats = {"responses": 0, "clean": 0, "repaired": 0, "reasked": 0, "failed": 0}
+
+    def resolve_item_id(self, value):
+        if value is None:
+            return None
+        if value in self.flat_menu:
+            return value
+        key = normalize_name(value)
+        return self.aliases.get(key) or self.aliases.get(key.rstrip("s"))
+
+    def validate(self, raw_text):
+        # Returns the normalized response dict, or None if the output cannot be salvaged.
+        try:
+            data, repaired = repair_json(raw_text)
+        except OutputRepairError:
+            return None
+        issues = []
+
+        intent = str(data.get("intent") or "other").strip().lower().replace(" ", "_")
+        if intent not in INTENTS:
+            issues.append("intent")
+            intent = "other"
+
+        item_id = self.resolve_item_id(data.get("item_id"))
+        if data.get("item_id") is not None and item_id != data.get("item_id"):
+            issues.append("item_id")
+
+        quantity = coerce_quantity(data.get("quantity"))
+        if intent == "order" and quantity is None and parse_quantity(data.get("quantity")) is not None:
+            # "-1 burgers", "100 burgers": never quietly order one instead; re-ask or parse locally
+            return None
+        if data.get("quantity") is not None and quantity != data.get("quantity"):
+            issues.append("quantity")
+        if intent == "order" and quantity is None:
+            quantity = 1
+
+        response_text = data.get("response_text")
+        if not isinstance(response_text, str) or not response_text.strip():
+            issues.append("response_text")
+            response_text = None
+
+        if intent == "order" and item_id is None:
+            # Nothing on the menu to add; keep the model's reply but don't touch the cart.
+            issues.append("order_without_item")
+            intent = "other"
+        return {
+            "intent": intent,
+            "item_id": item_id,
+            "quantity": quantity,
+            "response_text": response_text,
+            "repaired": repaired or bool(issues),
+        }
+
+    def record(self, outcome):
+        with self._lock:
+            self.stats["responses"] += 1
+            self.stats[outcome] += 1
+
+    def summary(self):
+        with self._lock:
+            stats = dict(self.stats)
+        responses = stats["responses"] or 1
+        stats["repair_rate"] = stats["repaired"] / responses
+        # Every repaired response is a re-ask (or a repeated user turn) that never happened.
+        stats["retries_avoided"] = stats["repaired"]
+        return stats
+
+
+def build_reask_messages(messages, bad_output):
+    # Last-resort constrained re-ask: show the model its own output and pin the schema.
+    return messages + [
+        {"role": "assistant", "content": str(bad_output)[:1000]},
+        {"role": "user", "content": (
+            "Your previous reply was not a valid response. Reply again with ONLY a JSON object with keys "
+            f"\"intent\" (one of {', '.join(INTENTS)}), \"item_id\" (a menu item id or null), "
+            f"\"quantity\" (an integer from 1 to {MAX_QUANTITY}, or null) and \"response_text\" (a string). No other text."
+        )},
+    ]
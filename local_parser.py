@@ -0,0 +1,107 @@
+import re
+
+from llm_output import NUMBER_WORDS, normalize_name
+
+MAX_ALIAS_WORDS = 4
+
+GREETING_WORDS = {"hello", "hi", "hey", "howdy", "hiya"}
+THANKS_WORDS = {"thanks", "thank", "thx", "cheers"}
+FAREWELL_WORDS = {"bye", "goodbye", "later", "farewell"}
+MENU_WORDS = {"menu", "options", "serve", "have"}
+# Dietary and price filters ("vegan", "under $10") are menu questions too; the menu index answers them.
+FILTER_WORDS = {"vegan", "vegetarian", "veggie", "spicy", "under", "below", "cheaper", "cheap", "cheapest"}
+PROMO_WORDS = {"promotion", "promotions", "deal", "deals", "offer", "offers", "discount", "combo"}
+CANCEL_WORDS = {"cancel", "remove", "delete"}
+# A menu question skips the LLM only when it is clearly a question: order wording ("I'll have",
+# "I'd like", "get me") means the customer is ordering, even when no single item resolves.
+QUESTION_WORDS = {"what", "which", "anything", "any", "something", "do", "does", "is", "are", "got", "show", "list", "how"}
+ORDER_WORDS = {"want", "get", "take", "add", "order", "give", "need", "grab", "buy", "like", "ll", "d"}
+# Where one spoken order names several items: "two burgers, a coke and fries"
+ORDER_SEPARATORS = re.compile(r"[,;.!?]|\b(?:and|plus|also|then|with)\b", re.I)
+
+
+# --- Local Deterministic Parser ---
+# Last fallback tier: answers without any LLM call by matching menu aliases in the utterance.
+# It only understands simple orders and a handful of intents, but it never times out.
+class LocalParser:
+    def __init__(self, validator, menu=None, promotions=None):
+        self.validator = validator
+        self.menu = menu or {}
+        self.promotions = promotions or []
+        # Single words that identify exactly one item ("cheeseburger", "fries", "brownie").
+        owners = {}
+        for item_id, item in validator.flat_menu.items():
+            for word in set(normalize_name(item["name"]).split()) | set(normalize_name(item_id.replace("_", " ")).split()):
+                owners.setdefault(word, set()).add(item_id)
+        self.keywords = {word: ids.pop() for word, ids in owners.items() if len(ids) == 1 and len(word) > 2 and word not in FILTER_WORDS}
+
+    def parse(self, text):
+        words = normalize_name(text).split()
+        word_set = set(words)
+        item_id, quantity = self.find_item(words)
+        flat_menu = self.validator.flat_menu
+
+        if item_id and word_set & CANCEL_WORDS:
+            return result("cancel", item_id, None, f"To remove {flat_menu[item_id]['name']}, tap 🗑️ next to it in your order. 🛒")
+        if item_id:
+            return result("order", item_id, quantity, f"Got it! Adding {quantity} x {flat_menu[item_id]['name']} to your order. ✅")
+        if word_set & THANKS_WORDS:
+            return result("thank_you", None, None, "You're most welcome! 😊")
+        if word_set & FAREWELL_WORDS:
+            return result("farewell", None, None, "Goodbye! 👋")
+        if word_set & PROMO_WORDS and self.promotions:
+            offers = " ".join(f"{promo['name']}: {promo['description']}" for promo in self.promotions)
+            return result("other", None, None, f"Here's what's on offer today: {offers}")
+        if word_set & (MENU_WORDS | FILTER_WORDS) and self.menu:
+            categories = ", ".join(category.replace("_", " ") for category in self.menu)
+            return result("query_menu", None, None, f"We have {categories}. Take a look at the menu and tell me what you'd like! 📋")
+        if word_set & GREETING_WORDS:
+            return result("greeting", None, None, "Hello there! 🌟")
+        return result("other", None, None, "Sorry, I didn't catch an item from our menu. Could you tell me what you'd like to order? 🤔")
+
+    def is_menu_question(self, text):
+        # "have" asks about the menu only as "do you have" / "what do you have"
+        words = normalize_name(text).split()
+        if set(words) & ORDER_WORDS or any(word == "have" and words[i - 1:i] != ["you"] for i, word in enumerate(words)):
+            return False
+        return "?" in text or bool(set(words) & (QUESTION_WORDS | FILTER_WORDS))
+
+    def parse_order(self, text):
+        # Every item named in a longer transcript (phone orders), as order lines with summed quantities.
+        quantities = {}
+        for segment in ORDER_SEPARATORS.split(text):
+            words = normalize_name(segment).split()
+            item_id, quantity = self.find_item(words)
+            if item_id and not set(words) & CANCEL_WORDS:
+                quantities[item_id] = quantities.get(item_id, 0) + quantity
+        return [{"id": item_id, "quantity": quantity} for item_id, quantity in quantities.items()]
+
+    def find_item(self, words):
+        # Longest alias match wins ("bbq bacon burger" over "burger"), then unique keywords.
+        # A number word or digit right before the match is taken as the quantity.
+        for size in range(min(MAX_ALIAS_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                item_id = self.validator.resolve_item_id(" ".join(words[start:start + size]))
+                if item_id:
+                    return item_id, quantity_before(words, start)
+        for start, word in enumerate(words):
+            item_id = self.keywords.get(word) or self.keywords.get(word.rstrip("s"))
+            if item_id:
+                return item_id, quantity_before(words, start)
+        return None, None
+
+
+def quantity_before(words, start):
+    for size in (2, 1):
+        if start - size < 0:
+            continue
+        phrase = " ".join(words[start - size:start])
+        if phrase in NUMBER_WORDS:
+            return NUMBER_WORDS[phrase]
+        if re.fullmatch(r"\d+", phrase):
+            return max(1, min(int(phrase), 50))
+    return 1
+
+
+def result(intent, item_id, quantity, response_text):
+    return {"intent": intent, "item_id": item_id, "quantity": quantity, "response_text": response_text}
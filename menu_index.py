@@ -0,0 +1,218 @@
+import json
+import re
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from llm_output import normalize_name
+from promotions import iter_bits
+
+STOP_WORDS = {
+    "a", "an", "and", "any", "are", "can", "do", "dollars", "for", "get", "have", "i", "is", "it", "me", "menu",
+    "of", "on", "or", "please", "show", "some", "something", "than", "that", "the", "to", "what", "whats", "with",
+    "you", "your", "items", "options", "food", "dishes", "anything", "got", "s",
+}
+DIETARY_SYNONYMS = {"veggie": "vegetarian", "veg": "vegetarian", "plant": "vegan", "hot": "spicy"}
+MAX_PRICE_WORDS = ("under", "below", "less than", "cheaper than", "max", "at most", "up to")
+MIN_PRICE_WORDS = ("over", "above", "more than", "at least")
+PRICE_WORDS = {word for phrase in MAX_PRICE_WORDS + MIN_PRICE_WORDS for word in phrase.split()}
+PRICE_PATTERN = r"\$?\s*(\d+(?:\.\d+)?)"
+ANSWER_LIMIT = 6
+# BM25 parameters; the item name is counted NAME_WEIGHT times so "burger" ranks burgers above
+# items that only mention one in the description.
+BM25_K1 = 1.2
+BM25_B = 0.75
+NAME_WEIGHT = 2
+CONTEXT_WEIGHT = 0.5
+
+
+def stem(token):
+    # Enough for menu words: "wings" -> "wing", "fries" -> "fry", "burgers" -> "burger".
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [stem(token) for token in normalize_name(text).split()]
+
+
+# --- Menu Index ---
+# Built once per catalog. Items are numbered in menu order; every token, dietary tag and
+# category is an int bitset over those numbers (as in promotions.PromotionEngine), and prices
+# are kept sorted with a prefix bitset per rank, so a query is a few ANDs plus two bisects.
+class MenuIndex:
+    def __init__(self, menu):
+        self.menu = menu
+        self.items = [item for items in menu.values() for item in items]
+        self.item_index = {item["id"]: i for i, item in enumerate(self.items)}
+        self.all_mask = (1 << len(self.items)) - 1
+
+        self.category_masks = {}
+        self.postings = {}
+        self.dietary_masks = {}
+        for category, items in menu.items():
+            for item in items:
+                bit = 1 << self.item_index[item["id"]]
+                self.category_masks[category] = self.category_masks.get(category, 0) | bit
+                for token in set(tokenize(f"{item['name']} {item['description']} {category.replace('_', ' ')}")):
+                    self.postings[token] = self.postings.get(token, 0) | bit
+                for tag in item.get("dietary", []):
+                    self.dietary_masks[tag] = self.dietary_masks.get(tag, 0) | bit
+        self.vocabulary = sorted(self.postings)
+        self.dietary_tags = sorted(self.dietary_masks)
+        self.category_tokens = {stem(token): category for category in menu for token in normalize_name(category.replace("_", " ")).split()}
+
+        self._build_bm25(menu)
+
+        order = sorted(range(len(self.items)), key=lambda i: self.items[i]["price"])
+        self.sorted_prices = [self.items[i]["price"] for i in order]
+        # price_prefix[k]: bitset of the k cheapest items
+        self.price_prefix = [0]
+        for i in order:
+            self.price_prefix.append(self.price_prefix[-1] | (1 << i))
+
+    def _build_bm25(self, menu):
+        # Dense items x terms matrix of precomputed BM25 weights: scoring a query is one matrix-vector product.
+        documents = []
+        for category, items in menu.items():
+            for item in items:
+                words = tokenize(item["name"]) * NAME_WEIGHT + tokenize(f"{item['description']} {category.replace('_', ' ')} {' '.join(item.get('dietary', []))}")
+                documents.append(words)
+        self.terms = {term: i for i, term in enumerate(sorted({word for words in documents for word in words}))}
+        tf = np.zeros((len(documents), len(self.terms)), dtype=np.float32)
+        for row, words in enumerate(documents):
+            for word in words:
+                tf[row, self.terms[word]] += 1
+        lengths = tf.sum(axis=1, keepdims=True)
+        df = (tf > 0).sum(axis=0)
+        idf = np.log(1 + (len(documents) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(float(lengths.mean()), 1.0))
+        self.bm25 = idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        # Nothing matched ("recommend something"): the first item of each category, so the model still has ids to offer.
+        self.featured = [self.item_index[items[0]["id"]] for items in menu.values() if items]
+        self.category_summary = {}
+        for category, items in menu.items():
+            prices = [item["price"] for item in items]
+            count = f"{len(items)} item{'s' if len(items) != 1 else ''}"
+            self.category_summary[category] = f"{count}, ${min(prices):.2f}-${max(prices):.2f}" if prices else count
+
+    def query_vector(self, text, weight=1.0, vector=None):
+        vector = np.zeros(len(self.terms), dtype=np.float32) if vector is None else vector
+        for token in tokenize(text):
+            token = DIETARY_SYNONYMS.get(token, token)
+            if token in self.terms and token not in STOP_WORDS:
+                vector[self.terms[token]] += weight
+        return vector
+
+    def retrieve(self, text, context="", cart_ids=(), k=6):
+        # Top-k items for the utterance (plus, at lower weight, the assistant's previous reply, so
+        # "yes, add that" still sees the item that was suggested), then the upsells of the cart.
+        scores = self.bm25 @ self.query_vector(context, CONTEXT_WEIGHT, self.query_vector(text))
+        ranked = np.argsort(-scores, kind="stable")[:k]
+        selected = [int(i) for i in ranked if scores[i] > 0] or self.featured[:k]
+        for item_id in cart_ids:
+            for upsell_id in self.items[self.item_index[item_id]].get("upsell", []) if item_id in self.item_index else []:
+                if upsell_id in self.item_index and self.item_index[upsell_id] not in selected:
+                    selected.append(self.item_index[upsell_id])
+        return [self.items[i] for i in selected]
+
+    def menu_prompt(self, text, context="", cart_ids=(), k=6):
+        # What the LLM prompt gets instead of the whole menu: the retrieved items and one line per category.
+        if k <= 0:
+            return f"Current Menu (JSON): {json.dumps(self.menu)}"
+        items = [dict(item, category=self.item_category(item["id"])) for item in self.retrieve(text, context, cart_ids, k)]
+        return f"""Menu Categories (JSON): {json.dumps(self.category_summary)}
+        Menu Items Relevant To This Message (JSON): {json.dumps(items)}
+        The full menu has more items in each category; never invent item ids that are not listed above."""
+
+    def item_category(self, item_id):
+        bit = 1 << self.item_index[item_id]
+        return next(category for category, mask in self.category_masks.items() if mask & bit)
+
+    def token_mask(self, token, prefix=False):
+        # Exact match, or every vocabulary word starting with the token (type-ahead on the last word).
+        mask = self.postings.get(token, 0)
+        if prefix:
+            start = bisect_left(self.vocabulary, token)
+            for word in self.vocabulary[start:]:
+                if not word.startswith(token):
+                    break
+                mask |= self.postings[word]
+        return mask
+
+    def search_mask(self, terms=(), dietary=(), max_price=None, min_price=None, categories=(), prefix_last=False):
+        mask = self.all_mask
+        for i, term in enumerate(terms):
+            mask &= self.token_mask(term, prefix=prefix_last and i == len(terms) - 1)
+        for tag in dietary:
+            mask &= self.dietary_masks.get(tag, 0)
+        if categories:
+            category_mask = 0
+            for category in categories:
+                category_mask |= self.category_masks.get(category, 0)
+            mask &= category_mask
+        if max_price is not None:
+            mask &= self.price_prefix[bisect_right(self.sorted_prices, max_price)]
+        if min_price is not None:
+            mask &= self.all_mask ^ self.price_prefix[bisect_left(self.sorted_prices, min_price)]
+        return mask
+
+    def search(self, text="", dietary=(), max_price=None, min_price=None):
+        # Free text may carry its own filters ("vegan under $10"); they combine with the explicit ones.
+        query = self.parse_query(text)
+        max_prices = [p for p in (max_price, query["max_price"]) if p is not None]
+        min_prices = [p for p in (min_price, query["min_price"]) if p is not None]
+        mask = self.search_mask(
+            query["terms"],
+            set(dietary) | set(query["dietary"]),
+            min(max_prices) if max_prices else None,
+            max(min_prices) if min_prices else None,
+            query["categories"],
+            prefix_last=not text.endswith(" "),
+        )
+        return [self.items[i] for i in iter_bits(mask)]
+
+    def parse_query(self, text):
+        text = str(text).lower()
+        query = {"terms": [], "dietary": [], "categories": [], "max_price": None, "min_price": None}
+        for words, key in ((MAX_PRICE_WORDS, "max_price"), (MIN_PRICE_WORDS, "min_price")):
+            match = re.search(rf"\b(?:{'|'.join(words)})\s+{PRICE_PATTERN}", text)
+            if match:
+                query[key] = float(match.group(1))
+                text = text[:match.start()] + " " + text[match.end():]
+        for token in tokenize(text):
+            tag = DIETARY_SYNONYMS.get(token, token)
+            if tag in self.dietary_masks:
+                query["dietary"].append(tag)
+            elif token in self.category_tokens:
+                query["categories"].append(self.category_tokens[token])
+            elif token not in STOP_WORDS and token not in PRICE_WORDS and not token.isdigit():
+                query["terms"].append(token)
+        return query
+
+    def has_filters(self, query):
+        return bool(query["dietary"] or query["categories"] or query["max_price"] is not None or query["min_price"] is not None)
+
+    def answer(self, text, item_id=None):
+        # query_menu replies straight from the index; None when the question has no usable filter.
+        if item_id in self.item_index:
+            item = self.items[self.item_index[item_id]]
+            tags = f" ({', '.join(item['dietary'])})" if item.get("dietary") else ""
+            return f"{item['name']}{tags} is ${item['price']:.2f}: {item['description']} 😋"
+        query = self.parse_query(text)
+        if not self.has_filters(query) and not query["terms"]:
+            return None
+        mask = self.search_mask(query["terms"], query["dietary"], query["max_price"], query["min_price"], query["categories"])
+        if not mask and query["terms"] and self.has_filters(query):
+            # Unknown words shouldn't hide filter matches ("anything vegan to drink" -> vegan drinks).
+            mask = self.search_mask((), query["dietary"], query["max_price"], query["min_price"], query["categories"])
+        if not mask:
+            return None if not self.has_filters(query) else "Sorry, nothing on our menu matches that. 😕 Want me to suggest something close?"
+        matches = sorted((self.items[i] for i in iter_bits(mask)), key=lambda item: item["price"])
+        listed = ", ".join(f"{item['name']} (${item['price']:.2f})" for item in matches[:ANSWER_LIMIT])
+        more = f" and {len(matches) - ANSWER_LIMIT} more" if len(matches) > ANSWER_LIMIT else ""
+        return f"Here's what matches: {listed}{more}. Want me to add one? 🍽️"
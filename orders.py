@@ -0,0 +1,195 @@
+import hashlib
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+TAX_RATE = 0.08
+
+logger = logging.getLogger(__name__)
+
+
+class OrderValidationError(ValueError):
+    pass
+
+
+# --- Pricing ---
+def price_order(lines, flat_menu, tax_rate=TAX_RATE, promotion_engine=None):
+    # Prices always come from the catalog, never from the client-side cart.
+    if not lines:
+        raise OrderValidationError("Order is empty.")
+    quantities = {}
+    for line in lines:
+        item_id = line.get("id")
+        if item_id not in flat_menu:
+            raise OrderValidationError(f"Unknown menu item: {item_id}")
+        try:
+            quantity = int(line.get("quantity", 0))
+        except (TypeError, ValueError):
+            raise OrderValidationError(f"Invalid quantity for {item_id}: {line.get('quantity')!r}")
+        if quantity <= 0:
+            raise OrderValidationError(f"Invalid quantity for {item_id}: {quantity}")
+        quantities[item_id] = quantities.get(item_id, 0) + quantity
+
+    priced_lines = []
+    for item_id, quantity in quantities.items():
+        item = flat_menu[item_id]
+        priced_lines.append({
+            "id": item_id,
+            "name": item["name"],
+            "price": item["price"],
+            "quantity": quantity,
+            "line_total": round(item["price"] * quantity, 2),
+        })
+    subtotal = round(sum(line["line_total"] for line in priced_lines), 2)
+    promotions = {"applied": [], "discount_total": 0.0}
+    if promotion_engine is not None:
+        promotions = promotion_engine.new_cart().sync(priced_lines)
+    taxable = round(subtotal - promotions["discount_total"], 2)
+    tax = round(taxable * tax_rate, 2)
+    return {
+        "lines": priced_lines,
+        "subtotal": subtotal,
+        "promotions": promotions["applied"],
+        "discount_total": promotions["discount_total"],
+        "tax": tax,
+        "total": round(taxable + tax, 2),
+    }
+
+
+def make_idempotency_key(checkout_id, lines):
+    # Same checkout attempt + same cart contents -> same key, so reruns and double clicks collapse.
+    cart = sorted((line["id"], int(line["quantity"])) for line in lines)
+    digest = hashlib.blake2b(json.dumps([checkout_id, cart]).encode("utf-8"), digest_size=16)
+    return digest.hexdigest()
+
+
+# --- Append-only Order Log (SQLite WAL) ---
+class OrderLog:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL in WAL mode only fsyncs at checkpoints, which batches disk flushes across commits.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS orders (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id TEXT NOT NULL UNIQUE,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                created_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS order_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                order_id TEXT NOT NULL,
+                event TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS order_events_order_id ON order_events (order_id);
+        """)
+
+    def append(self, order, idempotency_key):
+        # Returns (stored_order, created). A repeated key returns the order that was stored first.
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO orders (order_id, idempotency_key, created_at, payload) VALUES (?, ?, ?, ?)",
+                (order["order_id"], idempotency_key, order["created_at"], json.dumps(order)),
+            )
+            if cursor.rowcount == 1:
+                return order, True
+            row = self._conn.execute("SELECT payload FROM orders WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+            return json.loads(row[0]), False
+
+    def append_event(self, order_id, event):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO order_events (order_id, event, created_at) VALUES (?, ?, ?)",
+                (order_id, event, time.time()),
+            )
+
+    def pending_orders(self):
+        # Orders that were logged but never acknowledged by the kitchen (e.g. the process died).
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT payload FROM orders
+                WHERE order_id NOT IN (SELECT order_id FROM order_events WHERE event = 'kitchen_received')
+                ORDER BY seq
+            """).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --- Kitchen Queue ---
+class KitchenQueue:
+    def __init__(self, order_log, handler=None):
+        self.order_log = order_log
+        self.handler = handler
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="kitchen-worker", daemon=True)
+        self._worker.start()
+
+    def publish(self, order):
+        self._queue.put(order)
+
+    def join(self):
+        self._queue.join()
+
+    def stop(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            order = self._queue.get()
+            try:
+                if order is None:
+                    return
+                if self.handler:
+                    self.handler(order)
+                self.order_log.append_event(order["order_id"], "kitchen_received")
+            except Exception:
+                # Leave the order unacknowledged; it is republished on the next start.
+                logger.exception("Kitchen worker failed for order %s", order["order_id"])
+            finally:
+                self._queue.task_done()
+
+
+# --- Order Submission ---
+class OrderService:
+    def __init__(self, log_path, flat_menu, tax_rate=TAX_RATE, kitchen_handler=None, promotion_engine=None):
+        self.flat_menu = flat_menu
+        self.tax_rate = tax_rate
+        self.promotion_engine = promotion_engine
+        self.order_log = OrderLog(log_path)
+        self.kitchen = KitchenQueue(self.order_log, handler=kitchen_handler)
+        for order in self.order_log.pending_orders():
+            self.kitchen.publish(order)
+
+    def submit(self, lines, idempotency_key, flat_menu=None, promotion_engine=None, location=None):
+        # Returns (order, created). Raises OrderValidationError for carts that cannot be priced.
+        # flat_menu/promotion_engine: the ordering location's, when it isn't the service's own catalog.
+        order = price_order(lines, flat_menu or self.flat_menu, self.tax_rate, promotion_engine or self.promotion_engine)
+        if location is not None:
+            order["location"] = location
+        order["order_id"] = uuid.uuid4().hex[:12]
+        order["created_at"] = time.time()
+        stored_order, created = self.order_log.append(order, idempotency_key)
+        if created:
+            self.kitchen.publish(stored_order)
+        return stored_order, created
+
+    def close(self):
+        self.kitchen.stop()
+        self.order_log.close()
@@ -0,0 +1,53 @@
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from admin import require_admin
+from catalog import flat_menu
+from services import get_sales_store
+
+st.set_page_config(layout="wide", page_title="Sales Analytics 📊")
+require_admin()
+
+st.title("Sales Analytics 📊")
+WINDOWS = {"Last 24 hours": 24 * 3600, "Last 7 days": 7 * 24 * 3600, "Last 30 days": 30 * 24 * 3600, "All time": None}
+window = st.radio("Period", list(WINDOWS), index=1, horizontal=True, label_visibility="collapsed")
+start = time.time() - WINDOWS[window] if WINDOWS[window] else None
+
+store = get_sales_store()
+query_started = time.perf_counter()
+basket = store.basket_stats(start)
+upsell = store.upsell_conversion(start)
+hours, item_ids, quantities, _ = store.hourly_item_sales(start)
+totals = store.item_totals(start)
+query_ms = (time.perf_counter() - query_started) * 1000
+
+def item_name(item_id):
+    return flat_menu.get(item_id, {}).get("name", item_id)
+
+metric_cols = st.columns(5)
+metric_cols[0].metric("Orders", f"{basket['orders']:,}")
+metric_cols[1].metric("Revenue", f"${basket['revenue']:,.2f}")
+metric_cols[2].metric("Avg. order value", f"${basket['avg_order_value']:.2f}")
+metric_cols[3].metric("Avg. basket size", f"{basket['avg_items']:.2f} items")
+metric_cols[4].metric("Upsell conversion", f"{upsell['rate']:.1%}", help=f"{upsell['accepted']:,} of {upsell['suggestions']:,} suggestions ordered")
+
+if not basket["orders"]:
+    st.info("No completed orders in this period yet.")
+else:
+    st.subheader("Items sold per hour")
+    sold = quantities.any(axis=0)
+    hourly = pd.DataFrame(quantities[:, sold], index=[datetime.fromtimestamp(hour) for hour in hours], columns=[item_name(item_id) for item_id, keep in zip(item_ids, sold) if keep])
+    st.bar_chart(hourly)
+
+    table_cols = st.columns(2)
+    with table_cols[0]:
+        st.subheader("Best sellers")
+        st.dataframe(pd.DataFrame([(item_name(item_id), units, revenue) for item_id, units, revenue in totals], columns=["Item", "Sold", "Revenue ($)"]), hide_index=True, use_container_width=True)
+    with table_cols[1]:
+        st.subheader("Accepted suggestions")
+        st.dataframe(pd.DataFrame([(item_name(item_id), units) for item_id, units in upsell["by_item"]], columns=["Item", "Sold after a suggestion"]), hide_index=True, use_container_width=True)
+
+st.caption(f"{store.line_count():,} order lines · queried in {query_ms:.1f} ms")
@@ -0,0 +1,54 @@
+import json
+import time
+
+import pandas as pd
+import streamlit as st
+
+from admin import require_admin
+from services import get_profiler, get_tracer
+
+st.set_page_config(layout="wide", page_title="Profiler 🔥")
+require_admin()
+
+st.title("Profiler 🔥")
+profiler = get_profiler()
+
+if profiler.running:
+    scope = "the whole server" if profiler.sessions is None else f"{len(profiler.sessions)} session(s)"
+    st.info(f"Profiling {scope}: {max(0.0, profiler.ends_at - time.monotonic()):.0f} s left.")
+    control_cols = st.columns([1, 1, 6])
+    if control_cols[0].button("Stop"):
+        profiler.stop()
+        st.rerun()
+    control_cols[1].button("Refresh")
+else:
+    with st.form("start_profile"):
+        seconds = st.slider("Duration (seconds)", 5, int(profiler.max_seconds), 30, step=5)
+        scope = st.radio("Scope", ["Whole server", "Selected sessions"], horizontal=True)
+        sessions = st.multiselect("Sessions", get_tracer().recent_sessions(), help="Sessions with recent turns, latest first; a kiosk shows its id in the ?debug=1 panel.")
+        if st.form_submit_button("Start profiling"):
+            if scope == "Selected sessions" and not sessions:
+                st.warning("Pick at least one session.")
+            else:
+                profiler.start(seconds, sessions if scope == "Selected sessions" else None)
+                st.rerun()
+
+report = profiler.report()
+if not report["samples"]:
+    st.caption("No profile yet. Samples are taken only while a profile runs.")
+    st.stop()
+
+st.subheader("Time by stage")
+stages = pd.DataFrame([(stage, s["samples"], s["share"], s["approx_ms"]) for stage, s in report["stages"].items()], columns=["Stage", "Samples", "Share", "≈ thread ms"])
+if len(stages):
+    st.bar_chart(stages.set_index("Stage")["Samples"])
+st.dataframe(stages, hide_index=True, use_container_width=True, column_config={"Share": st.column_config.ProgressColumn(min_value=0, max_value=1, format="%.2f")})
+
+st.subheader("Hottest frames")
+st.dataframe(pd.DataFrame([(stage, frame, count) for (stage, frame), count in profiler.hot_frames()], columns=["Stage", "Frame", "Samples"]), hide_index=True, use_container_width=True)
+
+download_cols = st.columns(2)
+download_cols[0].download_button("Download collapsed stacks", profiler.collapsed(), file_name="foodie-profile.folded", mime="text/plain",
+                                 help="Folded stacks, one per line; open in speedscope or render with flamegraph.pl.")
+download_cols[1].download_button("Download stage report (JSON)", json.dumps(dict(report, hot_frames=profiler.hot_frames(50)), indent=2), file_name="foodie-profile.json", mime="application/json")
+st.caption(f"{report['samples']:,} samples every {report['interval_ms']:.0f} ms over {report['seconds']} s · sampler overhead {report['overhead_pct']}% of one core")
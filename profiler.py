@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MAX_DEPTH = 64
+
+# Top-level stage of a sample: the innermost frame of the app's own code decides, so an LLM wait
+# inside process_user_input counts as "llm" and the menu loop of the page script as "render".
+STAGES = [
+    ("llm", {"llm_client.py", "llm_output.py"}),
+    ("agents", {"agents.py", "local_parser.py", "promotions.py", "menu_index.py"}),
+    ("audio", {"speech.py", "voice.py", "tts.py"}),
+    ("process_user_input", {"assistant.py", "orders.py"}),
+    ("render", {"app.py", "theme.py", "images.py"}),
+]
+STAGE_OF_FILE = {filename: stage for stage, filenames in STAGES for filename in filenames}
+
+
+def attach(session_id):
+    # Marks the calling thread (a script run, a voice turn) as working for this session, so a
+    # session-scoped profile can pick its threads out. Lives on the thread object, so it ends with it.
+    threading.current_thread().foodie_session = session_id
+
+
+# --- Sampling Profiler ---
+# A daemon thread that wakes every interval_ms for a limited window and takes the Python stack of
+# every thread that is running app code (sys._current_frames; no tracing hooks, nothing changes
+# on the profiled threads). Samples are wall-clock, like pyinstrument: a thread waiting on the LLM
+# is sampled as waiting. Stacks are kept only as counts of collapsed (folded) stacks, so memory
+# grows with the number of distinct stacks, not with the profile length.
+class SamplingProfiler:
+    def __init__(self, interval_ms=10, max_seconds=300):
+        self.interval = interval_ms / 1000
+        self.max_seconds = max_seconds
+        self.sessions = None
+        self.stacks = Counter()
+        self.stages = Counter()
+        self.started = None
+        self.ends_at = None
+        self.finished = None
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds, sessions=None):
+        # sessions: app session ids to profile, or None for every thread of the server
+        with self._lock:
+            if self.running:
+                return False
+            self.sessions = set(sessions) if sessions else None
+            self.stacks, self.stages = Counter(), Counter()
+            self.samples, self.sampling_seconds = 0, 0.0
+            self.started, self.finished = time.time(), None
+            self.ends_at = time.monotonic() + min(seconds, self.max_seconds)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval) and time.monotonic() < self.ends_at:
+            sample_started = time.perf_counter()
+            frames = sys._current_frames()
+            for thread in threading.enumerate():
+                frame = frames.get(thread.ident)
+                if frame is None or thread.ident == own:
+                    continue
+                if self.sessions is not None and getattr(thread, "foodie_session", None) not in self.sessions:
+                    continue
+                stack = self._collapse(frame)
+                if stack is not None:
+                    with self._lock:
+                        self.stacks[stack] += 1
+                        self.stages[stack[0]] += 1
+            del frames
+            with self._lock:
+                self.samples += 1
+                self.sampling_seconds += time.perf_counter() - sample_started
+        self.finished = time.time()
+
+    @staticmethod
+    def _collapse(frame):
+        # -> (stage, outermost app frame, ..., leaf frame) or None when no app code is on the stack.
+        # Library frames below the outermost app frame are kept; Streamlit's runner above it is not.
+        labels, stage, app_depth = [], None, None
+        while frame is not None and len(labels) < MAX_DEPTH:
+            code = frame.f_code
+            filename = code.co_filename
+            if filename.startswith(ROOT) and "site-packages" not in filename:
+                relative = os.path.relpath(filename, ROOT)
+                labels.append(f"{code.co_name} ({relative}:{frame.f_lineno})")
+                stage = stage or STAGE_OF_FILE.get(os.path.basename(filename), "other")
+                app_depth = len(labels)
+            else:
+                labels.append(f"{code.co_name} ({os.path.basename(filename)})")
+            frame = frame.f_back
+        if app_depth is None:
+            return None
+        return (stage, *reversed(labels[:app_depth]))
+
+    # --- Reports ---
+    def report(self):
+        with self._lock:
+            stages, samples, stacks = dict(self.stages), self.samples, sum(self.stacks.values())
+        elapsed = ((self.finished or time.time()) - self.started) if self.started else 0.0
+        return {
+            "running": self.running,
+            "scope": sorted(self.sessions) if self.sessions else "server",
+            "seconds": round(elapsed, 1),
+            "samples": samples,
+            "interval_ms": self.interval * 1000,
+            "overhead_pct": round(self.sampling_seconds / elapsed * 100, 2) if elapsed else 0.0,
+            "stages": {stage: {"samples": count, "share": round(count / stacks, 3), "approx_ms": round(count * self.interval * 1000)}
+                       for stage, count in sorted(stages.items(), key=lambda item: -item[1])},
+        }
+
+    def hot_frames(self, limit=20):
+        # Leaf frames (self time) with their stage, most sampled first.
+        frames = Counter()
+        with self._lock:
+            for stack, count in self.stacks.items():
+                frames[(stack[0], stack[-1])] += count
+        return frames.most_common(limit)
+
+    def collapsed(self):
+        # Folded stacks ("stage;outer;...;leaf count" per line), for flamegraph.pl, speedscope or inferno.
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks)
@@ -0,0 +1,176 @@
+class PromotionEngine:
+    # Promotion rules compiled once per catalog. Items are numbered in menu order and every
+    # category / promotion slot becomes an int bitset over those numbers, so applicability
+    # checks are a handful of AND operations regardless of menu size.
+    def __init__(self, menu, promotions, category_groups=None):
+        self.item_ids = [item["id"] for items in menu.values() for item in items]
+        self.item_index = {item_id: i for i, item_id in enumerate(self.item_ids)}
+        self.prices = [item["price"] for items in menu.values() for item in items]
+
+        self.category_masks = {}
+        for category, items in menu.items():
+            mask = 0
+            for item in items:
+                mask |= 1 << self.item_index[item["id"]]
+            self.category_masks[category] = mask
+        for group, categories in (category_groups or {}).items():
+            mask = 0
+            for category in categories:
+                mask |= self.category_masks.get(category, 0)
+            self.category_masks[group] = mask
+
+        self.rules = []
+        self.item_rules = [[] for _ in self.item_ids]
+        for promotion in promotions:
+            slot_masks = [self._slot_mask(slot) for slot in promotion["items"]]
+            if not all(slot_masks):
+                raise ValueError(f"Promotion {promotion['name']!r} references an unknown category or item")
+            rule_index = len(self.rules)
+            self.rules.append({
+                "id": promotion.get("id", promotion["name"]),
+                "name": promotion["name"],
+                "discount": promotion["discount"],
+                "slots": slot_masks,
+            })
+            mask = 0
+            for slot_mask in slot_masks:
+                mask |= slot_mask
+            for i in iter_bits(mask):
+                self.item_rules[i].append(rule_index)
+
+    def _slot_mask(self, slot):
+        if slot in self.category_masks:
+            return self.category_masks[slot]
+        if slot in self.item_index:
+            return 1 << self.item_index[slot]
+        return 0
+
+    def new_cart(self):
+        return PromotionCart(self)
+
+
+class PromotionCart:
+    # Incrementally maintained promotion state for one cart. Only the rules touching a
+    # changed line are re-checked; the best combination is recomputed lazily on read.
+    MAX_SEARCH_NODES = 500
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.quantities = [0] * len(engine.item_ids)
+        self.present = 0
+        self.candidates = {}
+        self._result = {"applied": [], "discount_total": 0.0}
+
+    def sync(self, order_lines):
+        # Diff the cart against the last synced state and apply only the changed lines.
+        wanted = {}
+        for line in order_lines:
+            wanted[line["id"]] = wanted.get(line["id"], 0) + line["quantity"]
+        for i in iter_bits(self.present):
+            item_id = self.engine.item_ids[i]
+            if item_id not in wanted:
+                self.set_quantity(item_id, 0)
+        for item_id, quantity in wanted.items():
+            self.set_quantity(item_id, quantity)
+        return self.result()
+
+    def set_quantity(self, item_id, quantity):
+        i = self.engine.item_index.get(item_id)
+        if i is None or self.quantities[i] == max(quantity, 0):
+            return
+        self.quantities[i] = max(quantity, 0)
+        if self.quantities[i]:
+            self.present |= 1 << i
+        else:
+            self.present &= ~(1 << i)
+        for rule_index in self.engine.item_rules[i]:
+            rule = self.engine.rules[rule_index]
+            if all(slot & self.present for slot in rule["slots"]):
+                self.candidates[rule_index] = rule
+            else:
+                self.candidates.pop(rule_index, None)
+        self._result = None
+
+    def result(self):
+        if self._result is None:
+            self._result = self._best_combination()
+        return self._result
+
+    def _best_combination(self):
+        # Branch and bound over the applicable rules, best discount first. The first path
+        # explored is the greedy answer, so hitting the node budget still returns a good one.
+        rules, ceilings = [], []
+        for rule in sorted(self.candidates.values(), key=lambda rule: (-rule["discount"], len(rule["slots"]))):
+            times = self._max_times(rule, self.quantities)
+            if times:
+                rules.append(rule)
+                ceilings.append(rule["discount"] * times)
+        # bounds[i]: the most that rules i.. could add, ignoring conflicts between them.
+        bounds = [0.0] * (len(rules) + 1)
+        for i in range(len(rules) - 1, -1, -1):
+            bounds[i] = bounds[i + 1] + ceilings[i]
+        best = {"value": 0.0, "applied": []}
+        nodes = [0]
+
+        def search(index, units, value, applied):
+            if value > best["value"]:
+                best["value"], best["applied"] = value, list(applied)
+            if index == len(rules):
+                return
+            if value + bounds[index] <= best["value"]:
+                return
+            nodes[0] += 1
+            rule = rules[index]
+            remaining = list(units)
+            times, discount = 0, 0.0
+            steps = [(units, 0, 0.0)]
+            while True:
+                taken = self._take(rule, remaining)
+                if taken is None:
+                    break
+                times += 1
+                discount += min(rule["discount"], taken)
+                steps.append((list(remaining), times, discount))
+            # Greediest count first; alternatives are only explored while the node budget lasts.
+            for n, (step_units, step_times, step_discount) in enumerate(reversed(steps)):
+                if n and nodes[0] >= self.MAX_SEARCH_NODES:
+                    break
+                if step_times:
+                    applied.append((rule, step_times, step_discount))
+                search(index + 1, step_units, value + step_discount, applied)
+                if step_times:
+                    applied.pop()
+
+        search(0, list(self.quantities), 0.0, [])
+        applied = [
+            {"id": rule["id"], "name": rule["name"], "times": times, "discount": round(discount, 2)}
+            for rule, times, discount in best["applied"]
+        ]
+        return {"applied": applied, "discount_total": round(sum((a["discount"] for a in applied), 0.0), 2)}
+
+    def _max_times(self, rule, units):
+        return min(sum(units[i] for i in iter_bits(slot & self.present)) for slot in rule["slots"])
+
+    def _take(self, rule, units):
+        # Consume one unit per slot, preferring the item with the most units left.
+        # Returns the list price of the consumed units, or None if a slot cannot be filled.
+        chosen = []
+        for slot in rule["slots"]:
+            best_i = None
+            for i in iter_bits(slot & self.present):
+                if units[i] and (best_i is None or units[i] > units[best_i]):
+                    best_i = i
+            if best_i is None:
+                for i in chosen:
+                    units[i] += 1
+                return None
+            units[best_i] -= 1
+            chosen.append(best_i)
+        return sum(self.engine.prices[i] for i in chosen)
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -0,0 +1,32 @@
+# Production entry point: `python serve.py [streamlit run options]` serves app.py and warms the
+# process up as soon as the server is listening, before the first customer connects. With
+# FOODIE_METRICS_PORT set, /ready on that port answers 503 until the warm-up has finished.
+import logging
+import os
+import sys
+import threading
+import time
+
+import warmup  # noqa: F401  (first, so time-to-ready counts from here)
+from streamlit import runtime
+from streamlit.web import cli
+
+
+def warm_up_when_serving():
+    # Waits for the Streamlit runtime, so configuration and secrets are loaded as they are for sessions
+    while not runtime.exists():
+        time.sleep(0.05)
+    # The warm-up calls the cached service getters outside any session; that's intended here
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    from services import get_tracer, get_warmup
+
+    get_warmup().start()
+    get_tracer()  # starts the metrics server with /ready
+
+
+if __name__ == "__main__":
+    # The app's own loggers (warm-up, kitchen queue, thumbnails, TTS) go to stderr next to Streamlit's
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    threading.Thread(target=warm_up_when_serving, name="warmup-launcher", daemon=True).start()
+    sys.argv = ["streamlit", "run", os.path.join(warmup.ROOT, "app.py"), *sys.argv[1:]]
+    sys.exit(cli.main())
@@ -0,0 +1,167 @@
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from analytics import SalesStore
+from catalog import DEFAULT_LOCATION, build_catalog, flat_menu, load_locations
+from config import (
+    ASR_BACKEND, ASR_WORKERS, CASSETTE, GROQ_API_KEY, GROQ_API_URL, LLAMA_MODEL, LLM_BACKEND, LLM_FALLBACK_MODELS, LOCAL_LLM_MODEL, LOCAL_LLM_SLOTS, LOCAL_LLM_URL, LOCATIONS_PATH,
+    METRICS_PORT, ORDER_LOG_PATH, PROFILER_INTERVAL_MS, PROFILER_MAX_SECONDS, REPLAY_SPEED, TTS_BACKEND,
+)
+from images import ImageService
+from llm_client import LLMClient, LocalLLMClient
+from llm_output import OutputValidator
+from local_parser import LocalParser
+from menu_index import MenuIndex
+from orders import OrderService
+from profiler import SamplingProfiler
+from promotions import PromotionEngine
+from theme import MenuCards
+from tracing import Tracer, start_metrics_server
+from tts import TTSService, make_tts_engine
+
+
+# --- Locations ---
+# Everything built from the menu is cached per location; locations without an overlay entry in
+# FOODIE_LOCATIONS don't exist, except DEFAULT_LOCATION, which serves the base catalog.
+@st.cache_resource
+def get_locations():
+    return load_locations(LOCATIONS_PATH)
+
+@st.cache_resource
+def get_catalog(location=DEFAULT_LOCATION):
+    return build_catalog(location, get_locations().get(location))
+
+@st.cache_resource
+def get_system_prompt(location=DEFAULT_LOCATION):
+    from assistant import location_system_prompt
+
+    return location_system_prompt(get_catalog(location))
+
+# --- Promotions ---
+@st.cache_resource
+def get_promotion_engine(location=DEFAULT_LOCATION):
+    catalog = get_catalog(location)
+    return PromotionEngine(catalog.menu, catalog.promotions, catalog.category_groups)
+
+# --- LLM Output Validation ---
+@st.cache_resource
+def get_output_validator(location=DEFAULT_LOCATION):
+    return OutputValidator(get_catalog(location).flat_menu)
+
+# --- Record & Replay ---
+@st.cache_resource
+def get_cassette():
+    # None unless FOODIE_CASSETTE is set; shared by all sessions of the process.
+    if not CASSETTE:
+        return None
+    from cassettes import open_cassette
+
+    cassette = open_cassette(CASSETTE)
+    atexit.register(cassette.close)
+    return cassette
+
+# --- LLM Client & Fallback Tiers ---
+@st.cache_resource
+def get_llm_client():
+    cassette = get_cassette()
+    if cassette is not None and cassette.replaying:
+        from cassettes import ReplayLLMClient
+
+        return ReplayLLMClient(cassette, REPLAY_SPEED)
+    if LLM_BACKEND == "local":
+        client = LocalLLMClient(LOCAL_LLM_URL, LOCAL_LLM_MODEL, LOCAL_LLM_SLOTS)
+    else:
+        client = LLMClient(GROQ_API_URL, GROQ_API_KEY, [LLAMA_MODEL] + LLM_FALLBACK_MODELS)
+    if cassette is not None:
+        from cassettes import RecordingLLMClient
+
+        return RecordingLLMClient(client, cassette)
+    return client
+
+@st.cache_resource
+def get_local_parser(location=DEFAULT_LOCATION):
+    catalog = get_catalog(location)
+    return LocalParser(get_output_validator(location), catalog.menu, catalog.promotions)
+
+# --- Menu Search ---
+@st.cache_resource
+def get_menu_index(location=DEFAULT_LOCATION):
+    return MenuIndex(get_catalog(location).menu)
+
+# --- Speech Recognition ---
+@st.cache_resource
+def get_transcriber():
+    from speech import make_transcriber
+
+    cassette = get_cassette()
+    if cassette is not None and cassette.replaying:
+        from cassettes import ReplayTranscriber
+
+        return ReplayTranscriber(cassette, REPLAY_SPEED)
+    if cassette is not None:
+        from cassettes import RecordingTranscriber
+
+        return RecordingTranscriber(make_transcriber(ASR_BACKEND), cassette)
+    return make_transcriber(ASR_BACKEND)
+
+@st.cache_resource
+def get_asr_executor():
+    # Shared by all sessions so concurrent long uploads can't multiply the number of recognizer requests.
+    return ThreadPoolExecutor(max_workers=ASR_WORKERS, thread_name_prefix="asr")
+
+# --- Spoken Replies ---
+@st.cache_resource
+def get_tts_service():
+    # None when no local TTS engine is installed; replies are then shown as text only.
+    engine = make_tts_engine(TTS_BACKEND)
+    return TTSService(engine) if engine else None
+
+# --- Sales Analytics ---
+@st.cache_resource
+def get_sales_store():
+    # Loads the saved columnar segments once; every session appends to the same store.
+    store = SalesStore()
+    atexit.register(store.flush)
+    return store
+
+# --- Menu Images ---
+@st.cache_resource
+def get_image_service():
+    # Thumbnails for the whole menu are generated (or found in the cache) once at startup.
+    # Locations only reprice or hide base items, so they all share these.
+    return ImageService().ingest(flat_menu.values())
+
+@st.cache_resource
+def get_menu_cards(location=DEFAULT_LOCATION):
+    return MenuCards(get_catalog(location), get_image_service())
+
+# --- Tracing ---
+@st.cache_resource
+def get_tracer():
+    tracer = Tracer()
+    if METRICS_PORT:
+        start_metrics_server(tracer, METRICS_PORT, readiness=get_warmup())
+    return tracer
+
+# --- Sampling Profiler ---
+@st.cache_resource
+def get_profiler():
+    # One per process, idle until an admin starts a profile from the Profiler page.
+    return SamplingProfiler(PROFILER_INTERVAL_MS, PROFILER_MAX_SECONDS)
+
+# --- Warm-up ---
+@st.cache_resource
+def get_warmup():
+    # Started by serve.py; a plain `streamlit run` never warms up and reports ready straight away.
+    from warmup import APP_STEPS, Warmup
+
+    return Warmup(APP_STEPS)
+
+# --- Order Submission ---
+@st.cache_resource
+def get_order_service():
+    # One order log and kitchen worker per server process, shared by all sessions and locations;
+    # submit() prices with the ordering location's catalog.
+    return OrderService(ORDER_LOG_PATH, flat_menu, promotion_engine=get_promotion_engine())
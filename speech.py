@@ -0,0 +1,242 @@
+import hashlib
+import io
+import json
+from concurrent.futures import as_completed
+
+import numpy as np
+
+# pydub and speech_recognition are imported on first use so text-only sessions never load them.
+
+
+# --- Audio Decoding ---
+def decode_audio(source, format=None):
+    # Any pydub-readable input (raw bytes, an uploaded file, a path) -> sr.AudioData,
+    # converted through an in-memory WAV so nothing is written to disk.
+    import speech_recognition as sr
+    from pydub import AudioSegment
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    audio_segment = AudioSegment.from_file(source, format=format)
+    wav_io = io.BytesIO()
+    audio_segment.export(wav_io, format="wav")
+    wav_io.seek(0)
+    with sr.AudioFile(wav_io) as audio_file:
+        return sr.Recognizer().record(audio_file)
+
+
+def audio_fingerprint(audio_data):
+    return hashlib.blake2b(audio_data.get_raw_data(), digest_size=16).hexdigest()
+
+
+def clip_digest(data):
+    # Hash of the encoded clip as recorded or uploaded, before any decoding.
+    return hashlib.blake2b(bytes(data), digest_size=16).hexdigest()
+
+
+# --- Chunking ---
+SILENCE_FRAME_MS = 20
+MIN_SILENCE_MS = 250
+
+
+def chunk_pcm(pcm, sample_rate, max_seconds, min_silence_ms=MIN_SILENCE_MS):
+    # 16-bit mono PCM -> consecutive pieces of at most max_seconds (speech APIs cap request length),
+    # cut in the middle of a pause so no word is split. "Quiet" is relative to the recording's own
+    # quietest stretches; with no pause in reach, the cut goes at the quietest frame instead.
+    samples = np.frombuffer(pcm[:len(pcm) // 2 * 2], dtype=np.int16)
+    frame = sample_rate * SILENCE_FRAME_MS // 1000
+    max_frames = max(1, int(max_seconds * 1000 / SILENCE_FRAME_MS))
+    frames = len(samples) // frame
+    if frames <= max_frames:
+        return [samples.tobytes()]
+    rms = np.sqrt(np.mean(samples[:frames * frame].reshape(frames, frame).astype(np.float32) ** 2, axis=1))
+    quiet = rms < max(float(np.percentile(rms, 10)) * 2.0, 100.0)
+    pauses, run_start = [], None
+    for i, is_quiet in enumerate(np.append(quiet, False)):
+        if is_quiet and run_start is None:
+            run_start = i
+        elif not is_quiet and run_start is not None:
+            if (i - run_start) * SILENCE_FRAME_MS >= min_silence_ms:
+                pauses.append((run_start + i) // 2)
+            run_start = None
+    cuts, start = [], 0
+    while frames - start > max_frames:
+        in_reach = [pause for pause in pauses if start < pause <= start + max_frames]
+        if in_reach:
+            cut = in_reach[-1]
+        else:
+            window_start = start + max_frames // 2
+            cut = window_start + int(np.argmin(rms[window_start:start + max_frames]))
+        cuts.append(cut)
+        start = cut
+    edges = [0] + [cut * frame for cut in cuts] + [len(samples)]
+    return [samples[a:b].tobytes() for a, b in zip(edges, edges[1:])]
+
+
+def transcribe_chunks(transcriber, chunks, sample_rate, executor, on_progress=None):
+    # Transcribes the chunks concurrently and stitches the text back in order. on_progress(done, total,
+    # text so far) is called from the caller's thread as chunks finish; the text covers the leading
+    # run of finished chunks, so partial transcripts only ever grow at the end.
+    import speech_recognition as sr
+
+    def recognize(pcm):
+        try:
+            return transcriber(sr.AudioData(pcm, sample_rate, 2))
+        except sr.UnknownValueError:
+            return ""  # a pause or unintelligible stretch
+
+    futures = {executor.submit(recognize, pcm): i for i, pcm in enumerate(chunks)}
+    texts = [None] * len(chunks)
+    for done, future in enumerate(as_completed(futures), start=1):
+        texts[futures[future]] = future.result()
+        if on_progress:
+            leading = []
+            for text in texts:
+                if text is None:
+                    break
+                leading.append(text)
+            on_progress(done, len(chunks), " ".join(text for text in leading if text))
+    return " ".join(text for text in texts if text)
+
+
+# --- PCM Ring Buffer ---
+# A fixed int16 buffer for the most recent `capacity` samples of a stream. It is allocated once.
+# Every sample is stored twice, at i and i + capacity, so any window of up to `capacity` samples is
+# one contiguous slice and reads are views, not copies. Positions are absolute sample counts.
+class PcmRing:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.samples = np.zeros(2 * capacity, dtype=np.int16)
+        self.written = 0
+
+    @property
+    def nbytes(self):
+        return self.samples.nbytes
+
+    @property
+    def oldest(self):
+        return max(0, self.written - self.capacity)
+
+    def write(self, pcm):
+        data = pcm if isinstance(pcm, np.ndarray) else np.frombuffer(pcm, dtype=np.int16)
+        if len(data) > self.capacity:
+            self.written += len(data) - self.capacity
+            data = data[-self.capacity:]
+        capacity, pos = self.capacity, self.written % self.capacity
+        end = pos + len(data)
+        self.samples[pos:end] = data
+        if end <= capacity:
+            self.samples[pos + capacity:end + capacity] = data
+        else:
+            self.samples[pos + capacity:] = data[:capacity - pos]
+            self.samples[:end - capacity] = data[capacity - pos:]
+        self.written += len(data)
+
+    def view(self, start, end):
+        if not self.oldest <= start <= end <= self.written:
+            raise IndexError(f"samples {start}-{end} are not in the buffer ({self.oldest}-{self.written})")
+        offset = start % self.capacity
+        return self.samples[offset:offset + end - start]
+
+
+# --- Voice Activity Detection ---
+# Energy-based: a 20 ms frame is speech when its RMS is well above the adaptive noise floor.
+# "start" fires after START_MS of speech (so a cough or a click doesn't barge in) and "end",
+# carrying the utterance PCM including a short pre-roll, after END_MS of silence, or once the
+# utterance reaches max_utterance_ms.
+# Audio is written straight into a PcmRing sized for the longest utterance plus HEADROOM_MS, so a
+# session's memory is fixed however long or often the customer talks, and the utterance is a view
+# into it. Nothing guards that view: it is only guaranteed for HEADROOM_MS of further audio, so a
+# caller that keeps it past its next process() call (hands it to another thread) must copy it first.
+class VoiceActivityDetector:
+    FRAME_MS = 20
+    START_MS = 120
+    END_MS = 600
+    PRE_ROLL_MS = 200
+    HEADROOM_MS = 2000
+
+    def __init__(self, sample_rate=16000, threshold_ratio=3.0, min_rms=300.0, max_utterance_ms=30000):
+        self.sample_rate = sample_rate
+        self.frame = sample_rate * self.FRAME_MS // 1000
+        self.pre_roll = sample_rate * self.PRE_ROLL_MS // 1000
+        self.max_utterance = sample_rate * max_utterance_ms // 1000 + self.pre_roll
+        self.ring = PcmRing(self.max_utterance + sample_rate * self.HEADROOM_MS // 1000)
+        self.threshold_ratio = threshold_ratio
+        self.min_rms = min_rms
+        self.noise_rms = min_rms / threshold_ratio
+        self.position = 0  # first sample not yet analysed
+        self.floor = 0  # the pre-roll never reaches back into the previous utterance
+        self.utterance_start = None
+        self.speech_frames = 0
+        self.silence_frames = 0
+        self.longest_utterance = 0
+        self.truncated = 0
+
+    def process(self, pcm):
+        # 16-bit mono PCM at sample_rate (bytes, memoryview or int16 array), any chunk size
+        # -> list of ("start", None) / ("end", int16 view of the utterance)
+        events = []
+        self.ring.write(pcm)
+        frames = (self.ring.written - self.position) // self.frame
+        if not frames:
+            return events
+        block = self.ring.view(self.position, self.position + frames * self.frame).reshape(frames, self.frame)
+        for rms in np.sqrt(np.mean(np.square(block, dtype=np.float32), axis=1)).tolist():
+            self.position += self.frame
+            is_speech = rms > max(self.min_rms, self.noise_rms * self.threshold_ratio)
+            if self.utterance_start is None:
+                if not is_speech:
+                    self.speech_frames = 0
+                    self.noise_rms = 0.95 * self.noise_rms + 0.05 * rms
+                    continue
+                self.speech_frames += 1
+                if self.speech_frames * self.FRAME_MS >= self.START_MS:
+                    self.utterance_start = max(self.floor, self.ring.oldest, self.position - self.pre_roll)
+                    self.silence_frames = 0
+                    events.append(("start", None))
+                continue
+            self.silence_frames = 0 if is_speech else self.silence_frames + 1
+            length = self.position - self.utterance_start
+            if self.silence_frames * self.FRAME_MS >= self.END_MS or length >= self.max_utterance:
+                if self.silence_frames * self.FRAME_MS < self.END_MS:
+                    self.truncated += 1
+                self.longest_utterance = max(self.longest_utterance, length)
+                events.append(("end", self.ring.view(self.utterance_start, self.position)))
+                self.floor = self.position
+                self.utterance_start = None
+                self.speech_frames = 0
+        return events
+
+
+# --- Speech-to-Text Backends ---
+class GoogleTranscriber:
+    def __call__(self, audio_data):
+        import speech_recognition as sr
+
+        return sr.Recognizer().recognize_google(audio_data)
+
+
+class StubTranscriber:
+    # Offline stand-in for benchmarks and load tests: looks the decoded audio up in a corpus
+    # manifest ({"clips": [{"fingerprint": ..., "text": ...}]}) instead of calling a service.
+    def __init__(self, manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.transcripts = {clip["fingerprint"]: clip["text"] for clip in manifest["clips"]}
+
+    def __call__(self, audio_data):
+        text = self.transcripts.get(audio_fingerprint(audio_data))
+        if text is None:
+            import speech_recognition as sr
+
+            raise sr.UnknownValueError()
+        return text
+
+
+def make_transcriber(backend):
+    # backend: "google" or "stub:<path to corpus manifest.json>"
+    if backend == "google":
+        return GoogleTranscriber()
+    if backend.startswith("stub:"):
+        return StubTranscriber(backend[len("stub:"):])
+    raise ValueError(f"Unknown ASR backend: {backend}")
@@ -0,0 +1,88 @@
+import json
+import os
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(ROOT, "static", "manifest.json")
+GOOGLE_FONTS_IMPORT = "@import url('https://fonts.googleapis.com/css2?family=Pacifico&family=Inter:wght@400;600;700;800&display=swap');"
+
+
+# --- Static Assets ---
+# Built by build_assets.py into ./static and served by Streamlit's static file handler with
+# fingerprinted URLs. Without a build the raw stylesheet is used and images are left out.
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_css(manifest):
+    # Streamlit serves .css as text/plain with nosniff, so browsers won't apply a <link>ed
+    # stylesheet; the built (minified) file is inlined instead, read once per process.
+    if manifest:
+        with open(os.path.join(ROOT, "static", manifest["css"]["file"]), encoding="utf-8") as f:
+            return f"<style>{f.read()}</style>"
+    with open(os.path.join(ROOT, "assets", "app.css"), encoding="utf-8") as f:
+        return f"<style>{GOOGLE_FONTS_IMPORT}{f.read()}</style>"
+
+
+def picture_html(name, alt="", sizes="100vw", css_class="", eager=False):
+    # <picture> with WebP/JPEG srcsets; the browser picks format and width. Empty if assets aren't built.
+    image = (ASSET_MANIFEST or {}).get("images", {}).get(name)
+    if not image:
+        return ""
+    sources = ""
+    for image_format, variants in image["formats"].items():
+        srcset = ", ".join(f"{variant['url']} {variant['width']}w" for variant in variants)
+        sources += f'<source type="image/{image_format}" srcset="{srcset}" sizes="{sizes}">'
+    fallback = list(image["formats"].values())[-1][-1]
+    loading = 'loading="eager" fetchpriority="high"' if eager else 'loading="lazy"'
+    return f'<picture class="{css_class}">{sources}<img src="{fallback["url"]}" alt="{alt}" width="{image["width"]}" height="{image["height"]}" {loading} decoding="async"></picture>'
+
+
+
+# --- Menu Cards ---
+DIETARY_BADGES = {
+    "vegetarian": '<span class="dietary-badge dietary-vegetarian">🌱 Veg</span>',
+    "vegan": '<span class="dietary-badge dietary-vegan">🌿 Vegan</span>',
+    "spicy": '<span class="dietary-badge dietary-spicy">🌶️ Spicy</span>',
+}
+
+
+def menu_card_html(item, image_html):
+    dietary_badges = "".join(DIETARY_BADGES.get(diet, "") for diet in item.get("dietary", ()))
+    return f"""
+        <div class="menu-item-card">
+            <div class="menu-item-header">
+                {image_html}
+                <div class="menu-item-details">
+                    <p class="menu-item-name">{item['name']}</p>
+                    <p class="menu-item-description">{item['description']}</p>
+                    <div>{dietary_badges}</div>
+                </div>
+                <span class="menu-item-price">${item['price']:.2f}</span>
+            </div>
+        </div>
+    """
+
+
+class MenuCards:
+    # A location's menu cards (item id -> HTML), built once and shared by its sessions. Rebuilt when
+    # the image service publishes new thumbnails, so placeholders are swapped for the real images.
+    def __init__(self, catalog, image_service):
+        self.catalog = catalog
+        self.image_service = image_service
+        self._version = None
+        self._cards = {}
+
+    def cards(self):
+        version = self.image_service.version
+        if version != self._version:
+            self._cards = {item_id: menu_card_html(item, self.image_service.img_html(item)) for item_id, item in self.catalog.flat_menu.items()}
+            self._version = version
+        return self._cards
+
+ASSET_MANIFEST = load_manifest()
+# Injected once per script run by app.py.
+APP_CSS = load_css(ASSET_MANIFEST)
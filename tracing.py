@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds (seconds) of the Prometheus latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+# --- Turn Tracing ---
+# A turn is one customer utterance, from audio decode to the rerender that shows the reply.
+# Spans are plain tuples appended to the turn; the only work on the hot path is two
+# perf_counter_ns() calls and a list append, so tracing can stay on in production.
+class Tracer:
+    def __init__(self, max_turns=200, turns_per_session=20, max_sessions=1000):
+        self.turns_per_session = turns_per_session
+        self.max_sessions = max_sessions
+        self.recent = deque(maxlen=max_turns)
+        self.sessions = OrderedDict()
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def start_turn(self, session_id, kind):
+        return {
+            "trace_id": os.urandom(16).hex(),
+            "session": session_id,
+            "kind": kind,
+            "wall_start_ns": time.time_ns(),
+            "start_ns": time.perf_counter_ns(),
+            "spans": [],
+            "attrs": {},
+        }
+
+    @contextmanager
+    def span(self, turn, name, **attrs):
+        start = time.perf_counter_ns()
+        try:
+            yield attrs
+        finally:
+            self.add_span(turn, name, start, time.perf_counter_ns(), attrs)
+
+    def add_span(self, turn, name, start_ns, end_ns, attrs=None):
+        if turn is not None:
+            turn["spans"].append((name, start_ns, end_ns, attrs or {}))
+        self._observe(name, (end_ns - start_ns) / 1e9)
+
+    def finish_turn(self, turn):
+        turn["end_ns"] = time.perf_counter_ns()
+        self._observe(f"turn.{turn['kind']}", (turn["end_ns"] - turn["start_ns"]) / 1e9)
+        with self._lock:
+            self.recent.append(turn)
+            session_turns = self.sessions.pop(turn["session"], None) or deque(maxlen=self.turns_per_session)
+            session_turns.append(turn)
+            self.sessions[turn["session"]] = session_turns
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+
+    def session_turns(self, session_id, limit=None):
+        with self._lock:
+            turns = list(self.sessions.get(session_id, ()))
+        return turns[-limit:] if limit else turns
+
+    def recent_sessions(self, limit=50):
+        # Session ids with traced turns, most recently active first.
+        with self._lock:
+            return list(reversed(self.sessions))[:limit]
+
+    def _observe(self, stage, seconds):
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = {"count": 0, "sum": 0.0, "buckets": [0] * len(BUCKETS)}
+            stats["count"] += 1
+            stats["sum"] += seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    stats["buckets"][i] += 1
+                    break
+
+    # --- Exporters ---
+    def prometheus_text(self):
+        with self._lock:
+            stages = {stage: {"count": s["count"], "sum": s["sum"], "buckets": list(s["buckets"])} for stage, s in self.stages.items()}
+        lines = [
+            "# HELP foodie_stage_seconds Time spent per voice-order stage.",
+            "# TYPE foodie_stage_seconds histogram",
+        ]
+        for stage, stats in sorted(stages.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS, stats["buckets"]):
+                cumulative += count
+                lines.append(f'foodie_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'foodie_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats["count"]}')
+            lines.append(f'foodie_stage_seconds_sum{{stage="{stage}"}} {stats["sum"]:.6f}')
+            lines.append(f'foodie_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def otlp_json(self, turns=None):
+        # OTLP/JSON ExportTraceServiceRequest; each turn becomes a root span with its stages as children.
+        with self._lock:
+            turns = list(self.recent) if turns is None else turns
+        spans = []
+        for turn in turns:
+            root_id = turn["trace_id"][:16]
+            to_unix = lambda ns: str(turn["wall_start_ns"] + ns - turn["start_ns"])
+            spans.append(otlp_span(turn["trace_id"], root_id, None, f"turn.{turn['kind']}", to_unix(turn["start_ns"]), to_unix(turn.get("end_ns", turn["start_ns"])), dict(turn["attrs"], session=turn["session"])))
+            for name, start_ns, end_ns, attrs in turn["spans"]:
+                spans.append(otlp_span(turn["trace_id"], os.urandom(8).hex(), root_id, name, to_unix(start_ns), to_unix(end_ns), attrs))
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "agentic-foodie"}}]},
+            "scopeSpans": [{"scope": {"name": "foodie.tracing"}, "spans": spans}],
+        }]}
+
+
+def otlp_span(trace_id, span_id, parent_id, name, start, end, attrs):
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        "kind": 1,
+        "startTimeUnixNano": start,
+        "endTimeUnixNano": end,
+        "attributes": [{"key": key, "value": {"stringValue": str(value)}} for key, value in attrs.items()],
+    }
+    if parent_id:
+        span["parentSpanId"] = parent_id
+    return span
+
+
+def waterfall(turn):
+    # [(name, offset_ms, duration_ms)] relative to the start of the turn, for the debug panel.
+    return [
+        (name, (start_ns - turn["start_ns"]) / 1e6, (end_ns - start_ns) / 1e6)
+        for name, start_ns, end_ns, _ in sorted(turn["spans"], key=lambda span: span[1])
+    ]
+
+
+# --- Metrics Endpoint ---
+def start_metrics_server(tracer, port, host="0.0.0.0", readiness=None):
+    # Serves /metrics (Prometheus text format), /traces (OTLP JSON of recent turns) and, given a
+    # readiness object (warmup.Warmup), /ready: 200 once it is ready, 503 with its progress before.
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status = 200
+            if self.path == "/metrics":
+                text = tracer.prometheus_text() + (readiness.prometheus_text() if readiness else "")
+                body, content_type = text.encode("utf-8"), "text/plain; version=0.0.4"
+            elif self.path == "/traces":
+                body, content_type = json.dumps(tracer.otlp_json()).encode("utf-8"), "application/json"
+            elif self.path == "/ready" and readiness is not None:
+                report = readiness.status()
+                status = 200 if report["ready"] else 503
+                body, content_type = json.dumps(report).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,227 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ROOT, "tts_cache")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Emoji and pictographs are dropped before synthesis (engines read them out as names or skip them unevenly).
+UNSPOKEN = re.compile(r"[^\w\s.,!?;:'$%&()/+-]")
+MEMORY_CACHE_ENTRIES = 256
+
+logger = logging.getLogger(__name__)
+
+
+class SynthesisError(RuntimeError):
+    pass
+
+
+def split_sentences(text):
+    sentences = []
+    for sentence in SENTENCE_END.split(UNSPOKEN.sub("", text)):
+        sentence = " ".join(sentence.split())
+        if any(ch.isalnum() for ch in sentence):
+            sentences.append(sentence)
+    return sentences
+
+
+def pcm_to_wav(pcm, sample_rate):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def wav_to_pcm(data):
+    with wave.open(io.BytesIO(data), "rb") as wav_file:
+        if wav_file.getnchannels() != 1 or wav_file.getsampwidth() != 2:
+            raise ValueError("expected 16-bit mono audio")
+        return wav_file.readframes(wav_file.getnframes()), wav_file.getframerate()
+
+
+# --- Text-to-Speech Engines ---
+# Each engine turns one sentence into 16-bit mono PCM and reports its sample rate; `key` identifies
+# the voice settings, so changing voice or speed never serves audio cached for another voice.
+class EspeakEngine:
+    def __init__(self, voice="en-us", words_per_minute=165, binary=None):
+        self.binary = binary or shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.binary:
+            raise RuntimeError("espeak-ng is not installed")
+        self.voice = voice
+        self.words_per_minute = words_per_minute
+        self.key = f"espeak:{voice}:{words_per_minute}"
+
+    def synthesize(self, sentence):
+        completed = subprocess.run([self.binary, "-v", self.voice, "-s", str(self.words_per_minute), "--stdout", sentence], check=True, capture_output=True)
+        return wav_to_pcm(completed.stdout)
+
+
+class PiperEngine:
+    def __init__(self, model_path, binary=None):
+        self.binary = binary or shutil.which("piper")
+        if not self.binary:
+            raise RuntimeError("piper is not installed")
+        with open(f"{model_path}.json", encoding="utf-8") as f:
+            self.sample_rate = json.load(f)["audio"]["sample_rate"]
+        self.model_path = model_path
+        self.key = f"piper:{os.path.basename(model_path)}"
+
+    def synthesize(self, sentence):
+        completed = subprocess.run([self.binary, "--model", self.model_path, "--output-raw"], input=sentence.encode("utf-8"), check=True, capture_output=True)
+        return completed.stdout, self.sample_rate
+
+
+def make_tts_engine(backend):
+    # backend: "auto" (piper when FOODIE_PIPER_MODEL is set, else espeak-ng), "espeak[:<voice>]",
+    # "piper:<model.onnx>" or "off". Returns None when no engine is available.
+    if backend == "off":
+        return None
+    if backend.startswith("piper:"):
+        return PiperEngine(backend[len("piper:"):])
+    if backend.startswith("espeak"):
+        voice = backend.partition(":")[2]
+        return EspeakEngine(voice) if voice else EspeakEngine()
+    if backend == "auto":
+        piper_model = os.getenv("FOODIE_PIPER_MODEL")
+        try:
+            return PiperEngine(piper_model) if piper_model else EspeakEngine()
+        except (RuntimeError, OSError):
+            return None
+    raise ValueError(f"Unknown TTS backend: {backend}")
+
+
+# --- Phrase Cache ---
+# Synthesized sentences keyed by a hash of (voice, sentence). Greetings, thank-yous, farewells and
+# other fixed replies are synthesized once and then served from memory, or from disk after a restart.
+class PhraseCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MEMORY_CACHE_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, engine_key, sentence):
+        return hashlib.blake2b(f"{engine_key}\n{sentence.lower()}".encode("utf-8"), digest_size=12).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        path = self._path(key)
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                entry = wav_to_pcm(f.read())
+            self._remember(key, entry)
+            return entry
+        return None
+
+    def put(self, key, pcm, sample_rate):
+        self._remember(key, (pcm, sample_rate))
+        path = self._path(key)
+        if path:
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pcm_to_wav(pcm, sample_rate))
+            os.replace(tmp_path, path)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.wav") if self.cache_dir else None
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+# --- Speech Synthesis Service ---
+class TTSService:
+    def __init__(self, engine, cache=None, workers=2, history=200):
+        self.engine = engine
+        self.cache = cache or PhraseCache()
+        self.history = history
+        self.first_audio_ms = []
+        self.stats = {"replies": 0, "sentences": 0, "cache_hits": 0, "cancelled": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+
+    def stream(self, text, cancel=None):
+        # Yields (pcm, sample_rate) sentence by sentence, in order. All sentences are queued at once,
+        # so later ones synthesize while the first is already playing; cached ones return immediately.
+        # Setting `cancel` (a threading.Event) stops the stream and drops sentences not yet started.
+        # An engine failure is logged and raised as SynthesisError.
+        started = time.perf_counter()
+        sentences = split_sentences(text)
+        self._count("replies")
+        futures = [self._executor.submit(self._sentence_audio, sentence) for sentence in sentences]
+        try:
+            for i, future in enumerate(futures):
+                if cancel is not None and cancel.is_set():
+                    self._count("cancelled")
+                    return
+                try:
+                    chunk = future.result()
+                except (subprocess.SubprocessError, OSError, ValueError, wave.Error) as e:
+                    self._count("failed")
+                    logger.error("Speech synthesis failed (%s)", self.engine.key, exc_info=e)
+                    raise SynthesisError(str(e)) from e
+                if i == 0:
+                    self._record_first_audio((time.perf_counter() - started) * 1000)
+                yield chunk
+        finally:
+            # Cancelled, failed or closed early by the caller: sentences not yet started are dropped
+            for pending in futures:
+                pending.cancel()
+
+    def synthesize_wav(self, text):
+        # The whole reply as one WAV, for in-page playback.
+        chunks = list(self.stream(text))
+        if not chunks:
+            return None
+        sample_rate = chunks[0][1]
+        return pcm_to_wav(b"".join(pcm for pcm, rate in chunks if rate == sample_rate), sample_rate)
+
+    def summary(self):
+        with self._lock:
+            timings = sorted(self.first_audio_ms)
+            stats = dict(self.stats)
+        stats["hit_rate"] = round(stats["cache_hits"] / stats["sentences"], 3) if stats["sentences"] else 0.0
+        stats["first_audio_p50_ms"] = round(timings[len(timings) // 2], 1) if timings else None
+        stats["first_audio_p95_ms"] = round(timings[int(len(timings) * 0.95)], 1) if timings else None
+        return stats
+
+    def _sentence_audio(self, sentence):
+        key = self.cache.key(self.engine.key, sentence)
+        self._count("sentences")
+        cached = self.cache.get(key)
+        if cached:
+            self._count("cache_hits")
+            return cached
+        pcm, sample_rate = self.engine.synthesize(sentence)
+        self.cache.put(key, pcm, sample_rate)
+        return pcm, sample_rate
+
+    def _record_first_audio(self, elapsed_ms):
+        with self._lock:
+            self.first_audio_ms = self.first_audio_ms[-(self.history - 1):] + [elapsed_ms]
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
@@ -0,0 +1,237 @@
+import asyncio
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from assistant import begin_trace_turn, respond_to_utterance
+from config import LIVEKIT_API_KEY, LIVEKIT_API_SECRET, LIVEKIT_WS_URL, VOICE_MAX_UTTERANCE_SECONDS
+from services import get_tracer, get_transcriber, get_tts_service
+from speech import VoiceActivityDetector
+from tts import SynthesisError
+
+VAD_SAMPLE_RATE = 16000
+
+# The LiveKit SDK (livekit.api + livekit.rtc, ~450 ms of imports) and speech_recognition are
+# imported inside the functions below, so they load when a customer first connects a voice room.
+
+
+# --- LiveKit Token Generator ---
+def generate_access_token(api_key, api_secret, room_name, identity):
+    from livekit.api import AccessToken
+
+    try:
+        token = (
+            AccessToken(api_key, api_secret)
+            .with_identity(identity)
+            .with_grants(
+                {
+                    "room_join": True,
+                    "room": room_name,
+                    "can_publish": True,
+                    "can_subscribe": True,
+                }
+            )
+        )
+        return token.to_jwt()
+    except Exception as e:
+        st.error(f"Error generating token: {e}")
+        return None
+
+# --- Voice Sessions ---
+# One per customer session, kept in st.session_state.voice_session: its LiveKit room, the event loop
+# that runs it, the turn in flight and the pool that runs turns. Nothing is shared between sessions,
+# so one kiosk's speech never cancels or answers another kiosk's turn.
+class VoiceSession:
+    def __init__(self, ctx, session_id):
+        self.ctx = ctx
+        self.session_id = session_id
+        self.room = None
+        self.loop = None
+        self.reply_lock = None
+        self.reply_source = None
+        self.reply_sample_rate = None
+        self.current_turn = None
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="voice-turn")
+
+    def start(self):
+        # Browser builds (stlite/Pyodide) have no threads; the session runs on the page's event loop instead.
+        if platform.system() == "Emscripten":
+            asyncio.ensure_future(self.connect())
+        else:
+            thread = threading.Thread(target=self.run, name="livekit-voice", daemon=True)
+            add_script_run_ctx(thread, self.ctx)
+            thread.start()
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.connect())
+            if self.loop is loop:
+                # Keep the room connected so replies can be spoken into it
+                loop.run_forever()
+        finally:
+            loop.close()
+
+    async def connect(self):
+        from livekit.rtc import Room
+
+        self.room = Room()
+        token = generate_access_token(LIVEKIT_API_KEY, LIVEKIT_API_SECRET, "foodie-room", f"kiosk-{self.session_id}")
+        if not token:
+            st.error("Failed to generate authentication token.")
+            return
+        try:
+            await self.room.connect(LIVEKIT_WS_URL, token)
+            local_participant = self.room.local_participant
+            await local_participant.publish_audio_track()
+            self.room.on("track_subscribed", self.handle_track)
+            self.loop = asyncio.get_running_loop()
+            self.reply_lock = asyncio.Lock()
+            st.session_state.voice_session_started = True
+            st.success("Voice session connected! Speak to order! 🗣️")
+        except Exception as e:
+            st.error(f"LiveKit connection failed: {e}")
+            st.session_state.voice_session_started = False
+
+    def in_session(self, function, *args):
+        # Pool threads are reused, so each task attaches this session's script context itself;
+        # session state read or written by the task is then this customer's.
+        add_script_run_ctx(threading.current_thread(), self.ctx)
+        return function(*args)
+
+    # --- Voice Turns & Barge-in ---
+    # Every remote audio track goes through the VAD. When the customer starts speaking while a turn
+    # is still in flight (LLM request, or the reply being spoken), that turn is cancelled: the Groq
+    # request is abandoned, TTS stops mid-sentence and the queued audio is dropped. The new utterance
+    # then starts a fresh turn as soon as the VAD sees it end.
+    def handle_track(self, track, *_):
+        from livekit import rtc
+
+        if track.kind == rtc.TrackKind.KIND_AUDIO:
+            asyncio.ensure_future(self.listen(track))
+
+    async def listen(self, track):
+        from livekit import rtc
+
+        detector = VoiceActivityDetector(VAD_SAMPLE_RATE, max_utterance_ms=int(VOICE_MAX_UTTERANCE_SECONDS * 1000))
+        voice_stats["tracks"] += 1
+        voice_stats["buffer_bytes"] += detector.ring.nbytes
+        voice_stats["buffer_bytes_per_track"] = detector.ring.nbytes
+        try:
+            # Frames are written into the detector's ring buffer straight from the SDK's memoryview
+            async for event in rtc.AudioStream(track, sample_rate=VAD_SAMPLE_RATE, num_channels=1):
+                for kind, utterance in detector.process(event.frame.data):
+                    if kind == "start":
+                        self.barge_in()
+                    else:
+                        voice_stats["longest_utterance_s"] = max(voice_stats["longest_utterance_s"], round(len(utterance) / VAD_SAMPLE_RATE, 2))
+                        voice_stats["truncated"] += len(utterance) >= detector.max_utterance
+                        # The ring keeps being written while the turn waits for and runs on the pool,
+                        # so the turn gets its own copy: one per utterance, never per frame.
+                        self.start_turn(self.run_turn(utterance.copy()))
+        finally:
+            voice_stats["tracks"] -= 1
+            voice_stats["buffer_bytes"] -= detector.ring.nbytes
+
+    def barge_in(self):
+        if self.current_turn is not None and not self.current_turn["task"].done():
+            voice_stats["barge_ins"] += 1
+            self.current_turn["cancel"].set()
+            if self.reply_source is not None:
+                self.reply_source.clear_queue()
+
+    def start_turn(self, make_coroutine, loop=None):
+        # make_coroutine is a coroutine function taking the turn's cancel event.
+        cancel = threading.Event()
+        if loop is None:
+            task = asyncio.ensure_future(make_coroutine(cancel))
+        else:
+            task = asyncio.run_coroutine_threadsafe(make_coroutine(cancel), loop)
+        self.current_turn = {"cancel": cancel, "task": task}
+
+    def run_turn(self, utterance):
+        async def turn(cancel):
+            loop = asyncio.get_running_loop()
+            voice_stats["utterances"] += 1
+            text = await loop.run_in_executor(self.executor, self.in_session, transcribe_utterance, utterance)
+            if not text or cancel.is_set():
+                return
+            reply = await loop.run_in_executor(self.executor, self.in_session, respond_in_session, text, cancel)
+            if reply and not cancel.is_set():
+                await self.publish_reply(reply, cancel)
+        return turn
+
+    # --- Spoken Replies in the Room ---
+    def speak(self, text):
+        # Called from the script thread; False when no room is connected (the page plays the reply instead).
+        # The playback counts as a turn, so talking over it stops it too.
+        if self.loop is None or self.loop.is_closed():
+            return False
+        self.start_turn(lambda cancel: self.publish_reply(text, cancel), self.loop)
+        return True
+
+    async def publish_reply(self, text, cancel):
+        # Each sentence is pushed as 10 ms frames as soon as it is synthesized, while the next one is
+        # still being synthesized; capture_frame paces the loop at playback speed.
+        from livekit import rtc
+
+        loop = asyncio.get_running_loop()
+        chunks = get_tts_service().stream(text, cancel)
+        async with self.reply_lock:
+            try:
+                while not cancel.is_set():
+                    chunk = await loop.run_in_executor(None, next, chunks, None)
+                    if chunk is None:
+                        break
+                    pcm, sample_rate = chunk
+                    if self.reply_source is None or self.reply_sample_rate != sample_rate:
+                        self.reply_source, self.reply_sample_rate = rtc.AudioSource(sample_rate, 1), sample_rate
+                        track = rtc.LocalAudioTrack.create_audio_track("foodie-replies", self.reply_source)
+                        await self.room.local_participant.publish_track(track)
+                    frame_bytes = sample_rate // 100 * 2
+                    for start in range(0, len(pcm), frame_bytes):
+                        if cancel.is_set():
+                            break
+                        frame_pcm = pcm[start:start + frame_bytes]
+                        await self.reply_source.capture_frame(rtc.AudioFrame(frame_pcm, sample_rate, 1, len(frame_pcm) // 2))
+            except SynthesisError:
+                pass  # logged by the TTS service; the reply stays in the chat
+            finally:
+                # Stops the sentences still queued for synthesis
+                chunks.close()
+
+# Process-wide totals for the debug panel. buffer_bytes: audio memory held by all open tracks, each
+# a fixed-size ring (see VoiceActivityDetector).
+voice_stats = {"utterances": 0, "barge_ins": 0, "tracks": 0, "buffer_bytes": 0, "buffer_bytes_per_track": 0, "longest_utterance_s": 0.0, "truncated": 0}
+
+def start_voice_thread():
+    session = VoiceSession(get_script_run_ctx(), st.session_state.session_id)
+    st.session_state.voice_session = session
+    session.start()
+
+def speak_in_room(text):
+    session = st.session_state.get("voice_session")
+    return session is not None and session.speak(text)
+
+def respond_in_session(text, cancel):
+    # Runs on a turn thread carrying the customer's script context, so session state is theirs.
+    turn = begin_trace_turn("voice")
+    try:
+        return respond_to_utterance(text, cancel)
+    finally:
+        get_tracer().finish_turn(turn)
+        if st.session_state.trace_turn is turn:
+            st.session_state.trace_turn = None
+
+def transcribe_utterance(pcm):
+    # pcm is the utterance's own int16 copy; AudioData reads it in place.
+    import speech_recognition as sr
+
+    try:
+        return get_transcriber()(sr.AudioData(memoryview(pcm).cast("B"), VAD_SAMPLE_RATE, 2))
+    except (sr.UnknownValueError, sr.RequestError):
+        return None
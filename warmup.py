@@ -0,0 +1,150 @@
+import logging
+import os
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Imported first thing by serve.py, so time-to-ready is measured from (almost) process start
+PROCESS_STARTED = time.monotonic()
+
+logger = logging.getLogger(__name__)
+
+
+# --- Warm-up & Readiness ---
+# The steps run once, in order, on a background thread. A failing step (say Groq unreachable) is
+# reported but doesn't keep the replica out of rotation: the app already degrades to its fallbacks.
+class Warmup:
+    def __init__(self, steps):
+        self.steps = steps
+        self.state = "not started"
+        self.report = {"steps": {}}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self.state = "warming up"
+                self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    @property
+    def ready(self):
+        # Only a warm-up in progress holds readiness back; without serve.py there is none to wait for.
+        return self.state != "warming up"
+
+    def status(self):
+        return dict(self.report, state=self.state, ready=self.ready)
+
+    def prometheus_text(self):
+        lines = ["# HELP foodie_ready 1 once the warm-up has finished.", "# TYPE foodie_ready gauge", f"foodie_ready {int(self.ready)}"]
+        if "time_to_ready_s" in self.report:
+            lines += ["# HELP foodie_time_to_ready_seconds Process start to end of warm-up.", "# TYPE foodie_time_to_ready_seconds gauge",
+                      f"foodie_time_to_ready_seconds {self.report['time_to_ready_s']:.3f}"]
+        lines += ["# HELP foodie_warmup_step_seconds Duration of each warm-up step.", "# TYPE foodie_warmup_step_seconds gauge"]
+        lines += [f'foodie_warmup_step_seconds{{step="{name}"}} {step["seconds"]:.3f}' for name, step in self.report["steps"].items()]
+        return "\n".join(lines) + "\n"
+
+    def _run(self):
+        started = time.monotonic()
+        for name, step in self.steps:
+            step_started = time.monotonic()
+            result = {}
+            try:
+                detail = step()
+                if detail is not None:
+                    result["detail"] = detail
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            result["seconds"] = round(time.monotonic() - step_started, 3)
+            self.report["steps"][name] = result
+        self.report["warmup_s"] = round(time.monotonic() - started, 3)
+        self.report["time_to_ready_s"] = round(time.monotonic() - PROCESS_STARTED, 3)
+        self.state = "ready"
+        steps = ", ".join(f"{name} {step['seconds']:.2f}s" + (" (failed)" if "error" in step else "") for name, step in self.report["steps"].items())
+        logger.info("Ready in %.2fs (%s)", self.report["time_to_ready_s"], steps)
+
+
+# --- Steps ---
+def warm_imports():
+    # What the first recorder or voice turn would otherwise import while the customer waits
+    from config import VOICE_MODE
+
+    if VOICE_MODE != "off":
+        import audio_recorder_streamlit  # noqa: F401
+        import pydub  # noqa: F401
+        import speech_recognition  # noqa: F401
+    if VOICE_MODE == "livekit":
+        import voice  # noqa: F401
+
+
+def warm_catalog():
+    # Every configured location's catalog and the services built from it
+    from catalog import DEFAULT_LOCATION
+    from services import get_image_service, get_local_parser, get_locations, get_menu_cards, get_menu_index, get_output_validator, get_promotion_engine
+
+    locations = [DEFAULT_LOCATION, *get_locations()]
+    for location in locations:
+        get_promotion_engine(location)
+        get_output_validator(location)
+        get_local_parser(location)
+        get_menu_index(location)
+        get_menu_cards(location)
+    return {"locations": len(locations), "thumbnails": get_image_service().stats["ingested"]}
+
+
+def warm_prompt():
+    # Runs retrieval once and, on the local backend, loads the default location's system prompt into every slot
+    from config import GROQ_API_KEY, LLM_BACKEND, MENU_TOP_K
+    from services import get_llm_client, get_menu_index, get_system_prompt
+
+    get_menu_index().menu_prompt("warm up", "", (), MENU_TOP_K)
+    if LLM_BACKEND == "groq" and not GROQ_API_KEY:
+        return "no LLM configured"
+    return {"warmed": get_llm_client().warm(get_system_prompt())}
+
+
+def warm_stores():
+    from services import get_order_service, get_sales_store, get_tracer
+
+    get_tracer()
+    get_order_service()
+    return {"sales_lines": get_sales_store().line_count()}
+
+
+def warm_speech():
+    from assistant import FIXED_REPLIES
+    from config import SPOKEN_REPLIES, VOICE_MODE
+    from services import get_transcriber, get_tts_service
+
+    if VOICE_MODE != "off":
+        get_transcriber()
+    tts = get_tts_service() if SPOKEN_REPLIES else None
+    if tts is not None:
+        for reply in FIXED_REPLIES.values():
+            tts.synthesize_wav(reply)
+        return tts.summary()
+
+
+def synthetic_turn():
+    # One text turn through the real page script: render, process_user_input, LLM (or local parser), reply
+    from streamlit.testing.v1 import AppTest
+
+    from config import LLM_TURN_DEADLINE
+
+    app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=LLM_TURN_DEADLINE + 60)
+    app.run()
+    app.chat_input[0].set_value("hello").run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return {"tier": app.session_state.turn_tiers[-1] if app.session_state.turn_tiers else None}
+
+
+APP_STEPS = [("imports", warm_imports), ("catalog", warm_catalog), ("prompt", warm_prompt), ("stores", warm_stores),
+             ("speech", warm_speech), ("synthetic_turn", synthetic_turn)]